@@ -0,0 +1,297 @@
+"""
+Аудиодвижок с заранее декодированными звуками аккордов.
+
+MP3 декодируются в PCM (QAudioDecoder) заранее - например, для всех аккордов
+активной группы - и хранятся в ограниченном по памяти кэше. Воспроизведение идет
+через пул голосов QAudioOutput с маленьким буфером: быстрые повторные нажатия
+звучат поверх друг друга или перезапускают самый старый голос без декодирования.
+
+Задержка от вызова play до начала вывода измеряется на каждом воспроизведении
+(get_stats, отладочный лог).
+"""
+
+import logging
+import time
+from collections import deque
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, pyqtSignal
+from PyQt5.QtMultimedia import QAudio, QAudioDecoder, QAudioDeviceInfo, QAudioFormat, QAudioOutput, QMultimedia
+
+from size_bounded_cache import SizeBoundedLRUCache
+
+logger = logging.getLogger(__name__)
+
+PCM_CACHE_MAX_BYTES = 128 * 1024 * 1024  # около 12 минут стерео 44.1 кГц
+VOICE_COUNT = 4
+OUTPUT_BUFFER_MS = 20
+ONSET_HISTORY_SIZE = 100
+
+
+def default_pcm_format():
+    """16 бит, 44.1 кГц, стерео - или ближайший формат, который поддерживает устройство вывода"""
+    audio_format = QAudioFormat()
+    audio_format.setSampleRate(44100)
+    audio_format.setChannelCount(2)
+    audio_format.setSampleSize(16)
+    audio_format.setCodec("audio/pcm")
+    audio_format.setByteOrder(QAudioFormat.LittleEndian)
+    audio_format.setSampleType(QAudioFormat.SignedInt)
+
+    device = QAudioDeviceInfo.defaultOutputDevice()
+    if not device.isNull() and not device.isFormatSupported(audio_format):
+        audio_format = device.nearestFormat(audio_format)
+    return audio_format
+
+
+class SoundBuffer:
+    """
+    QBuffer над данными звука (bytes или memoryview пакета) без копирования.
+    QByteArray.fromRawData ссылается на память data, поэтому data хранится
+    вместе с буфером: устройство и память живут, пока жив SoundBuffer
+    """
+
+    __slots__ = ('data', 'device')
+
+    def __init__(self, data, parent=None):
+        self.data = data
+        self.device = QBuffer(parent)
+        self.device.setData(QByteArray.fromRawData(data))
+        self.device.open(QIODevice.ReadOnly)
+
+    def rewind(self):
+        """Возвращает чтение к началу звука и отдает устройство"""
+        self.device.seek(0)
+        return self.device
+
+    def size(self):
+        return self.device.size()
+
+
+class PcmSound:
+    """Декодированный звук: PCM в QByteArray (QBuffer голоса разделяет его без копирования)"""
+
+    __slots__ = ('data', 'duration_ms')
+
+    def __init__(self, data, audio_format):
+        self.data = data
+        self.duration_ms = audio_format.durationForBytes(data.size()) // 1000
+
+    def size(self):
+        return self.data.size()
+
+
+class Voice:
+    """Голос пула: QAudioOutput и буфер, из которого он читает"""
+
+    def __init__(self, audio_format, parent):
+        self.output = QAudioOutput(audio_format, parent)
+        self.output.setBufferSize(audio_format.bytesForDuration(OUTPUT_BUFFER_MS * 1000))
+        self.buffer = QBuffer(parent)
+        self.started_at = 0.0
+        self.onset_pending = False
+
+    def is_busy(self):
+        return self.output.state() == QAudio.ActiveState
+
+    def start(self, sound):
+        """Перезапускает голос с начала звука"""
+        self.output.stop()
+        self.buffer.close()
+        self.buffer.setData(sound.data)
+        self.buffer.open(QIODevice.ReadOnly)
+
+        self.started_at = time.perf_counter()
+        self.onset_pending = True
+        self.output.start(self.buffer)
+
+
+class AudioEngine(QObject):
+    """
+    Предзагрузка и воспроизведение звуков по ключу.
+    Источник звука - путь к файлу или байты (bytes/memoryview) MP3
+    """
+
+    sound_ready = pyqtSignal(object)    # ключ декодированного звука
+    decode_failed = pyqtSignal(object)  # ключ звука, который просили сыграть, но не удалось декодировать
+
+    def __init__(self, voice_count=VOICE_COUNT, cache_max_bytes=PCM_CACHE_MAX_BYTES, parent=None):
+        super().__init__(parent)
+        self.audio_format = default_pcm_format()
+        self.sounds = SizeBoundedLRUCache(cache_max_bytes, PcmSound.size)
+        self.onset_latencies = deque(maxlen=ONSET_HISTORY_SIZE)
+
+        self.voices = []
+        for _ in range(voice_count):
+            voice = Voice(self.audio_format, self)
+            voice.output.stateChanged.connect(lambda state, voice=voice: self._on_voice_state(voice, state))
+            self.voices.append(voice)
+
+        # Очередь декодирования: одновременно работает один QAudioDecoder
+        self._queue = deque()  # (ключ, источник)
+        self._decoding = None  # (ключ, декодер, части PCM, буфер источника)
+        self._play_when_ready = set()
+
+        # Без сервиса декодирования (нет бэкенда платформы) движок недоступен
+        self.available = QAudioDecoder().availability() == QMultimedia.Available
+        if not self.available:
+            logger.warning("⚠️ Декодирование аудио недоступно, используется QMediaPlayer")
+
+    # ---- предзагрузка ----
+
+    def preload(self, items):
+        """Ставит в очередь декодирования звуки [(ключ, источник)], которых еще нет в кэше"""
+        queued = {key for key, _ in self._queue}
+        for key, source in items:
+            if source is None or key in self.sounds or key in queued or self._is_decoding(key):
+                continue
+            self._queue.append((key, source))
+            queued.add(key)
+        self._decode_next()
+
+    def is_loaded(self, key):
+        return key in self.sounds
+
+    def clear(self):
+        """Удаляет декодированные звуки и очередь предзагрузки"""
+        self._queue.clear()
+        self._play_when_ready.clear()
+        self.sounds.clear()
+
+    # ---- воспроизведение ----
+
+    def play(self, key, source=None):
+        """
+        Воспроизводит звук. Если он еще не декодирован и указан источник -
+        декодирует вне очереди и играет сразу по готовности.
+        False - звук недоступен
+        """
+        sound = self.sounds.get(key)
+        if sound is not None:
+            self._play_sound(sound)
+            logger.debug("🔊 %s из PCM кэша (%s мс)", key, sound.duration_ms)
+            return True
+
+        if source is None or not self.available:
+            return False
+
+        self._play_when_ready.add(key)
+        if not self._is_decoding(key):
+            self._queue = deque(item for item in self._queue if item[0] != key)
+            self._queue.appendleft((key, source))
+            self._decode_next()
+        return True
+
+    def stop(self):
+        """Останавливает все голоса"""
+        for voice in self.voices:
+            voice.output.stop()
+            voice.onset_pending = False
+
+    def _play_sound(self, sound):
+        # Свободный голос, а если все заняты - самый давно запущенный
+        voice = next((voice for voice in self.voices if not voice.is_busy()), None)
+        if voice is None:
+            voice = min(self.voices, key=lambda voice: voice.started_at)
+        voice.start(sound)
+
+    def _on_voice_state(self, voice, state):
+        if state == QAudio.ActiveState and voice.onset_pending:
+            voice.onset_pending = False
+            latency_ms = (time.perf_counter() - voice.started_at) * 1000
+            self.onset_latencies.append(latency_ms)
+            logger.debug("⏱️ Задержка старта звука: %.1f мс", latency_ms)
+        elif state == QAudio.IdleState:
+            # Звук доигран - освобождаем устройство вывода
+            voice.output.stop()
+
+    # ---- декодирование ----
+
+    def _is_decoding(self, key):
+        return self._decoding is not None and self._decoding[0] == key
+
+    def _decode_next(self):
+        if self._decoding is not None or not self.available:
+            return
+
+        while self._queue:
+            key, source = self._queue.popleft()
+            if key not in self.sounds:
+                break
+        else:
+            return
+
+        decoder = QAudioDecoder(self)
+        decoder.setAudioFormat(self.audio_format)
+        source_buffer = None
+        if isinstance(source, str):
+            decoder.setSourceFilename(source)
+        else:
+            # MP3 читается прямо из данных загрузчика, буфер живет до конца декодирования
+            source_buffer = SoundBuffer(source)
+            decoder.setSourceDevice(source_buffer.device)
+
+        chunks = []
+        self._decoding = (key, decoder, chunks, source_buffer)
+        decoder.bufferReady.connect(lambda: self._read_decoded(decoder, chunks))
+        decoder.finished.connect(lambda: self._on_decode_finished(decoder))
+        decoder.error[QAudioDecoder.Error].connect(lambda error: self._on_decode_error(decoder))
+        decoder.start()
+
+    @staticmethod
+    def _read_decoded(decoder, chunks):
+        while decoder.bufferAvailable():
+            buffer = decoder.read()
+            chunks.append(buffer.constData().asstring(buffer.byteCount()))
+
+    def _is_current_decoder(self, decoder):
+        # Поздний сигнал уже завершенного или сброшенного декодера игнорируется
+        return self._decoding is not None and self._decoding[1] is decoder
+
+    def _on_decode_finished(self, decoder):
+        if not self._is_current_decoder(decoder):
+            return
+        key, decoder, chunks, _ = self._decoding
+        self._read_decoded(decoder, chunks)
+        self._finish_decoding(decoder)
+
+        sound = PcmSound(QByteArray(b''.join(chunks)), self.audio_format)
+        self.sounds.put(key, sound)
+        logger.debug("🎼 Декодирован %s: %s мс, %s КБ", key, sound.duration_ms, sound.size() // 1024)
+        self.sound_ready.emit(key)
+
+        if key in self._play_when_ready:
+            self._play_when_ready.discard(key)
+            self._play_sound(sound)
+
+        self._decode_next()
+
+    def _on_decode_error(self, decoder):
+        if not self._is_current_decoder(decoder):
+            return
+        key = self._decoding[0]
+        logger.warning("❌ Ошибка декодирования %s: %s", key, decoder.errorString())
+        self._finish_decoding(decoder)
+
+        # Запасное воспроизведение нужно только звуку, который просили сыграть;
+        # неудачная предзагрузка просто пропускается
+        if key in self._play_when_ready:
+            self._play_when_ready.discard(key)
+            self.decode_failed.emit(key)
+        self._decode_next()
+
+    def _finish_decoding(self, decoder):
+        self._decoding = None
+        decoder.stop()
+        decoder.setSourceDevice(None)
+        decoder.deleteLater()
+
+    def get_stats(self):
+        """Статистика кэша и задержки старта воспроизведения"""
+        latencies = list(self.onset_latencies)
+        return {
+            'sounds': len(self.sounds),
+            'cache_bytes': self.sounds.total_bytes,
+            'queued': len(self._queue),
+            'onset_avg_ms': round(sum(latencies) / len(latencies), 1) if latencies else None,
+            'onset_max_ms': round(max(latencies), 1) if latencies else None
+        }
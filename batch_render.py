@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Пакетный рендер всех аккордов в файлы PNG/WebP без графического интерфейса.
+Аккорды распределяются по процессам, каждый процесс рисует через ChordRenderer
+
+Пример:
+    python batch_render.py --output rendered --format webp --workers 8
+"""
+
+import os
+
+# Qt без дисплея - платформу нужно выбрать до импорта PyQt5
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+DISPLAY_TYPES = ["fingers", "notes"]
+SCALE_TYPES = ["small1", "small2", "medium1", "medium2", "original"]
+IMAGE_FORMATS = ["png", "webp"]
+# Уровень логов процессов-исполнителей без --verbose: подробности отрисовки каждого аккорда не нужны
+WORKER_LOG_LEVEL = "WARNING"
+
+# Состояние процесса-исполнителя: создается один раз в _init_worker
+_worker_app = None
+_worker_renderer = None
+
+
+def _init_worker(verbose: bool = False, note_outline: str = "none",
+                 scale_types: Tuple[str, ...] = ("original",)):
+    """
+    Инициализация процесса: Qt приложение, конфигурация и шаблон загружаются один раз,
+    строится пирамида шаблона, ноты и лады шаблона сразу растеризуются в атлас спрайтов
+    """
+    global _worker_app, _worker_renderer
+
+    from log_config import setup_logging
+    setup_logging("DEBUG" if verbose else os.environ.get("CHORDS_LOG_LEVEL", WORKER_LOG_LEVEL))
+
+    from PyQt5.QtGui import QGuiApplication, QPixmap
+    from chord_config_manager import ChordConfigManager
+    from chord_renderer import ChordRenderer
+
+    _worker_app = QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+
+    config_manager = ChordConfigManager()
+    if not config_manager.load_config_data():
+        raise RuntimeError("Не удалось загрузить конфигурацию аккордов")
+
+    original_pixmap = QPixmap(config_manager.image_path)
+    if original_pixmap.isNull():
+        raise RuntimeError(f"Не удалось загрузить шаблон: {config_manager.image_path}")
+
+    _worker_renderer = ChordRenderer(config_manager, original_pixmap)
+    _worker_renderer.get_template_pyramid()
+    _worker_renderer.prebuild_sprites(note_outline, _worker_renderer.get_scale_factors(scale_types))
+
+
+def get_safe_file_name(name: str) -> str:
+    """Безопасное имя файла для аккорда (как у папок звуков в конвертере)"""
+    replacements = {
+        '/': '_slash_',
+        '#': '_sharp_',
+        '\\': '_',
+        ' ': '_'
+    }
+    for old, new in replacements.items():
+        name = name.replace(old, new)
+    return name
+
+
+def _render_chunk(chord_indices: List[int], options: Dict) -> Tuple[int, List[str]]:
+    """Рисует часть аккордов во всех типах отображения и масштабах"""
+    config_manager = _worker_renderer.config_manager
+    rendered = 0
+    errors = []
+
+    for index in chord_indices:
+        chord_config = config_manager.chord_data[index]
+        chord_name = f"{chord_config.get('CHORD')}{chord_config.get('VARIANT')}"
+        file_name = get_safe_file_name(chord_name)
+
+        for display_type in options['display_types']:
+            for scale_type in options['scale_types']:
+                try:
+                    pixmap = _worker_renderer.render_chord(
+                        chord_config,
+                        display_type=display_type,
+                        fret_type=options['fret_type'],
+                        barre_outline=options['barre_outline'],
+                        note_outline=options['note_outline'],
+                        scale_type=scale_type
+                    )
+
+                    target_dir = os.path.join(options['output_dir'], display_type, scale_type)
+                    os.makedirs(target_dir, exist_ok=True)
+                    target_path = os.path.join(target_dir, f"{file_name}.{options['format']}")
+
+                    if pixmap.save(target_path, options['format'].upper(), options['quality']):
+                        rendered += 1
+                    else:
+                        errors.append(f"{target_path}: ошибка записи")
+                except Exception as e:
+                    errors.append(f"{chord_name} ({display_type}, {scale_type}): {e}")
+
+    return rendered, errors
+
+
+def _split_into_chunks(items: List[int], chunks_count: int) -> List[List[int]]:
+    """Делит аккорды на части через один, чтобы тяжелые аккорды распределились равномерно"""
+    chunks = [items[i::chunks_count] for i in range(chunks_count)]
+    return [chunk for chunk in chunks if chunk]
+
+
+def render_all(options: Dict, workers: int) -> Tuple[int, List[str]]:
+    """Рисует все аккорды, распределяя их по процессам"""
+    from chord_config_manager import ChordConfigManager
+
+    config_manager = ChordConfigManager()
+    if not config_manager.load_config_data():
+        return 0, ["Не удалось загрузить конфигурацию аккордов"]
+
+    chord_indices = list(range(len(config_manager.chord_data)))
+    if not chord_indices:
+        return 0, ["Аккорды не найдены"]
+
+    if workers <= 1:
+        _init_worker(options['verbose'], options['note_outline'], options['scale_types'])
+        return _render_chunk(chord_indices, options)
+
+    # Несколько частей на процесс сглаживают разницу во времени отрисовки
+    chunks = _split_into_chunks(chord_indices, workers * 4)
+
+    rendered = 0
+    errors = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(options['verbose'], options['note_outline'],
+                                       options['scale_types'])) as executor:
+        futures = [executor.submit(_render_chunk, chunk, options) for chunk in chunks]
+        for future in futures:
+            chunk_rendered, chunk_errors = future.result()
+            rendered += chunk_rendered
+            errors.extend(chunk_errors)
+
+    return rendered, errors
+
+
+def _check_format_supported(image_format: str) -> bool:
+    """
+    Проверяет, что Qt умеет записывать выбранный формат (webp - через плагин imageformats).
+    Плагины находятся без экземпляра приложения, поэтому родительский процесс
+    не создает QGuiApplication до запуска рабочих процессов
+    """
+    from PyQt5.QtGui import QImageWriter
+
+    supported = [bytes(fmt).decode().lower() for fmt in QImageWriter.supportedImageFormats()]
+    return image_format in supported
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный рендер диаграмм аккордов в файлы")
+    parser.add_argument("--output", default="rendered_chords", help="папка для изображений")
+    parser.add_argument("--format", choices=IMAGE_FORMATS, default="png", help="формат файлов")
+    parser.add_argument("--quality", type=int, default=-1,
+                        help="качество сжатия 0-100 (-1 - по умолчанию Qt)")
+    parser.add_argument("--display-types", nargs="+", choices=DISPLAY_TYPES, default=DISPLAY_TYPES)
+    parser.add_argument("--scales", nargs="+", choices=SCALE_TYPES, default=SCALE_TYPES)
+    parser.add_argument("--fret-type", choices=["roman", "numeric"], default="roman")
+    parser.add_argument("--barre-outline", choices=["none", "thin", "medium", "thick"], default="none")
+    parser.add_argument("--note-outline", choices=["none", "thin", "medium", "thick"], default="none")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="количество процессов (по умолчанию - число ядер)")
+    parser.add_argument("--verbose", action="store_true", help="подробный вывод отрисовки")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("🖼️  ПАКЕТНЫЙ РЕНДЕР АККОРДОВ")
+    print("=" * 50)
+
+    if not _check_format_supported(args.format):
+        print(f"❌ Qt не поддерживает запись формата {args.format} (нет плагина imageformats)")
+        return 1
+
+    options = {
+        'output_dir': args.output,
+        'format': args.format,
+        'quality': args.quality,
+        'display_types': args.display_types,
+        'scale_types': args.scales,
+        'fret_type': args.fret_type,
+        'barre_outline': args.barre_outline,
+        'note_outline': args.note_outline,
+        'verbose': args.verbose
+    }
+
+    start_time = time.perf_counter()
+    rendered, errors = render_all(options, max(1, args.workers))
+    elapsed = time.perf_counter() - start_time
+
+    for error in errors:
+        print(f"❌ {error}")
+
+    print(f"✅ Сохранено {rendered} изображений в '{args.output}' за {elapsed:.1f} с "
+          f"({max(1, args.workers)} процессов)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
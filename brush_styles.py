@@ -0,0 +1,190 @@
+"""
+Реестр стилей кистей для баре и нот.
+
+Градиенты стилей компилируются один раз: шаблон кисти хранит градиент
+в единичных координатах, а для каждого элемента меняется только
+трансформация кисти (сдвиг, масштаб и поворот).
+"""
+
+from PyQt5.QtGui import QBrush, QColor, QLinearGradient, QRadialGradient, QTransform
+
+# Геометрия градиента стиля
+SOLID = "solid"                  # сплошной цвет
+BOX_LINEAR = "box_linear"        # от (x, y) до (x + width, y + height)
+BOX_RADIAL = "box_radial"        # из центра прямоугольника, радиус max(width, height) * масштаб
+CIRCLE_LINEAR = "circle_linear"  # от (x - radius, y - radius) до (x + radius, y + radius)
+CIRCLE_RADIAL = "circle_radial"  # из (x, y) радиусом radius
+
+# Стиль: (геометрия, опорные цвета[, масштаб радиуса]), у сплошных - (SOLID, цвет)
+
+# Стили баре: градиент строится по прямоугольнику (x, y, width, height)
+BARRE_BRUSH_STYLES = {
+    "wood": (BOX_LINEAR, [(0, (210, 180, 140)), (0.5, (160, 120, 80)), (1, (210, 180, 140))]),
+    "metal": (BOX_LINEAR, [(0, (200, 200, 200)), (0.5, (100, 100, 100)), (1, (200, 200, 200))]),
+    "rubber": (BOX_RADIAL, [(0, (80, 80, 80)), (1, (40, 40, 40))]),
+    "gradient": (BOX_LINEAR, [(0, (189, 183, 107)), (1, (255, 249, 173))]),
+    "striped": (SOLID, (189, 183, 107)),
+    "orange_gradient": (BOX_LINEAR, [(0, (255, 200, 100)), (0.5, (255, 140, 0)), (1, (255, 100, 0))]),
+    "orange_metal": (BOX_LINEAR, [(0, (255, 220, 150)), (0.3, (255, 180, 80)), (0.7, (255, 140, 40)), (1, (255, 120, 20))]),
+    "orange_glow": (BOX_RADIAL, [(0, (255, 230, 180)), (0.5, (255, 180, 80)), (1, (255, 140, 0))], 0.8),
+    "dark_orange": (BOX_LINEAR, [(0, (255, 150, 50)), (0.5, (255, 120, 0)), (1, (220, 100, 0))]),
+    "orange_wood": (BOX_LINEAR, [(0, (255, 200, 150)), (0.3, (255, 170, 100)), (0.7, (255, 140, 60)), (1, (255, 120, 40))]),
+    "bright_orange": (BOX_LINEAR, [(0, (255, 230, 100)), (0.5, (255, 200, 0)), (1, (255, 160, 0))]),
+    "orange_red": (BOX_LINEAR, [(0, (255, 180, 100)), (0.5, (255, 120, 0)), (1, (255, 80, 0))]),
+    "orange_yellow": (BOX_LINEAR, [(0, (255, 240, 150)), (0.5, (255, 200, 50)), (1, (255, 180, 0))]),
+    "orange_brown": (BOX_LINEAR, [(0, (255, 190, 130)), (0.5, (255, 150, 80)), (1, (210, 120, 60))]),
+    "orange_pastel": (BOX_LINEAR, [(0, (255, 220, 180)), (0.5, (255, 190, 140)), (1, (255, 170, 120))]),
+}
+
+# Стили нот: градиент строится по кругу (x, y, radius)
+NOTE_BRUSH_STYLES = {
+    "default": (SOLID, (255, 0, 0)),
+    "blue_gradient": (CIRCLE_LINEAR, [(0, (100, 150, 255)), (1, (50, 100, 200))]),
+    "red_3d": (CIRCLE_RADIAL, [(0, (255, 150, 150)), (0.7, (220, 50, 50)), (1, (180, 0, 0))]),
+    "green_3d": (CIRCLE_RADIAL, [(0, (180, 255, 180)), (0.7, (80, 200, 80)), (1, (40, 160, 40))]),
+    "purple_3d": (CIRCLE_RADIAL, [(0, (230, 200, 255)), (0.7, (180, 100, 230)), (1, (140, 60, 200))]),
+    "gold_3d": (CIRCLE_LINEAR, [(0, (255, 230, 100)), (0.5, (255, 200, 50)), (1, (230, 170, 30))]),
+    "glass": (SOLID, (255, 255, 255, 180)),
+    "fire": (CIRCLE_RADIAL, [(0, (255, 255, 150)), (0.5, (255, 200, 50)), (1, (255, 100, 0))]),
+    "ice": (CIRCLE_LINEAR, [(0, (200, 230, 255)), (0.5, (150, 200, 255)), (1, (100, 170, 255))]),
+    "soft_pink": (CIRCLE_RADIAL, [(0, (255, 200, 220)), (0.7, (255, 150, 180)), (1, (230, 100, 150))]),
+    "mint_green": (CIRCLE_RADIAL, [(0, (180, 255, 180)), (0.7, (120, 230, 120)), (1, (80, 200, 80))]),
+    "lavender": (CIRCLE_RADIAL, [(0, (220, 200, 255)), (0.7, (180, 160, 240)), (1, (140, 120, 220))]),
+    "peach": (CIRCLE_RADIAL, [(0, (255, 200, 150)), (0.7, (255, 160, 100)), (1, (230, 120, 80))]),
+    "sky_blue": (CIRCLE_RADIAL, [(0, (150, 200, 255)), (0.7, (100, 160, 240)), (1, (70, 130, 220))]),
+    "lemon_yellow": (CIRCLE_RADIAL, [(0, (255, 255, 150)), (0.7, (255, 230, 80)), (1, (240, 200, 40))]),
+    "coral": (CIRCLE_RADIAL, [(0, (255, 180, 150)), (0.7, (255, 140, 100)), (1, (230, 100, 70))]),
+    "aqua_marine": (CIRCLE_RADIAL, [(0, (150, 255, 220)), (0.7, (100, 230, 190)), (1, (70, 200, 160))]),
+    "rose_quartz": (CIRCLE_RADIAL, [(0, (255, 200, 210)), (0.7, (240, 160, 180)), (1, (220, 120, 150))]),
+    "seafoam": (CIRCLE_RADIAL, [(0, (180, 255, 200)), (0.7, (140, 230, 170)), (1, (100, 200, 140))]),
+    "buttercup": (CIRCLE_RADIAL, [(0, (255, 230, 120)), (0.7, (255, 200, 60)), (1, (240, 170, 30))]),
+    "lilac": (CIRCLE_RADIAL, [(0, (220, 180, 255)), (0.7, (190, 140, 240)), (1, (160, 100, 220))]),
+    "honey": (CIRCLE_RADIAL, [(0, (255, 220, 120)), (0.7, (255, 180, 60)), (1, (230, 150, 30))]),
+    "turquoise": (CIRCLE_RADIAL, [(0, (100, 240, 220)), (0.7, (70, 200, 190)), (1, (50, 170, 160))]),
+    "apricot": (CIRCLE_RADIAL, [(0, (255, 200, 140)), (0.7, (255, 160, 100)), (1, (230, 120, 70))]),
+    "periwinkle": (CIRCLE_RADIAL, [(0, (200, 200, 255)), (0.7, (160, 160, 240)), (1, (120, 120, 220))]),
+    "sage": (CIRCLE_RADIAL, [(0, (180, 220, 160)), (0.7, (140, 190, 120)), (1, (100, 160, 90))]),
+    "melon": (CIRCLE_RADIAL, [(0, (255, 180, 140)), (0.7, (255, 140, 100)), (1, (230, 100, 70))]),
+    "powder_blue": (CIRCLE_RADIAL, [(0, (180, 200, 255)), (0.7, (140, 170, 240)), (1, (100, 140, 220))]),
+    "pistachio": (CIRCLE_RADIAL, [(0, (180, 255, 160)), (0.7, (140, 230, 120)), (1, (100, 200, 90))]),
+    "blush": (CIRCLE_RADIAL, [(0, (255, 180, 190)), (0.7, (240, 140, 160)), (1, (220, 100, 130))]),
+    "mauve": (CIRCLE_RADIAL, [(0, (220, 180, 210)), (0.7, (190, 140, 180)), (1, (160, 100, 150))]),
+    "cream": (CIRCLE_RADIAL, [(0, (255, 240, 200)), (0.7, (255, 220, 160)), (1, (240, 190, 120))]),
+    "teal": (CIRCLE_RADIAL, [(0, (0, 200, 200)), (0.7, (0, 160, 160)), (1, (0, 120, 120))]),
+    "salmon": (CIRCLE_RADIAL, [(0, (255, 160, 140)), (0.7, (255, 120, 100)), (1, (230, 80, 70))]),
+    "orchid": (CIRCLE_RADIAL, [(0, (230, 160, 220)), (0.7, (200, 120, 200)), (1, (170, 80, 170))]),
+    "mint_blue": (CIRCLE_RADIAL, [(0, (160, 220, 255)), (0.7, (120, 190, 240)), (1, (80, 160, 220))]),
+    "pear": (CIRCLE_RADIAL, [(0, (200, 255, 150)), (0.7, (160, 230, 100)), (1, (120, 200, 70))]),
+    "rose_gold": (CIRCLE_RADIAL, [(0, (255, 200, 160)), (0.7, (240, 160, 120)), (1, (220, 120, 80))]),
+    "lavender_gray": (CIRCLE_RADIAL, [(0, (220, 200, 220)), (0.7, (190, 170, 190)), (1, (160, 140, 160))]),
+    "honeydew": (CIRCLE_RADIAL, [(0, (200, 255, 200)), (0.7, (160, 230, 160)), (1, (120, 200, 120))]),
+    "peach_puff": (CIRCLE_RADIAL, [(0, (255, 200, 160)), (0.7, (255, 160, 120)), (1, (230, 120, 80))]),
+    "azure": (CIRCLE_RADIAL, [(0, (180, 200, 255)), (0.7, (140, 170, 240)), (1, (100, 140, 220))]),
+    "pale_green": (CIRCLE_RADIAL, [(0, (180, 255, 180)), (0.7, (140, 230, 140)), (1, (100, 200, 100))]),
+    "light_coral": (CIRCLE_RADIAL, [(0, (255, 160, 160)), (0.7, (240, 120, 120)), (1, (220, 80, 80))]),
+    "thistle": (CIRCLE_RADIAL, [(0, (220, 180, 220)), (0.7, (190, 140, 190)), (1, (160, 100, 160))]),
+    "wheat": (CIRCLE_RADIAL, [(0, (255, 220, 160)), (0.7, (240, 190, 120)), (1, (220, 160, 80))]),
+    "light_cyan": (CIRCLE_RADIAL, [(0, (180, 255, 255)), (0.7, (140, 230, 230)), (1, (100, 200, 200))]),
+    "pale_turquoise": (CIRCLE_RADIAL, [(0, (160, 240, 240)), (0.7, (120, 220, 220)), (1, (80, 190, 190))]),
+    "light_pink": (CIRCLE_RADIAL, [(0, (255, 180, 200)), (0.7, (240, 140, 170)), (1, (220, 100, 140))]),
+    "light_salmon": (CIRCLE_RADIAL, [(0, (255, 160, 140)), (0.7, (255, 120, 100)), (1, (230, 80, 70))]),
+    "light_skyblue": (CIRCLE_RADIAL, [(0, (160, 200, 255)), (0.7, (120, 170, 240)), (1, (80, 140, 220))]),
+    "light_green": (CIRCLE_RADIAL, [(0, (160, 255, 160)), (0.7, (120, 230, 120)), (1, (80, 200, 80))]),
+    "plum": (CIRCLE_RADIAL, [(0, (220, 160, 220)), (0.7, (190, 120, 190)), (1, (160, 80, 160))]),
+    "bisque": (CIRCLE_RADIAL, [(0, (255, 220, 180)), (0.7, (255, 190, 140)), (1, (240, 160, 100))]),
+}
+
+# Стили баре имеют приоритет: нота со стилем metal получает градиент баре, как и раньше
+BRUSH_STYLES = {**NOTE_BRUSH_STYLES, **BARRE_BRUSH_STYLES}
+
+DEFAULT_BRUSH_COLOR = (255, 0, 0)  # Красный для неизвестных стилей
+
+
+class BrushStyleRegistry:
+    """
+    Выдает кисти по имени стиля.
+    Шаблоны кистей создаются при первом обращении к стилю и переиспользуются
+    """
+
+    def __init__(self, styles=None):
+        self.styles = styles if styles is not None else BRUSH_STYLES
+        self._templates = {}  # стиль -> (геометрия, шаблон кисти, опорные цвета, масштаб радиуса)
+
+    def get_brush(self, style_name, x=0, y=0, radius=0, width=0, height=0):
+        """Кисть стиля для элемента с заданной геометрией"""
+        template = self._templates.get(style_name)
+        if template is None:
+            template = self._compile(style_name)
+        geometry, brush_template, stops, radius_scale = template
+
+        if geometry == SOLID:
+            return QBrush(brush_template)
+
+        if geometry == BOX_LINEAR:
+            return self._linear_brush(brush_template, stops, x, y, width, height)
+        if geometry == CIRCLE_LINEAR:
+            return self._linear_brush(brush_template, stops, x - radius, y - radius, radius * 2, radius * 2)
+        if geometry == BOX_RADIAL:
+            return self._radial_brush(brush_template, stops, x + width / 2, y + height / 2,
+                                      max(width, height) * radius_scale)
+        return self._radial_brush(brush_template, stops, x, y, radius)
+
+    @staticmethod
+    def is_barre_style(style_name):
+        """Стиль из набора стилей баре"""
+        return style_name in BARRE_BRUSH_STYLES
+
+    def clear(self):
+        """Сбрасывает скомпилированные шаблоны"""
+        self._templates.clear()
+
+    def _compile(self, style_name):
+        style = self.styles.get(style_name)
+        if style is None:
+            template = (SOLID, QBrush(QColor(*DEFAULT_BRUSH_COLOR)), None, 1.0)
+        elif style[0] == SOLID:
+            template = (SOLID, QBrush(QColor(*style[1])), None, 1.0)
+        else:
+            geometry, color_stops = style[0], style[1]
+            radius_scale = style[2] if len(style) > 2 else 1.0
+            stops = [(position, QColor(*color)) for position, color in color_stops]
+
+            if geometry in (BOX_LINEAR, CIRCLE_LINEAR):
+                gradient = QLinearGradient(0, 0, 1, 0)
+            else:
+                gradient = QRadialGradient(0, 0, 1)
+            gradient.setStops(stops)
+            template = (geometry, QBrush(gradient), stops, radius_scale)
+
+        self._templates[style_name] = template
+        return template
+
+    @staticmethod
+    def _linear_brush(brush_template, stops, x0, y0, dx, dy):
+        """Линейный градиент от (x0, y0) до (x0 + dx, y0 + dy)"""
+        if dx == 0 and dy == 0:
+            # Вырожденный градиент трансформацией не получить - строим как есть
+            gradient = QLinearGradient(x0, y0, x0, y0)
+            gradient.setStops(stops)
+            return QBrush(gradient)
+
+        # Единичный отрезок (0, 0)-(1, 0) переводится в (dx, dy) поворотом с масштабом
+        brush = QBrush(brush_template)
+        brush.setTransform(QTransform(dx, dy, -dy, dx, x0, y0))
+        return brush
+
+    @staticmethod
+    def _radial_brush(brush_template, stops, center_x, center_y, radius):
+        """Радиальный градиент из (center_x, center_y)"""
+        if radius == 0:
+            gradient = QRadialGradient(center_x, center_y, radius)
+            gradient.setStops(stops)
+            return QBrush(gradient)
+
+        brush = QBrush(brush_template)
+        brush.setTransform(QTransform(radius, 0, 0, radius, center_x, center_y))
+        return brush
+
+
+# Общий реестр процесса
+brush_registry = BrushStyleRegistry()
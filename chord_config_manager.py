@@ -1,78 +1,187 @@
-import pandas as pd
+import logging
 import os
 import json
-from PyQt5.QtGui import QPixmap, QPainter, QBrush, QColor, QLinearGradient, QRadialGradient
+from PyQt5.QtGui import QPixmap, QPainter, QBrush, QColor
 from PyQt5.QtCore import Qt
 
+from brush_styles import brush_registry
+from chord_elements import ChordElements, build_element_records
+
+from config_snapshot import ConfigSnapshotError, DEFAULT_SNAPSHOT_PATH, load_snapshot, save_snapshot
+from startup_profiler import startup_timeline
+
+logger = logging.getLogger(__name__)
+
 
 class ChordConfigManager:
+    # Соответствие колонок CHORDS колонкам таблицы NOTE: (колонка значения, колонка элемента)
+    NOTE_COLUMN_MAPPING = {
+        'FNL': ('FNL', 'FNL_ELEM'),
+        'FN': ('FN', 'FN_ELEM'),
+        'FPOL': ('FPOL', 'FPOL_ELEM'),
+        'FPXL': ('FPXL', 'FPXL_ELEM'),
+        'FP1': ('FP1', 'FP1_ELEM'),
+        'FP2': ('FP2', 'FP2_ELEM'),
+        'FP3': ('FP3', 'FP3_ELEM'),
+        'FP4': ('FP4', 'FP4_ELEM')
+    }
+
     def __init__(self):
         self.excel_path = os.path.join("source", "chord_config.xlsx")
         self.template_path = os.path.join("source", "template.json")
         self.image_path = os.path.join("source", "img.png")
+        self.snapshot_path = DEFAULT_SNAPSHOT_PATH
         self.chord_data = {}
         self.ram_data = {}
         self.note_data = []  # Данные из листа NOTE
+        self.note_index = {}  # (колонка, нормализованное значение) -> ключ элемента
         self.templates = {}
-
-    def load_config_data(self):
-        """Загрузка всех данных из Excel и JSON"""
+        self.element_records = {}  # раздел template.json -> {ключ: ElementRecord}
+
+        # Кэш разрешенных элементов аккордов: (строка аккорда, тип отображения) -> элементы
+        self._elements_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def load_config_data(self, progress_callback=None, use_snapshot=True):
+        """
+        Загрузка всех данных из Excel и JSON.
+        Если исходники не менялись, данные берутся из скомпилированного снимка без pandas.
+        progress_callback(этап) вызывается после каждой части: chords, ram, note, templates
+        """
+        def report(stage):
+            if progress_callback:
+                progress_callback(stage)
+
+        # Любая перезагрузка делает ранее разрешенные аккорды неактуальными
+        self.invalidate_cache()
         try:
+            if use_snapshot and self._load_from_snapshot(report):
+                return True
+
             # Загружаем Excel файл
             if os.path.exists(self.excel_path):
-                # Основной лист с аккордами
-                df_chords = pd.read_excel(self.excel_path, sheet_name='CHORDS')
-                print("=" * 80)
-                print("КОЛОНКИ В EXCEL CHORDS:", df_chords.columns.tolist())
-
-                # Конвертируем в словари
-                self.chord_data = df_chords.to_dict('records')
-                print(f"Загружено {len(self.chord_data)} аккордов")
-
-                # Загружаем данные RAM
-                df_ram = pd.read_excel(self.excel_path, sheet_name='RAM')
-                print("КОЛОНКИ В EXCEL RAM:", df_ram.columns.tolist())
-
-                # Сохраняем RAM данные для использования
-                self.ram_data = df_ram.to_dict('records')
-                print(f"Загружено {len(self.ram_data)} RAM конфигураций")
-
-                # Загружаем данные NOTE
-                try:
-                    df_note = pd.read_excel(self.excel_path, sheet_name='NOTE')
-                    print("КОЛОНКИ В EXCEL NOTE:", df_note.columns.tolist())
-                    print("ПЕРВЫЕ 5 СТРОК NOTE:")
-                    print(df_note.head())
-
-                    # Сохраняем NOTE данные для использования
-                    self.note_data = df_note.to_dict('records')
-                    print(f"Загружено {len(self.note_data)} NOTE конфигураций")
-                except Exception as e:
-                    print(f"⚠️ Лист NOTE не найден или ошибка загрузки: {e}")
-                    self.note_data = []
+                # pandas импортируется только здесь: это самый тяжелый импорт приложения
+                with startup_timeline.phase("импорт pandas"):
+                    import pandas as pd
+
+                with startup_timeline.phase("разбор Excel"):
+                    # Основной лист с аккордами
+                    df_chords = pd.read_excel(self.excel_path, sheet_name='CHORDS')
+                    logger.debug("КОЛОНКИ В EXCEL CHORDS: %s", df_chords.columns.tolist())
+
+                    # Конвертируем в словари
+                    self.chord_data = df_chords.to_dict('records')
+                    logger.info("Загружено %s аккордов", len(self.chord_data))
+                    report('chords')
+
+                    # Загружаем данные RAM
+                    df_ram = pd.read_excel(self.excel_path, sheet_name='RAM')
+                    logger.debug("КОЛОНКИ В EXCEL RAM: %s", df_ram.columns.tolist())
+
+                    # Сохраняем RAM данные для использования
+                    self.ram_data = df_ram.to_dict('records')
+                    logger.info("Загружено %s RAM конфигураций", len(self.ram_data))
+                    report('ram')
+
+                    # Загружаем данные NOTE
+                    try:
+                        df_note = pd.read_excel(self.excel_path, sheet_name='NOTE')
+                        logger.debug("КОЛОНКИ В EXCEL NOTE: %s", df_note.columns.tolist())
+                        logger.debug("ПЕРВЫЕ 5 СТРОК NOTE:\n%s", df_note.head())
+
+                        # Сохраняем NOTE данные для использования
+                        self.note_data = df_note.to_dict('records')
+                        logger.info("Загружено %s NOTE конфигураций", len(self.note_data))
+                    except Exception as e:
+                        logger.warning("⚠️ Лист NOTE не найден или ошибка загрузки: %s", e)
+                        self.note_data = []
+
+                    # Строим индекс NOTE один раз, чтобы поиск элементов был O(1)
+                    self.note_index = self._build_note_index(self.note_data)
+                    logger.info("Индекс NOTE: %s ключей", len(self.note_index))
+                    report('note')
 
             else:
-                print(f"Excel файл не найден: {self.excel_path}")
+                logger.error("Excel файл не найден: %s", self.excel_path)
                 return False
 
             # Загружаем JSON шаблоны
             if os.path.exists(self.template_path):
-                with open(self.template_path, 'r', encoding='utf-8') as f:
+                with startup_timeline.phase("разбор JSON"), open(self.template_path, 'r', encoding='utf-8') as f:
                     self.templates = json.load(f)
-                print("JSON шаблоны загружены")
+                self.element_records = build_element_records(self.templates)
+                logger.info("JSON шаблоны загружены")
+                report('templates')
 
             else:
-                print(f"JSON файл не найдена: {self.template_path}")
+                logger.error("JSON файл не найдена: %s", self.template_path)
                 return False
 
+            # Следующий запуск обойдется без разбора Excel
+            if use_snapshot:
+                self.save_snapshot()
+
             return True
 
         except Exception as e:
-            print(f"Ошибка загрузки конфигурации: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка загрузки конфигурации: %s", e)
+            return False
+
+    def _load_from_snapshot(self, report):
+        """Загрузка из снимка конфигурации, если он соответствует исходным файлам"""
+        with startup_timeline.phase("чтение снимка конфигурации"):
+            snapshot = load_snapshot(self.snapshot_path, [self.excel_path, self.template_path])
+        if snapshot is None:
+            return False
+
+        self.chord_data = snapshot['chord_data']
+        report('chords')
+        self.ram_data = snapshot['ram_data']
+        report('ram')
+        self.note_data = snapshot['note_data']
+        self.note_index = self._build_note_index(self.note_data)
+        report('note')
+        self.templates = snapshot['templates']
+        self.element_records = build_element_records(self.templates)
+        report('templates')
+
+        logger.info("⚡ Конфигурация из снимка: %s аккордов, %s RAM, %s NOTE",
+                    len(self.chord_data), len(self.ram_data), len(self.note_data))
+        return True
+
+    def save_snapshot(self):
+        """Сохраняет загруженные данные в снимок конфигурации"""
+        try:
+            save_snapshot(self.snapshot_path, [self.excel_path, self.template_path],
+                          self.chord_data, self.ram_data, self.note_data, self.templates)
+            logger.info("📦 Снимок конфигурации сохранен: %s", self.snapshot_path)
+            return True
+        except (OSError, ConfigSnapshotError) as e:
+            logger.warning("⚠️ Не удалось сохранить снимок конфигурации: %s", e)
             return False
 
+    def invalidate_cache(self):
+        """Сброс кэша разрешенных элементов аккордов"""
+        self._elements_cache.clear()
+
+    def get_cache_stats(self):
+        """Статистика кэша разрешенных аккордов"""
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._elements_cache)
+        }
+
+    def _chord_cache_key(self, chord_config, display_type):
+        """Ключ кэша: значения колонок, влияющих на разрешение, и тип отображения"""
+        columns = ('RAM', 'BAR') + tuple(self.NOTE_COLUMN_MAPPING)
+        values = tuple(
+            None if self._is_empty_value(chord_config.get(column)) else chord_config.get(column)
+            for column in columns
+        )
+        return values, display_type
+
     def get_chord_groups(self):
         """Получение списка групп аккордов"""
         groups = set()
@@ -107,11 +216,11 @@ class ChordConfigManager:
     def get_ram_crop_area(self, ram_name):
         """Получение области обрезки из RAM в JSON"""
         if not ram_name or self._is_empty_value(ram_name):
-            print(f"RAM '{ram_name}' пустой или не найден")
+            logger.debug("RAM '%s' пустой или не найден", ram_name)
             return None
 
         ram_name = str(ram_name).strip()
-        print(f"🔍 Поиск области обрезки для RAM: '{ram_name}'")
+        logger.debug("🔍 Поиск области обрезки для RAM: '%s'", ram_name)
 
         # Ищем RAM в разделе crop_rects
         if 'crop_rects' in self.templates and ram_name in self.templates['crop_rects']:
@@ -122,29 +231,36 @@ class ChordConfigManager:
                 crop_data.get('width', 100),
                 crop_data.get('height', 100)
             )
-            print(f"✅ Найдена область обрезки '{ram_name}': {area}")
+            logger.debug("✅ Найдена область обрезки '%s': %s", ram_name, area)
             return area
 
-        print(f"❌ Область обрезки для '{ram_name}' не найдена в JSON")
+        logger.warning("❌ Область обрезки для '%s' не найдена в JSON", ram_name)
         return None
 
+    def get_ram_crop_areas(self):
+        """Области обрезки всех RAM из раздела crop_rects"""
+        return [
+            (crop_data.get('x', 0), crop_data.get('y', 0), crop_data.get('width', 100), crop_data.get('height', 100))
+            for crop_data in self.templates.get('crop_rects', {}).values()
+        ]
+
     def get_ram_lad_value(self, ram_name):
         """Получение значения LAD для указанного RAM из таблицы RAM"""
         if not ram_name or self._is_empty_value(ram_name):
             return None
 
         ram_name = str(ram_name).strip()
-        print(f"🔍 Поиск LAD для RAM: '{ram_name}'")
+        logger.debug("🔍 Поиск LAD для RAM: '%s'", ram_name)
 
         # Ищем RAM в таблице RAM
         for ram_item in self.ram_data:
             item_ram = ram_item.get('RAM')
             if item_ram and str(item_ram).strip() == ram_name:
                 lad_value = ram_item.get('LAD')
-                print(f"✅ Найден LAD для RAM '{ram_name}': '{lad_value}'")
+                logger.debug("✅ Найден LAD для RAM '%s': '%s'", ram_name, lad_value)
                 return lad_value
 
-        print(f"❌ RAM '{ram_name}' не найден в таблице RAM")
+        logger.warning("❌ RAM '%s' не найден в таблице RAM", ram_name)
         return None
 
     def get_ram_elements(self, ram_name):
@@ -155,29 +271,17 @@ class ChordConfigManager:
 
         ram_name = str(ram_name).strip()
 
-        # Ищем элементы RAM в frets
-        if ram_name in self.templates.get('frets', {}):
-            element_data = self.templates['frets'][ram_name]
-            element_data['_key'] = ram_name
-            element_data['type'] = 'fret'  # Явно указываем тип
+        fret_records = self.element_records.get('frets', {})
 
-            elements.append({
-                'type': 'fret',
-                'data': element_data
-            })
+        # Ищем элементы RAM в frets
+        if ram_name in fret_records:
+            elements.append(fret_records[ram_name])
 
         # Ищем элементы с суффиксами (RAM1, RAM2 и т.д.)
         for i in range(1, 5):
             element_key = f"{ram_name}{i}"
-            if element_key in self.templates.get('frets', {}):
-                element_data = self.templates['frets'][element_key]
-                element_data['_key'] = element_key
-                element_data['type'] = 'fret'  # Явно указываем тип
-
-                elements.append({
-                    'type': 'fret',
-                    'data': element_data
-                })
+            if element_key in fret_records:
+                elements.append(fret_records[element_key])
 
         return elements
 
@@ -189,35 +293,29 @@ class ChordConfigManager:
             return elements
 
         lad_value = str(lad_value).strip()
-        print(f"🔍 Поиск элементов для LAD: '{lad_value}'")
+        logger.debug("🔍 Поиск элементов для LAD: '%s'", lad_value)
 
         # Разделяем значения по запятой
         lad_keys = [key.strip() for key in lad_value.split(',')]
 
+        fret_records = self.element_records.get('frets', {})
         for lad_key in lad_keys:
             # Формируем ключ для поиска в JSON (добавляем LAD)
             json_key = f"{lad_key}LAD"
-            if json_key in self.templates.get('frets', {}):
-                element_data = self.templates['frets'][json_key]
-                element_data['_key'] = json_key
-                element_data['type'] = 'fret'  # Явно указываем тип
-
-                elements.append({
-                    'type': 'fret',
-                    'data': element_data
-                })
-                print(f"✅ Найден элемент лада: {json_key}")
+            if json_key in fret_records:
+                elements.append(fret_records[json_key])
+                logger.debug("✅ Найден элемент лада: %s", json_key)
             else:
-                print(f"❌ Элемент лада не найден в JSON: {json_key}")
+                logger.warning("❌ Элемент лада не найден в JSON: %s", json_key)
 
-        print(f"📊 Найдено {len(elements)} элементов LAD")
+        logger.debug("📊 Найдено %s элементов LAD", len(elements))
         return elements
 
     def _is_empty_value(self, value):
         """Проверка на пустое значение"""
         if value is None:
             return True
-        if isinstance(value, float) and pd.isna(value):
+        if isinstance(value, float) and value != value:  # NaN
             return True
         if isinstance(value, str) and value.strip() == '':
             return True
@@ -232,7 +330,7 @@ class ChordConfigManager:
         required_fields = ['x', 'y', 'width', 'height']
         for field in required_fields:
             if field not in barre_data:
-                print(f"❌ Отсутствует поле {field} в данных баре")
+                logger.warning("❌ Отсутствует поле %s в данных баре", field)
                 return False
 
         return True
@@ -245,27 +343,22 @@ class ChordConfigManager:
             return elements
 
         bar_str = str(bar_value).strip()
-        print(f"🔍 Поиск баре: '{bar_str}'")
+        logger.debug("🔍 Поиск баре: '%s'", bar_str)
 
         # Ищем баре в разделе barres
-        if bar_str in self.templates.get('barres', {}):
-            barre_data = self.templates['barres'][bar_str]
-
-            # Добавляем ключ для идентификации типа
-            barre_data['_key'] = bar_str
-            barre_data['type'] = 'barre'
+        barre_record = self.element_records.get('barres', {}).get(bar_str)
+        if barre_record is not None:
+            barre_data = barre_record.data
 
             # Валидируем данные баре
             if self.validate_barre_data(barre_data):
-                elements.append({
-                    'type': 'barre',
-                    'data': barre_data
-                })
-                print(f"✅ Найден баре: {bar_str} - {barre_data.get('width', 0)}x{barre_data.get('height', 0)}")
+                elements.append(barre_record)
+                logger.debug("✅ Найден баре: %s - %sx%s",
+                             bar_str, barre_data.get('width', 0), barre_data.get('height', 0))
             else:
-                print(f"❌ Невалидные данные баре: {bar_str}")
+                logger.warning("❌ Невалидные данные баре: %s", bar_str)
         else:
-            print(f"❌ Баре не найден: {bar_str}")
+            logger.warning("❌ Баре не найден: %s", bar_str)
 
         return elements
 
@@ -283,20 +376,20 @@ class ChordConfigManager:
         # Например: "21.25" может быть "21,25" в Excel
         note_list = self._parse_note_values(note_str)
 
-        print(f"🔍 Поиск элементов для колонки '{column_name}': {note_list}")
+        logger.debug("🔍 Поиск элементов для колонки '%s': %s", column_name, note_list)
 
         for note_key in note_list:
-            print(f"  🔎 Обработка значения: '{note_key}'")
+            logger.debug("  🔎 Обработка значения: '%s'", note_key)
 
             # Ищем в таблице NOTE
             element_found = self._find_element_in_note_table(note_key, column_name)
             if element_found:
                 elements.append(element_found)
-                print(f"  ✅ Найден элемент для '{note_key}': {element_found['type']}")
+                logger.debug("  ✅ Найден элемент для '%s': %s", note_key, element_found.type)
             else:
-                print(f"  ❌ Элемент не найден в таблице NOTE для '{note_key}'")
+                logger.warning("  ❌ Элемент не найден в таблице NOTE для '%s'", note_key)
 
-        print(f"📝 Найдено {len(elements)} элементов для колонки '{column_name}'")
+        logger.debug("📝 Найдено %s элементов для колонки '%s'", len(elements), column_name)
         return elements
 
     def _parse_note_values(self, note_str):
@@ -345,154 +438,135 @@ class ChordConfigManager:
         else:
             return str(value)
 
+    def _normalize_note_value(self, value):
+        """Нормализует значение NOTE для индекса: запятая == точка, '11' == '11.0'"""
+        text = str(value).strip().replace(',', '.')
+        try:
+            # Округление повторяет сравнение с погрешностью 0.001
+            return round(float(text), 3)
+        except ValueError:
+            return text
+
+    def _build_note_index(self, note_data):
+        """Строит индекс (колонка, нормализованное значение) -> ключ элемента"""
+        index = {}
+        for column_name, (source_col, elem_col) in self.NOTE_COLUMN_MAPPING.items():
+            for note_item in note_data:
+                item_value = note_item.get(source_col)
+                if not item_value or self._is_empty_value(item_value):
+                    continue
+
+                elem_value = note_item.get(elem_col)
+                if not elem_value or self._is_empty_value(elem_value):
+                    continue
+
+                key = (column_name, self._normalize_note_value(self._convert_value_to_string(item_value)))
+                # Как и при линейном поиске, выигрывает первая подходящая строка
+                index.setdefault(key, self._convert_value_to_string(elem_value))
+        return index
+
     def _find_element_in_note_table(self, note_key, column_name):
         """Поиск элемента в таблице NOTE по ключу и колонке"""
         if not self.note_data:
-            print(f"  ⚠️ Таблица NOTE не загружена, поиск напрямую в JSON")
+            logger.warning("  ⚠️ Таблица NOTE не загружена, поиск напрямую в JSON")
             return self._find_element_in_json(note_key)
 
-        # Определяем соответствие колонок
-        column_mapping = {
-            'FNL': ('FNL', 'FNL_ELEM'),
-            'FN': ('FN', 'FN_ELEM'),
-            'FPOL': ('FPOL', 'FPOL_ELEM'),
-            'FPXL': ('FPXL', 'FPXL_ELEM'),
-            'FP1': ('FP1', 'FP1_ELEM'),
-            'FP2': ('FP2', 'FP2_ELEM'),
-            'FP3': ('FP3', 'FP3_ELEM'),
-            'FP4': ('FP4', 'FP4_ELEM')
-        }
-
-        if column_name not in column_mapping:
-            print(f"  ❌ Неизвестная колонка: {column_name}")
+        if column_name not in self.NOTE_COLUMN_MAPPING:
+            logger.warning("  ❌ Неизвестная колонка: %s", column_name)
             return None
 
-        source_col, elem_col = column_mapping[column_name]
-
-        # Ищем в таблице NOTE
-        for note_item in self.note_data:
-            item_value = note_item.get(source_col)
-            if item_value and not self._is_empty_value(item_value):
-                # Конвертируем значение из таблицы для сравнения
-                item_value_str = self._convert_value_to_string(item_value)
-
-                # Пробуем разные варианты сравнения
-                if self._values_match(item_value_str, note_key):
-                    elem_value = note_item.get(elem_col)
-                    if elem_value and not self._is_empty_value(elem_value):
-                        elem_key = self._convert_value_to_string(elem_value)
-                        print(f"  ✅ Найден элемент в NOTE: {note_key} -> {elem_key}")
-                        return self._find_element_in_json(elem_key)
+        elem_key = self.note_index.get((column_name, self._normalize_note_value(note_key)))
+        if elem_key is not None:
+            logger.debug("  ✅ Найден элемент в NOTE: %s -> %s", note_key, elem_key)
+            return self._find_element_in_json(elem_key)
 
-        print(f"  ❌ Не найдено соответствие в NOTE для '{note_key}' в колонке '{source_col}'")
+        source_col = self.NOTE_COLUMN_MAPPING[column_name][0]
+        logger.warning("  ❌ Не найдено соответствие в NOTE для '%s' в колонке '%s'", note_key, source_col)
         return None
 
-    def _values_match(self, value1, value2):
-        """Проверяет, совпадают ли значения с учетом специальных случаев"""
-        # Прямое сравнение
-        if str(value1).strip() == str(value2).strip():
-            return True
-
-        # Если одно значение с точкой, а другое с запятой
-        v1_clean = str(value1).replace('.', ',').strip()
-        v2_clean = str(value2).replace('.', ',').strip()
-        if v1_clean == v2_clean:
-            return True
-
-        # Если одно значение целое, а другое дробное с .0
-        try:
-            v1_float = float(value1)
-            v2_float = float(value2)
-            if abs(v1_float - v2_float) < 0.001:  # Сравнение с небольшой погрешностью
-                return True
-        except (ValueError, TypeError):
-            pass
-
-        return False
-
     def _find_element_in_json(self, element_key):
         """Поиск элемента в различных разделах JSON"""
         element_key = element_key.strip()
 
         # Ищем в notes
-        if element_key in self.templates.get('notes', {}):
-            element_data = self.templates['notes'][element_key]
-            # Добавляем ключ для отладки
-            element_data['_key'] = element_key
-            element_data['type'] = 'note'  # Явно указываем тип
-            print(f"    ✅ Найден элемент ноты: {element_key} (стиль: {element_data.get('style', 'default')})")
-            return {
-                'type': 'note',
-                'data': element_data
-            }
+        record = self.element_records.get('notes', {}).get(element_key)
+        if record is not None:
+            logger.debug("    ✅ Найден элемент ноты: %s (стиль: %s)", element_key, record.data.get('style', 'default'))
+            return record
 
         # Ищем в open_notes
-        if element_key in self.templates.get('open_notes', {}):
-            element_data = self.templates['open_notes'][element_key]
-            element_data['_key'] = element_key
-            element_data['type'] = 'note'  # Явно указываем тип
-            print(f"    ✅ Найден элемент открытой ноты: {element_key} (стиль: {element_data.get('style', 'default')})")
-            return {
-                'type': 'note',
-                'data': element_data
-            }
+        record = self.element_records.get('open_notes', {}).get(element_key)
+        if record is not None:
+            logger.debug("    ✅ Найден элемент открытой ноты: %s (стиль: %s)",
+                         element_key, record.data.get('style', 'default'))
+            return record
 
         # Ищем в frets (лады)
-        if element_key in self.templates.get('frets', {}):
-            element_data = self.templates['frets'][element_key]
-            element_data['_key'] = element_key
-            element_data['type'] = 'fret'  # Явно указываем тип
-            print(f"    ✅ Найден элемент лада: {element_key}")
-            return {
-                'type': 'fret',
-                'data': element_data
-            }
-
-        print(f"    ❌ Элемент не найден в JSON: {element_key}")
+        record = self.element_records.get('frets', {}).get(element_key)
+        if record is not None:
+            logger.debug("    ✅ Найден элемент лада: %s", element_key)
+            return record
+
+        logger.warning("    ❌ Элемент не найден в JSON: %s", element_key)
         return None
 
     def get_chord_elements(self, chord_config, display_type):
-        """Получение элементов аккорда в зависимости от типа отображения"""
+        """Получение элементов аккорда (ChordElements) в зависимости от типа отображения (с кэшем)"""
+        cache_key = self._chord_cache_key(chord_config, display_type)
+        cached = self._elements_cache.get(cache_key)
+        if cached is not None:
+            self.cache_hits += 1
+            logger.debug("⚡ Аккорд взят из кэша (%s попаданий, %s промахов)", self.cache_hits, self.cache_misses)
+            return cached
+
+        self.cache_misses += 1
+        elements = ChordElements(self._resolve_chord_elements(chord_config, display_type))
+        self._elements_cache[cache_key] = elements
+        return elements
+
+    def _resolve_chord_elements(self, chord_config, display_type):
+        """Полное разрешение элементов аккорда: RAM -> LAD -> BAR -> ноты"""
         elements = []
 
-        print(f"🎵 Получение элементов для аккорда:")
-        print(f"   RAM: {chord_config.get('RAM')}")
-        print(f"   BAR: {chord_config.get('BAR')}")
-        print(f"   FNL: {chord_config.get('FNL')} (тип: {type(chord_config.get('FNL'))})")
-        print(f"   FN: {chord_config.get('FN')} (тип: {type(chord_config.get('FN'))})")
-        print(f"   FPOL: {chord_config.get('FPOL')} (тип: {type(chord_config.get('FPOL'))})")
-        print(f"   FPXL: {chord_config.get('FPXL')} (тип: {type(chord_config.get('FPXL'))})")
-        print(f"   FP1: {chord_config.get('FP1')} (тип: {type(chord_config.get('FP1'))})")
-        print(f"   FP2: {chord_config.get('FP2')} (тип: {type(chord_config.get('FP2'))})")
-        print(f"   FP3: {chord_config.get('FP3')} (тип: {type(chord_config.get('FP3'))})")
-        print(f"   FP4: {chord_config.get('FP4')} (тип: {type(chord_config.get('FP4'))})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🎵 Получение элементов для аккорда:")
+            logger.debug("   RAM: %s", chord_config.get('RAM'))
+            logger.debug("   BAR: %s", chord_config.get('BAR'))
+            logger.debug("   FNL: %s (тип: %s)", chord_config.get('FNL'), type(chord_config.get('FNL')))
+            logger.debug("   FN: %s (тип: %s)", chord_config.get('FN'), type(chord_config.get('FN')))
+            logger.debug("   FPOL: %s (тип: %s)", chord_config.get('FPOL'), type(chord_config.get('FPOL')))
+            logger.debug("   FPXL: %s (тип: %s)", chord_config.get('FPXL'), type(chord_config.get('FPXL')))
+            logger.debug("   FP1: %s (тип: %s)", chord_config.get('FP1'), type(chord_config.get('FP1')))
+            logger.debug("   FP2: %s (тип: %s)", chord_config.get('FP2'), type(chord_config.get('FP2')))
+            logger.debug("   FP3: %s (тип: %s)", chord_config.get('FP3'), type(chord_config.get('FP3')))
+            logger.debug("   FP4: %s (тип: %s)", chord_config.get('FP4'), type(chord_config.get('FP4')))
 
         # Получаем значение LAD из таблицы RAM на основе RAM аккорда
         ram_key = chord_config.get('RAM')
         lad_value = None
         if ram_key:
             lad_value = self.get_ram_lad_value(ram_key)
-            print(f"   LAD (из таблицы RAM): {lad_value}")
+            logger.debug("   LAD (из таблицы RAM): %s", lad_value)
 
         # Добавляем RAM элементы из колонки RAM (для обрезки)
         if ram_key:
             ram_elements = self.get_ram_elements(ram_key)
             elements.extend(ram_elements)
-            print(f"🔧 Добавлено {len(ram_elements)} элементов RAM")
+            logger.debug("🔧 Добавлено %s элементов RAM", len(ram_elements))
 
         # Добавляем LAD элементы на основе значения из таблицы RAM
         if lad_value:
             lad_elements = self.get_ram_elements_from_lad(lad_value)
             elements.extend(lad_elements)
-            print(f"🎯 Добавлено {len(lad_elements)} элементов LAD")
+            logger.debug("🎯 Добавлено %s элементов LAD", len(lad_elements))
 
         # Добавляем элементы баре ТОЛЬКО для режима пальцев
         if display_type == "fingers":
             bar_elements = self.get_barre_elements(chord_config.get('BAR'))
             elements.extend(bar_elements)
-            print(f"🎸 Добавлено {len(bar_elements)} элементов баре")
+            logger.debug("🎸 Добавлено %s элементов баре", len(bar_elements))
         else:
-            print("🎸 Баре пропущен (режим нот)")
+            logger.debug("🎸 Баре пропущен (режим нот)")
 
         if display_type == "notes":
             # Для нот: используем FNL и FN
@@ -501,7 +575,7 @@ class ChordConfigManager:
 
             elements.extend(fnl_elements)
             elements.extend(fn_elements)
-            print(f"🎵 Добавлено {len(fnl_elements) + len(fn_elements)} элементов нот")
+            logger.debug("🎵 Добавлено %s элементов нот", len(fnl_elements) + len(fn_elements))
 
         else:  # fingers
             # Для пальцев: используем FPOL, FPXL, FP1, FP2, FP3, FP4
@@ -518,10 +592,10 @@ class ChordConfigManager:
             elements.extend(fp2_elements)
             elements.extend(fp3_elements)
             elements.extend(fp4_elements)
-            print(
-                f"👆 Добавлено {len(fpol_elements) + len(fpxl_elements) + len(fp1_elements) + len(fp2_elements) + len(fp3_elements) + len(fp4_elements)} элементов пальцев")
+            logger.debug("👆 Добавлено %s элементов пальцев",
+                         len(fpol_elements) + len(fpxl_elements) + len(fp1_elements) + len(fp2_elements) + len(fp3_elements) + len(fp4_elements))
 
-        print(f"📊 ИТОГО элементов для отрисовки: {len(elements)}")
+        logger.debug("📊 ИТОГО элементов для отрисовки: %s", len(elements))
 
         return elements
 
@@ -535,12 +609,12 @@ class ChordConfigManager:
 
         try:
             for element in elements:
-                if element['type'] == 'fret':
-                    self.draw_fret(painter, element['data'], crop_rect)
-                elif element['type'] == 'note':
-                    self.draw_note(painter, element['data'], crop_rect)
-                elif element['type'] == 'barre':
-                    self.draw_barre(painter, element['data'], crop_rect)
+                if element.type == 'fret':
+                    self.draw_fret(painter, element.data, crop_rect)
+                elif element.type == 'note':
+                    self.draw_note(painter, element.data, crop_rect)
+                elif element.type == 'barre':
+                    self.draw_barre(painter, element.data, crop_rect)
 
         finally:
             painter.end()
@@ -551,16 +625,14 @@ class ChordConfigManager:
         """Рисование элементов на готовом QPainter с правильными координатами"""
         try:
             for element in elements:
-                if element['type'] == 'fret':
-                    self.draw_fret_on_canvas(painter, element['data'], crop_rect)
-                elif element['type'] == 'note':
-                    self.draw_note_on_canvas(painter, element['data'], crop_rect)
-                elif element['type'] == 'barre':
-                    self.draw_barre_on_canvas(painter, element['data'], crop_rect)
+                if element.type == 'fret':
+                    self.draw_fret_on_canvas(painter, element.data, crop_rect)
+                elif element.type == 'note':
+                    self.draw_note_on_canvas(painter, element.data, crop_rect)
+                elif element.type == 'barre':
+                    self.draw_barre_on_canvas(painter, element.data, crop_rect)
         except Exception as e:
-            print(f"❌ Ошибка рисования элементов на canvas: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Ошибка рисования элементов на canvas: %s", e)
 
     def draw_fret(self, painter, fret_data, crop_rect=None):
         """Рисование лада с учетом обрезки"""
@@ -568,26 +640,27 @@ class ChordConfigManager:
             # Адаптируем координаты к обрезанному изображению
             adapted_data = self._adapt_coordinates_simple(fret_data, crop_rect)
             symbol = adapted_data.get('symbol', '?')
-            print(f"🎨 Рисование лада: {symbol} на позиции ({adapted_data.get('x', 0)}, {adapted_data.get('y', 0)})")
+            logger.debug("🎨 Рисование лада: %s на позиции (%s, %s)",
+                         symbol, adapted_data.get('x', 0), adapted_data.get('y', 0))
 
             from drawing_elements import DrawingElements
             DrawingElements.draw_fret(painter, adapted_data)
         except Exception as e:
-            print(f"❌ Ошибка рисования лада: {e}")
+            logger.error("❌ Ошибка рисования лада: %s", e)
 
     def draw_fret_on_canvas(self, painter, fret_data, crop_rect):
         """Рисование лада на canvas с правильными координатами"""
         try:
             # Адаптируем координаты к canvas
-            adapted_data = self._adapt_coordinates_for_canvas(fret_data, crop_rect)
+            adapted_data = self._adapt_coordinates_for_canvas(fret_data, crop_rect, 'fret')
             symbol = adapted_data.get('symbol', '?')
-            print(
-                f"🎨 Рисование лада на canvas: {symbol} на позиции ({adapted_data.get('x', 0)}, {adapted_data.get('y', 0)})")
+            logger.debug("🎨 Рисование лада на canvas: %s на позиции (%s, %s)",
+                         symbol, adapted_data.get('x', 0), adapted_data.get('y', 0))
 
             from drawing_elements import DrawingElements
             DrawingElements.draw_fret(painter, adapted_data)
         except Exception as e:
-            print(f"❌ Ошибка рисования лада на canvas: {e}")
+            logger.error("❌ Ошибка рисования лада на canvas: %s", e)
 
     def draw_note(self, painter, note_data, crop_rect=None):
         """Рисование ноты с учетом обрезки"""
@@ -604,19 +677,19 @@ class ChordConfigManager:
             else:  # finger
                 symbol = adapted_data.get('finger', '1')
 
-            print(f"🎵 Рисование ноты: {symbol} на позиции ({adapted_data.get('x', 0)}, {adapted_data.get('y', 0)}) "
-                  f"стиль: {adapted_data.get('style', 'default')}")
+            logger.debug("🎵 Рисование ноты: %s на позиции (%s, %s) стиль: %s",
+                         symbol, adapted_data.get('x', 0), adapted_data.get('y', 0), adapted_data.get('style', 'default'))
 
             from drawing_elements import DrawingElements
             DrawingElements.draw_note(painter, adapted_data)
         except Exception as e:
-            print(f"Ошибка рисования ноты: {e}")
+            logger.error("Ошибка рисования ноты: %s", e)
 
     def draw_note_on_canvas(self, painter, note_data, crop_rect):
         """Рисование ноты на canvas с правильными координатами"""
         try:
             # Адаптируем координаты к canvas
-            adapted_data = self._adapt_coordinates_for_canvas(note_data, crop_rect)
+            adapted_data = self._adapt_coordinates_for_canvas(note_data, crop_rect, 'note')
 
             # Определяем тип отображаемого текста
             display_text = adapted_data.get('display_text', 'finger')
@@ -627,14 +700,13 @@ class ChordConfigManager:
             else:  # finger
                 symbol = adapted_data.get('finger', '1')
 
-            print(
-                f"🎵 Рисование ноты на canvas: {symbol} на позиции ({adapted_data.get('x', 0)}, {adapted_data.get('y', 0)}) "
-                f"стиль: {adapted_data.get('style', 'default')}")
+            logger.debug("🎵 Рисование ноты на canvas: %s на позиции (%s, %s) стиль: %s",
+                         symbol, adapted_data.get('x', 0), adapted_data.get('y', 0), adapted_data.get('style', 'default'))
 
             from drawing_elements import DrawingElements
             DrawingElements.draw_note(painter, adapted_data)
         except Exception as e:
-            print(f"Ошибка рисования ноты на canvas: {e}")
+            logger.error("Ошибка рисования ноты на canvas: %s", e)
 
     def draw_barre(self, painter, barre_data, crop_rect=None):
         """Рисование баре с учетом обрезки - ПРОСТОЙ СДВИГ КООРДИНАТ"""
@@ -642,33 +714,27 @@ class ChordConfigManager:
             # Адаптируем координаты к обрезанному изображению
             adapted_data = self._adapt_coordinates_simple(barre_data, crop_rect)
 
-            print(f"🎸 Рисование баре: позиция ({adapted_data.get('x', 0)}, {adapted_data.get('y', 0)}) "
-                  f"размер {adapted_data.get('width', 0)}x{adapted_data.get('height', 0)} "
-                  f"стиль {adapted_data.get('style', 'default')}")
+            logger.debug("🎸 Рисование баре: позиция (%s, %s) размер %sx%s стиль %s",
+                         adapted_data.get('x', 0), adapted_data.get('y', 0), adapted_data.get('width', 0), adapted_data.get('height', 0), adapted_data.get('style', 'default'))
 
             from drawing_elements import DrawingElements
             DrawingElements.draw_barre(painter, adapted_data)
         except Exception as e:
-            print(f"❌ Ошибка рисования баре: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Ошибка рисования баре: %s", e)
 
     def draw_barre_on_canvas(self, painter, barre_data, crop_rect):
         """Рисование баре на canvas с правильными координатами"""
         try:
             # Адаптируем координаты к canvas
-            adapted_data = self._adapt_coordinates_for_canvas(barre_data, crop_rect)
+            adapted_data = self._adapt_coordinates_for_canvas(barre_data, crop_rect, 'barre')
 
-            print(f"🎸 Рисование баре на canvas: позиция ({adapted_data.get('x', 0)}, {adapted_data.get('y', 0)}) "
-                  f"размер {adapted_data.get('width', 0)}x{adapted_data.get('height', 0)} "
-                  f"радиус {adapted_data.get('radius', 0)}")
+            logger.debug("🎸 Рисование баре на canvas: позиция (%s, %s) размер %sx%s радиус %s",
+                         adapted_data.get('x', 0), adapted_data.get('y', 0), adapted_data.get('width', 0), adapted_data.get('height', 0), adapted_data.get('radius', 0))
 
             from drawing_elements import DrawingElements
             DrawingElements.draw_barre(painter, adapted_data)
         except Exception as e:
-            print(f"❌ Ошибка рисования баре на canvas: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Ошибка рисования баре на canvas: %s", e)
 
     def _adapt_coordinates_simple(self, element_data, crop_rect):
         """Простая адаптация координат - только сдвиг без масштабирования"""
@@ -701,7 +767,7 @@ class ChordConfigManager:
 
         return adapted_data
 
-    def _adapt_coordinates_for_canvas(self, element_data, crop_rect):
+    def _adapt_coordinates_for_canvas(self, element_data, crop_rect, element_type=None):
         """Упрощенная адаптация координат для canvas - ВСЕ элементы одинаково"""
         if not crop_rect:
             return element_data.copy()
@@ -715,9 +781,9 @@ class ChordConfigManager:
         original_x = element_data.get('x', 0)
         original_y = element_data.get('y', 0)
 
-        print(f"🎯 Адаптация {element_data.get('type', 'unknown')}:")
-        print(f"   Оригинальные координаты: ({original_x}, {original_y})")
-        print(f"   Область обрезки: ({crop_x}, {crop_y}, {crop_width}, {crop_height})")
+        logger.debug("🎯 Адаптация %s:", element_type or 'unknown')
+        logger.debug("   Оригинальные координаты: (%s, %s)", original_x, original_y)
+        logger.debug("   Область обрезки: (%s, %s, %s, %s)", crop_x, crop_y, crop_width, crop_height)
 
         # Для ВСЕХ элементов просто вычитаем координаты обрезки
         if 'x' in adapted_data:
@@ -731,7 +797,7 @@ class ChordConfigManager:
         adapted_data['y'] = int(round(adapted_data.get('y', 0)))
 
         # Для баре - дополнительная коррекция координат (центр -> левый верхний угол)
-        if adapted_data.get('type') == 'barre':
+        if element_type == 'barre':
             barre_width = adapted_data.get('width', 100)
             barre_height = adapted_data.get('height', 20)
 
@@ -740,101 +806,12 @@ class ChordConfigManager:
             if 'y' in adapted_data:
                 adapted_data['y'] = adapted_data['y'] - (barre_height // 2)
 
-        print(f"   Финальные координаты: ({adapted_data.get('x', 0)}, {adapted_data.get('y', 0)})")
+        logger.debug("   Финальные координаты: (%s, %s)", adapted_data.get('x', 0), adapted_data.get('y', 0))
 
         return adapted_data
 
     def get_brush_from_style(self, style_name, x=0, y=0, radius=0, width=0, height=0):
-        """Получение кисти на основе стиля с поддержкой градиентов"""
-        if style_name == "wood":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(210, 180, 140))
-            gradient.setColorAt(0.5, QColor(160, 120, 80))
-            gradient.setColorAt(1, QColor(210, 180, 140))
-            return QBrush(gradient)
-        elif style_name == "metal":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(200, 200, 200))
-            gradient.setColorAt(0.5, QColor(100, 100, 100))
-            gradient.setColorAt(1, QColor(200, 200, 200))
-            return QBrush(gradient)
-        elif style_name == "rubber":
-            gradient = QRadialGradient(x + width / 2, y + height / 2, max(width, height))
-            gradient.setColorAt(0, QColor(80, 80, 80))
-            gradient.setColorAt(1, QColor(40, 40, 40))
-            return QBrush(gradient)
-        elif style_name == "gradient":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(189, 183, 107))
-            lighter = QColor(189, 183, 107).lighter(150)
-            gradient.setColorAt(1, QColor(lighter.red(), lighter.green(), lighter.blue()))
-            return QBrush(gradient)
-        elif style_name == "striped":
-            return QBrush(QColor(189, 183, 107))
-
-        # НОВЫЕ ОРАНЖЕВЫЕ СТИЛИ ДЛЯ БАРЕ (ТАКИЕ ЖЕ КАК В drawing_elements.py)
-        elif style_name == "orange_gradient":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 200, 100))  # Светло-оранжевый
-            gradient.setColorAt(0.5, QColor(255, 140, 0))  # Оранжевый
-            gradient.setColorAt(1, QColor(255, 100, 0))  # Темно-оранжевый
-            return QBrush(gradient)
-        elif style_name == "orange_metal":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 220, 150))
-            gradient.setColorAt(0.3, QColor(255, 180, 80))
-            gradient.setColorAt(0.7, QColor(255, 140, 40))
-            gradient.setColorAt(1, QColor(255, 120, 20))
-            return QBrush(gradient)
-        elif style_name == "orange_glow":
-            gradient = QRadialGradient(x + width / 2, y + height / 2, max(width, height) * 0.8)
-            gradient.setColorAt(0, QColor(255, 230, 180))
-            gradient.setColorAt(0.5, QColor(255, 180, 80))
-            gradient.setColorAt(1, QColor(255, 140, 0))
-            return QBrush(gradient)
-        elif style_name == "dark_orange":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 150, 50))
-            gradient.setColorAt(0.5, QColor(255, 120, 0))
-            gradient.setColorAt(1, QColor(220, 100, 0))
-            return QBrush(gradient)
-        elif style_name == "orange_wood":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 200, 150))
-            gradient.setColorAt(0.3, QColor(255, 170, 100))
-            gradient.setColorAt(0.7, QColor(255, 140, 60))
-            gradient.setColorAt(1, QColor(255, 120, 40))
-            return QBrush(gradient)
-        elif style_name == "bright_orange":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 230, 100))
-            gradient.setColorAt(0.5, QColor(255, 200, 0))
-            gradient.setColorAt(1, QColor(255, 160, 0))
-            return QBrush(gradient)
-        elif style_name == "orange_red":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 180, 100))
-            gradient.setColorAt(0.5, QColor(255, 120, 0))
-            gradient.setColorAt(1, QColor(255, 80, 0))
-            return QBrush(gradient)
-        elif style_name == "orange_yellow":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 240, 150))
-            gradient.setColorAt(0.5, QColor(255, 200, 50))
-            gradient.setColorAt(1, QColor(255, 180, 0))
-            return QBrush(gradient)
-        elif style_name == "orange_brown":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 190, 130))
-            gradient.setColorAt(0.5, QColor(255, 150, 80))
-            gradient.setColorAt(1, QColor(210, 120, 60))
-            return QBrush(gradient)
-        elif style_name == "orange_pastel":
-            gradient = QLinearGradient(x, y, x + width, y + height)
-            gradient.setColorAt(0, QColor(255, 220, 180))
-            gradient.setColorAt(0.5, QColor(255, 190, 140))
-            gradient.setColorAt(1, QColor(255, 170, 120))
-            return QBrush(gradient)
-
-        # Стиль по умолчанию
-        return QBrush(QColor(189, 183, 107))  # Золотистый по умолчанию
\ No newline at end of file
+        """Получение кисти для баре: стили баре из общего реестра (brush_styles.py)"""
+        if not brush_registry.is_barre_style(style_name):
+            return QBrush(QColor(189, 183, 107))  # Золотистый по умолчанию
+        return brush_registry.get_brush(style_name, x, y, radius, width, height)
@@ -0,0 +1,151 @@
+"""
+Записи элементов шаблона аккордов (лады, ноты, баре).
+
+Записи строятся один раз при загрузке template.json и больше не меняются:
+разделы templates остаются такими, как в файле, поэтому разрешение аккордов
+безопасно выполнять из рабочих потоков. Настройки отображения (обводка,
+числовые лады) применяются производными записями - каждая создается один раз
+на сочетание настроек, а не копированием словарей при каждой отрисовке.
+
+Разрешенный аккорд хранится в ChordElements: записи Fret/Note/Barre и сдвиг
+координат, по которым рисуют и ChordConfigTab, и StandaloneChordConfigTab.
+"""
+
+from types import MappingProxyType
+
+
+class ElementRecord:
+    """
+    Элемент шаблона: ключ в template.json, данные только для чтения
+    и поля FIELDS, вынесенные в слоты для быстрого доступа при отрисовке
+    """
+
+    __slots__ = ('key', 'data', '_overlays')
+    type = None
+    FIELDS = {}  # поле данных -> значение по умолчанию
+
+    def __init__(self, key, data):
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'data', MappingProxyType(dict(data)))
+        object.__setattr__(self, '_overlays', {})
+        for name, default in self.FIELDS.items():
+            object.__setattr__(self, name, data.get(name, default))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} неизменяем: {name}")
+
+    def overlay(self, **overrides):
+        """
+        Запись с замененными полями данных (например outline_width или symbol).
+        Для одного набора замен всегда возвращается одна и та же запись
+        """
+        if not overrides:
+            return self
+
+        overlay_key = tuple((name, tuple(value) if isinstance(value, list) else value)
+                            for name, value in sorted(overrides.items()))
+        record = self._overlays.get(overlay_key)
+        if record is None:
+            record = type(self)(self.key, {**self.data, **overrides})
+            # setdefault: при гонке потоков все получат одну запись
+            record = self._overlays.setdefault(overlay_key, record)
+        return record
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.key!r})"
+
+
+class Fret(ElementRecord):
+    """Символ лада, x и y - центр текста"""
+
+    __slots__ = ('x', 'y', 'symbol')
+    type = 'fret'
+    FIELDS = {'x': 0, 'y': 0, 'symbol': 'I'}
+
+
+class Note(ElementRecord):
+    """Нота или палец, x и y - центр круга"""
+
+    __slots__ = ('x', 'y', 'radius', 'outline_width')
+    type = 'note'
+    FIELDS = {'x': 0, 'y': 0, 'radius': 10, 'outline_width': 0}
+
+
+class Barre(ElementRecord):
+    """Баре - скругленный прямоугольник"""
+
+    __slots__ = ('x', 'y', 'width', 'height', 'radius', 'outline_width')
+    type = 'barre'
+    FIELDS = {'x': 0, 'y': 0, 'width': 50, 'height': 20, 'radius': 10, 'outline_width': 0}
+
+
+ELEMENT_TYPES = {
+    'fret': Fret,
+    'note': Note,
+    'barre': Barre
+}
+
+# Раздел template.json -> класс элемента
+TEMPLATE_SECTIONS = {
+    'frets': Fret,
+    'notes': Note,
+    'open_notes': Note,
+    'barres': Barre
+}
+
+
+def build_element_records(templates):
+    """Записи всех элементов шаблона: раздел -> {ключ: запись}"""
+    records = {}
+    for section, record_class in TEMPLATE_SECTIONS.items():
+        records[section] = {
+            key: record_class(key, data)
+            for key, data in templates.get(section, {}).items()
+        }
+    return records
+
+
+class ChordElements:
+    """
+    Элементы разрешенного аккорда: кортеж общих записей и сдвиг координат (dx, dy).
+    Координаты берутся из записей, поэтому в кэше аккорд - только кортеж ссылок,
+    а сдвиг на область обрезки - новый объект с тем же кортежем, без прохода по элементам
+    """
+
+    __slots__ = ('records', 'dx', 'dy')
+
+    def __init__(self, records, dx=0, dy=0):
+        self.records = records if isinstance(records, tuple) else tuple(records)
+        self.dx = dx
+        self.dy = dy
+
+    @classmethod
+    def from_dicts(cls, elements):
+        """Элементы вида {'type': ..., 'data': {...}} (сохраненная конфигурация)"""
+        return cls(ELEMENT_TYPES[element['type']](None, element.get('data', {}))
+                   for element in elements if element.get('type') in ELEMENT_TYPES)
+
+    def translated(self, dx, dy):
+        """Те же элементы со сдвигом координат на (dx, dy)"""
+        if not dx and not dy:
+            return self
+        return ChordElements(self.records, self.dx + dx, self.dy + dy)
+
+    def with_records(self, records):
+        """Другие записи тех же элементов с тем же сдвигом (наложения не меняют геометрию)"""
+        return ChordElements(records, self.dx, self.dy)
+
+    def positions(self):
+        """
+        Итератор (запись, x, y, radius) со сдвигом.
+        Радиусы в шаблоне - целые пиксели (размер шрифта ноты считается от радиуса)
+        """
+        dx, dy = self.dx, self.dy
+        for record in self.records:
+            yield record, record.x + dx, record.y + dy, int(getattr(record, 'radius', 0))
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
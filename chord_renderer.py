@@ -0,0 +1,416 @@
+"""
+Отрисовка аккордов без привязки к виджетам.
+Используется вкладкой ChordConfigTab и пакетным рендером batch_render.py
+"""
+
+import logging
+
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor
+
+from chord_elements import ChordElements
+from drawing_elements import DrawingElements
+from sprite_atlas import SpriteAtlas, device_point, sprite_scale
+from template_pyramid import TemplatePyramid, clamp_crop_rect, get_target_size
+from text_layout import text_layout_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ChordRenderer:
+    """Рисует аккорд поверх шаблона: обрезка по RAM, элементы с обводкой, масштаб"""
+
+    # Толщина обводки баре и нот по настройке
+    BARRE_OUTLINE_WIDTHS = {
+        "none": 0,
+        "thin": 3,  # Увеличил для лучшей видимости
+        "medium": 5,
+        "thick": 8
+    }
+    NOTE_OUTLINE_WIDTHS = {
+        "none": 0,
+        "thin": 2,
+        "medium": 3,
+        "thick": 5
+    }
+
+    def __init__(self, config_manager, original_pixmap=None, use_sprites=True):
+        self.config_manager = config_manager
+        self.original_pixmap = original_pixmap  # Оригинальный шаблон изображения
+        # Ноты и символы ладов копируются из атласа вместо отрисовки каждого элемента
+        self.sprite_atlas = SpriteAtlas() if use_sprites else None
+        # Уменьшенные уровни шаблона и фоны областей RAM, строится при первой отрисовке
+        self.template_pyramid = None
+
+    def render_chord(self, chord_config, display_type="fingers", fret_type="roman",
+                     barre_outline="none", note_outline="none", scale_type="original", fit_size=None):
+        """
+        Отрисовка аккорда в новый QPixmap с выбранным масштабом.
+        fit_size - (ширина, высота) области для "Маленький 1", когда у аккорда нет обрезки
+        """
+        # Получаем область обрезки из RAM для этого конкретного аккорда
+        ram_key = chord_config.get('RAM')
+        crop_rect = self.config_manager.get_ram_crop_area(ram_key)
+
+        logger.debug("🎯 Оригинальное изображение: %sx%s", self.original_pixmap.width(), self.original_pixmap.height())
+        logger.debug("🎯 Область обрезки для RAM '%s': %s", ram_key, crop_rect)
+
+        # Получаем элементы для отображения
+        elements = self.config_manager.get_chord_elements(chord_config, display_type)
+
+        logger.debug("📊 Найдено элементов: %s", len(elements))
+        logger.debug("📈 Кэш аккордов: %s", self.config_manager.get_cache_stats())
+
+        # Преобразуем символы ладов в зависимости от выбранного типа
+        if fret_type == "numeric":
+            elements = self.convert_frets_to_numeric(elements)
+
+        # Применяем настройки обводки к элементам
+        elements = self.apply_outline_settings(elements, barre_outline, note_outline)
+
+        # ВСЕГДА используем обрезку по RAM, если она определена
+        if crop_rect:
+            crop_offset = clamp_crop_rect(crop_rect, self.original_pixmap.width(), self.original_pixmap.height())
+            crop_x, crop_y, crop_width, crop_height = crop_offset
+            fit_size = None  # "Маленький 1" для обрезки - не шире 400 пикселей
+            logger.debug("🎯 Финальная область обрезки: %s", crop_offset)
+        else:
+            # Если нет обрезки, рисуем на полном изображении
+            crop_x, crop_y = 0, 0
+            crop_width, crop_height = self.original_pixmap.width(), self.original_pixmap.height()
+            crop_offset = None
+            if scale_type == "small1" and not fit_size:
+                scale_type = "original"
+
+        target_width, target_height = get_target_size(crop_width, crop_height, scale_type, fit_size)
+        logger.debug("📏 Масштаб %s: %sx%s -> %sx%s", scale_type, crop_width, crop_height, target_width, target_height)
+
+        # СОЗДАЕМ НОВОЕ ИЗОБРАЖЕНИЕ СРАЗУ ИТОГОВОГО РАЗМЕРА
+        result_pixmap = QPixmap(target_width, target_height)
+        result_pixmap.fill(Qt.white)  # Белый фон
+
+        painter = QPainter(result_pixmap)
+
+        # Включаем сглаживание для всего изображения
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+
+        if (target_width, target_height) == (crop_width, crop_height):
+            # Копируем область из оригинального изображения
+            painter.drawPixmap(0, 0, self.original_pixmap, crop_x, crop_y, crop_width, crop_height)
+        else:
+            # Готовый фон нужного размера из пирамиды шаблона, элементы рисуем через масштаб painter:
+            # растеризуются только пиксели итогового изображения
+            tile = self.get_template_pyramid().get_tile((crop_x, crop_y, crop_width, crop_height),
+                                                        (target_width, target_height))
+            painter.drawImage(0, 0, tile)
+            painter.scale(target_width / crop_width, target_width / crop_width)
+
+        # Рисуем элементы на НОВОМ изображении с правильными координатами
+        self.draw_elements_with_outline(painter, elements, crop_offset)
+
+        painter.end()
+        return result_pixmap
+
+    def set_template(self, original_pixmap, template_pyramid=None):
+        """
+        Новый шаблон. template_pyramid - готовая пирамида этого шаблона
+        (например, построенная в потоке загрузки), иначе она строится при первой отрисовке
+        """
+        self.original_pixmap = original_pixmap
+        self.template_pyramid = template_pyramid
+
+    def get_template_pyramid(self):
+        """Пирамида текущего шаблона с фонами всех областей RAM"""
+        if self.template_pyramid is None:
+            self.template_pyramid = TemplatePyramid(self.original_pixmap.toImage()).build(
+                self.config_manager.get_ram_crop_areas())
+            logger.debug("🖼️ Пирамида шаблона: %s", self.template_pyramid.get_stats())
+        return self.template_pyramid
+
+    def get_scale_factors(self, scale_types):
+        """Масштабы painter, с которыми рисуются области RAM шаблона для данных типов масштаба"""
+        factors = set()
+        for crop_rect in self.config_manager.get_ram_crop_areas():
+            _, _, crop_width, crop_height = clamp_crop_rect(crop_rect, self.original_pixmap.width(),
+                                                            self.original_pixmap.height())
+            for scale_type in scale_types:
+                factors.add(get_target_size(crop_width, crop_height, scale_type)[0] / crop_width)
+        return sorted(factors)
+
+    def apply_outline_settings(self, elements, barre_outline="none", note_outline="none"):
+        """Применение настроек обводки к элементам (ChordElements) с улучшенной отрисовкой"""
+        barre_width = self.BARRE_OUTLINE_WIDTHS.get(barre_outline, 0)
+        note_width = self.NOTE_OUTLINE_WIDTHS.get(note_outline, 0)
+
+        modified_elements = []
+        for element in elements:
+            if element.type == 'barre' and barre_width > 0:
+                # Добавляем улучшенную обводку к барре (черный цвет)
+                modified_elements.append(element.overlay(outline_width=barre_width, outline_color=[0, 0, 0]))
+            elif element.type == 'note' and note_width > 0:
+                # Добавляем улучшенную обводку к нотам (черный цвет)
+                modified_elements.append(element.overlay(outline_width=note_width, outline_color=[0, 0, 0]))
+            else:
+                # Для других элементов оставляем как есть
+                modified_elements.append(element)
+
+        return elements.with_records(modified_elements)
+
+    def draw_elements_with_outline(self, painter, elements, crop_offset=None):
+        """
+        Однопроходная отрисовка элементов (ChordElements) по слоям, снизу вверх:
+        лады, декорации, обводка баре, заливка баре, обводка нот, заливка нот, текст нот.
+        Каждый примитив рисуется ровно один раз.
+        Лады и ноты (обводка, заливка и текст вместе) копируются из атласа спрайтов,
+        если он включен и трансформация painter - равномерный масштаб
+        """
+        try:
+            frets, barres, notes = self._split_elements(elements, crop_offset)
+            scale = None
+            if self.sprite_atlas is not None:
+                # Переполненный атлас очищается до того, как спрайты этой отрисовки получены
+                self.sprite_atlas.evict_if_full()
+                scale = sprite_scale(painter)
+
+            painter.save()
+            # Включаем сглаживание для плавных краев один раз для всех слоев
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+            # 1. Лады (самый нижний слой)
+            if scale is not None:
+                self._draw_sprites(painter, [(self.sprite_atlas.get_fret_sprite(fret.data, scale), x, y)
+                                             for fret, x, y, _ in frets])
+            else:
+                for fret, x, y, _ in frets:
+                    DrawingElements.draw_fret(painter, fret.data, x, y)
+
+            # 2. Декорации баре и нот (тень, свечение) - под основными фигурами
+            for barre, x, y, radius in barres:
+                self._draw_barre_decoration(painter, barre, x, y, radius)
+            for note, x, y, radius in notes:
+                self._draw_note_decoration(painter, note, x, y, radius)
+
+            # 3. Обводка баре
+            for barre, x, y, radius in barres:
+                if barre.outline_width > 0:
+                    self._draw_barre_outline(painter, barre, x, y, radius)
+
+            # 4. Заливка баре (поверх обводки баре)
+            for barre, x, y, radius in barres:
+                self._draw_barre_fill(painter, barre, x, y, radius)
+
+            if scale is not None:
+                # 5-7. Ноты целиком из атласа (поверх баре)
+                self._draw_sprites(painter, [(self.sprite_atlas.get_note_sprite(note.data, scale), x, y)
+                                             for note, x, y, _ in notes])
+            else:
+                # 5. Обводка нот (поверх баре)
+                for note, x, y, radius in notes:
+                    if note.outline_width > 0:
+                        self._draw_note_outline(painter, note, x, y, radius)
+
+                # 6. Заливка нот (поверх обводки нот)
+                for note, x, y, radius in notes:
+                    self._draw_note_fill(painter, note, x, y, radius)
+
+                # 7. Текст нот (самый верхний слой)
+                for note, x, y, radius in notes:
+                    self._draw_note_text(painter, note.data, x, y, radius)
+
+            painter.restore()
+
+        except Exception as e:
+            logger.error("Ошибка при отрисовке элементов с обводкой: %s", e)
+
+    def _draw_sprites(self, painter, sprites):
+        """Копирует спрайты (спрайт, x, y) в точки устройства, соответствующие центрам"""
+        points = [device_point(painter, x, y) for _, x, y in sprites]
+
+        painter.save()
+        painter.resetTransform()
+        for (sprite, _, _), (device_x, device_y) in zip(sprites, points):
+            self.sprite_atlas.draw_sprite(painter, sprite, device_x, device_y)
+        painter.restore()
+
+    def prebuild_sprites(self, note_outline="none", scales=(1.0,)):
+        """
+        Заранее растеризует в атлас все ноты и символы ладов шаблона
+        (лады - в римском и числовом виде), например перед пакетным рендером
+        """
+        if self.sprite_atlas is None:
+            return
+
+        records = self.config_manager.element_records
+        frets = ChordElements(records.get('frets', {}).values())
+        notes = ChordElements(record for section in ('notes', 'open_notes')
+                               for record in records.get(section, {}).values())
+        notes = self.apply_outline_settings(notes, note_outline=note_outline)
+
+        elements = list(frets) + list(self.convert_frets_to_numeric(frets)) + list(notes)
+        self.sprite_atlas.prebuild([(element.type, element.data) for element in elements], scales)
+        logger.debug("🧩 Атлас спрайтов: %s", self.sprite_atlas.get_stats())
+
+    def _split_elements(self, elements, crop_offset=None):
+        """
+        Разделяет элементы по типам и сдвигает координаты в систему холста.
+        Возвращает списки (запись, x, y, radius) для ладов, баре и нот; x, y - центр элемента
+        """
+        if crop_offset:
+            elements = elements.translated(-crop_offset[0], -crop_offset[1])
+
+        frets = []
+        barres = []
+        notes = []
+        for record, x, y, radius in elements.positions():
+            item = (record, int(round(x)), int(round(y)), radius)
+            if record.type == 'fret':
+                frets.append(item)
+            elif record.type == 'barre':
+                barres.append(item)
+            elif record.type == 'note':
+                notes.append(item)
+
+        return frets, barres, notes
+
+    def _draw_barre_decoration(self, painter, barre, x, y, radius):
+        """Отрисовка декорации баре"""
+        try:
+            decoration = barre.data.get('decoration', 'none')
+            if decoration == 'none':
+                return
+
+            # Декорации рисуются от левого верхнего угла
+            DrawingElements.draw_barre_decoration(painter, x - barre.width // 2, y - barre.height // 2,
+                                                  barre.width, barre.height, radius,
+                                                  barre.data.get('style', 'wood'), decoration)
+        except Exception as e:
+            logger.error("Ошибка при отрисовке декорации баре: %s", e)
+
+    def _draw_note_decoration(self, painter, note, x, y, radius):
+        """Отрисовка декорации ноты"""
+        try:
+            decoration = note.data.get('decoration', 'none')
+            if decoration == 'none':
+                return
+
+            DrawingElements.draw_note_decoration(painter, x, y, radius, decoration)
+        except Exception as e:
+            logger.error("Ошибка при отрисовке декорации ноты: %s", e)
+
+    def _draw_barre_fill(self, painter, barre, x, y, radius):
+        """Отрисовка только заливки баре (без обводки)"""
+        try:
+            width = barre.width
+            height = barre.height
+
+            # Получаем кисть для заливки
+            brush = self.config_manager.get_brush_from_style(barre.data.get('style', 'wood'), x, y, 0, width, height)
+
+            # Рисуем только заливку (без обводки)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(brush)
+
+            # Рисуем скругленный прямоугольник для заливки
+            fill_rect = QRectF(x - width / 2, y - height / 2, width, height)
+            painter.drawRoundedRect(fill_rect, radius, radius)
+
+        except Exception as e:
+            logger.error("Ошибка при отрисовке заливки баре: %s", e)
+
+    def _draw_note_fill(self, painter, note, x, y, radius):
+        """Отрисовка только заливки ноты (без обводки и текста)"""
+        try:
+            # Получаем кисть для заливки
+            brush = DrawingElements.get_brush_from_style(note.data.get('style', 'red_3d'), x, y, radius)
+
+            # Рисуем только заливку (без обводки)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(brush)
+            painter.drawEllipse(int(x - radius), int(y - radius),
+                                int(radius * 2), int(radius * 2))
+
+        except Exception as e:
+            logger.error("Ошибка при отрисовке заливки ноты: %s", e)
+
+    def _draw_note_text(self, painter, data, x, y, radius):
+        """Отрисовка текста ноты"""
+        try:
+            # Определяем отображаемый текст
+            symbol = DrawingElements.get_note_symbol(data)
+            if not symbol:
+                return
+
+            # Настраиваем цвет текста
+            text_color = DrawingElements.get_color_from_data(data.get('text_color', [255, 255, 255]))
+            painter.setPen(QPen(text_color))
+
+            # Шрифт и центрирование берем из кэша раскладок текста
+            text_layout_cache.note_layout(symbol, radius, data.get('font_style', 'normal')).draw(painter, x, y)
+
+        except Exception as e:
+            logger.error("Ошибка при отрисовке текста ноты: %s", e)
+
+    def _draw_barre_outline(self, painter, barre, x, y, radius):
+        """Отрисовка ТОЛЬКО обводки баре"""
+        try:
+            width = barre.width
+            height = barre.height
+
+            # Рисуем ТОЛЬКО обводку (внешний прямоугольник)
+            outline_pen = QPen(QColor(0, 0, 0))  # Черный цвет обводки
+            outline_pen.setWidth(barre.outline_width)
+            outline_pen.setCapStyle(Qt.RoundCap)
+            outline_pen.setJoinStyle(Qt.RoundJoin)
+            painter.setPen(outline_pen)
+            painter.setBrush(Qt.NoBrush)  # Важно: без заливки!
+
+            # Рисуем скругленный прямоугольник для обводки
+            outline_rect = QRectF(x - width / 2, y - height / 2, width, height)
+            painter.drawRoundedRect(outline_rect, radius, radius)
+
+        except Exception as e:
+            logger.error("Ошибка при отрисовке обводки баре: %s", e)
+
+    def _draw_note_outline(self, painter, note, x, y, radius):
+        """Отрисовка ТОЛЬКО обводки ноты"""
+        try:
+            # Рисуем ТОЛЬКО обводку (внешний круг)
+            outline_pen = QPen(QColor(0, 0, 0))  # Черный цвет обводки
+            outline_pen.setWidth(note.outline_width)
+            outline_pen.setCapStyle(Qt.RoundCap)
+            outline_pen.setJoinStyle(Qt.RoundJoin)
+            painter.setPen(outline_pen)
+            painter.setBrush(Qt.NoBrush)  # Важно: без заливки!
+
+            painter.drawEllipse(int(x - radius), int(y - radius),
+                                int(radius * 2), int(radius * 2))
+
+        except Exception as e:
+            logger.error("Ошибка при отрисовке обводки ноты: %s", e)
+
+    def convert_frets_to_numeric(self, elements):
+        """Преобразование римских цифр ладов (ChordElements) в обычные цифры"""
+        roman_to_numeric = {
+            'I': '1', 'II': '2', 'III': '3', 'IV': '4', 'V': '5',
+            'VI': '6', 'VII': '7', 'VIII': '8', 'IX': '9', 'X': '10',
+            'XI': '11', 'XII': '12', 'XIII': '13', 'XIV': '14', 'XV': '15',
+            'XVI': '16'
+        }
+
+        converted_elements = []
+        for element in elements:
+            if element.type == 'fret':
+                # Преобразуем символ лада
+                original_symbol = element.data.get('symbol', 'I')
+                if original_symbol in roman_to_numeric:
+                    element = element.overlay(symbol=roman_to_numeric[original_symbol])
+                    logger.debug("🎯 Преобразован лад: %s -> %s", original_symbol, element.data['symbol'])
+                converted_elements.append(element)
+            else:
+                # Для других типов элементов оставляем как есть
+                converted_elements.append(element)
+
+        return elements.with_records(converted_elements)
@@ -1,6 +1,86 @@
+import logging
 import os
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtCore import QUrl
+from PyQt5.QtCore import QUrl, QFileSystemWatcher
+
+from audio_engine import AudioEngine
+
+logger = logging.getLogger(__name__)
+
+SOUND_EXTENSION = ".mp3"
+
+
+class SoundIndex:
+    """
+    Индекс звуковых файлов source/sounds: аккорд -> вариант -> путь.
+    Вариант None - файл с базовым именем ("A.mp3"), для вариантов
+    имя "A_1.mp3" имеет приоритет над "A1.mp3"
+    """
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+        self.sounds = {}
+        self.directories = []  # просканированные папки (для наблюдения за изменениями)
+
+    def scan(self):
+        """Полное сканирование папки звуков: один listdir на папку аккорда вместо exists на каждый запрос"""
+        sounds = {}
+        directories = []
+
+        try:
+            chord_entries = list(os.scandir(self.base_path))
+        except OSError:
+            self.sounds = {}
+            self.directories = []
+            return
+
+        directories.append(self.base_path)
+        for chord_entry in chord_entries:
+            if not chord_entry.is_dir():
+                continue
+
+            directories.append(chord_entry.path)
+            try:
+                variants = self._scan_chord_dir(chord_entry.name, chord_entry.path)
+            except OSError as e:
+                logger.warning("⚠️ Не удалось прочитать папку звуков %s: %s", chord_entry.path, e)
+                continue
+            if variants:
+                sounds[chord_entry.name] = variants
+
+        self.sounds = sounds
+        self.directories = directories
+        logger.debug("🔊 Индекс звуков: %s аккордов, %s папок", len(sounds), len(directories))
+
+    @staticmethod
+    def _scan_chord_dir(chord_name, path):
+        """Варианты звуков одной папки аккорда"""
+        variants = {}
+        priorities = {}
+        for file_entry in os.scandir(path):
+            stem, extension = os.path.splitext(file_entry.name)
+            if extension != SOUND_EXTENSION or not file_entry.is_file():
+                continue
+
+            if stem == chord_name:
+                variant, priority = None, 0
+            elif stem.startswith(chord_name + "_"):
+                variant, priority = stem[len(chord_name) + 1:], 0
+            elif stem.startswith(chord_name):
+                variant, priority = stem[len(chord_name):], 1
+            else:
+                continue
+
+            if variant == "":
+                continue
+            if variant not in variants or priority < priorities[variant]:
+                variants[variant] = file_entry.path
+                priorities[variant] = priority
+        return variants
+
+    def find(self, chord_name, variant=None):
+        """Путь к звуку аккорда или None"""
+        return self.sounds.get(chord_name, {}).get(variant or None)
 
 
 class ChordSoundPlayer:
@@ -8,48 +88,85 @@ class ChordSoundPlayer:
         self.sounds_base_path = os.path.join("source", "sounds")
         self.media_player = QMediaPlayer()
 
+        # Индекс строится при первом воспроизведении и перестраивается после изменений в папке звуков
+        self.sound_index = SoundIndex(self.sounds_base_path)
+        self._index_stale = True
+        self.watcher = QFileSystemWatcher()
+        self.watcher.directoryChanged.connect(self._on_sounds_changed)
+
+        # Звуки активной группы декодируются заранее и играют из PCM без задержки на загрузку
+        self.audio_engine = AudioEngine()
+        self.audio_engine.decode_failed.connect(self._play_with_media_player)
+
+    def _on_sounds_changed(self, path):
+        """Папка звуков изменилась - индекс перестроится при следующем поиске"""
+        logger.debug("🔄 Изменения в папке звуков: %s", path)
+        self._index_stale = True
+        # Файлы могли быть заменены - декодированные звуки больше не актуальны
+        self.audio_engine.clear()
+
+    def refresh_index(self):
+        """Пересканирует папку звуков и обновляет наблюдаемые папки"""
+        self.sound_index.scan()
+        self._index_stale = False
+
+        watched = self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+
+        # Пока папки звуков нет, следим за родительской, чтобы заметить ее появление
+        directories = self.sound_index.directories or [os.path.dirname(self.sounds_base_path) or "."]
+        directories = [path for path in directories if os.path.isdir(path)]
+        if directories:
+            self.watcher.addPaths(directories)
+
+    def find_sound(self, chord_name, variant=None):
+        """Путь к звуковому файлу аккорда из индекса или None"""
+        if self._index_stale:
+            self.refresh_index()
+        return self.sound_index.find(chord_name, variant)
+
     def play_chord_sound(self, chord_name, variant=None):
         """Воспроизведение звука аккорда"""
         try:
-            # Формируем путь к файлу
-            if variant:
-                # Если указан вариант, ищем файл вида "A_1.mp3"
-                filename = f"{chord_name}_{variant}.mp3"
-                file_path = os.path.join(self.sounds_base_path, chord_name, filename)
-
-                # Если файл не найден, пробуем альтернативные варианты именования
-                if not os.path.exists(file_path):
-                    # Пробуем найти файл с другим форматом имени
-                    alt_filename = f"{chord_name}{variant}.mp3"
-                    alt_path = os.path.join(self.sounds_base_path, chord_name, alt_filename)
-                    if os.path.exists(alt_path):
-                        file_path = alt_path
-            else:
-                # Если вариант не указан, ищем файл с базовым именем
-                filename = f"{chord_name}.mp3"
-                file_path = os.path.join(self.sounds_base_path, chord_name, filename)
-
-            print(f"🔊 Поиск звукового файла: {file_path}")
-
-            if os.path.exists(file_path):
-                # Создаем URL для медиаплеера
-                media_url = QUrl.fromLocalFile(file_path)
-                media_content = QMediaContent(media_url)
-
-                # Останавливаем предыдущее воспроизведение и запускаем новое
-                self.media_player.stop()
-                self.media_player.setMedia(media_content)
-                self.media_player.play()
-                print(f"🎵 Воспроизводится: {os.path.basename(file_path)}")
+            # Вариант ищется как "A_1.mp3" или "A1.mp3", без варианта - "A.mp3"
+            file_path = self.find_sound(chord_name, variant)
+            logger.debug("🔊 Звуковой файл для %s (вариант %s): %s", chord_name, variant, file_path)
+
+            if file_path:
+                if not self.audio_engine.play(file_path, file_path):
+                    self._play_with_media_player(file_path)
+                logger.debug("🎵 Воспроизводится: %s", os.path.basename(file_path))
                 return True
             else:
-                print(f"❌ Звуковой файл не найден: {file_path}")
+                logger.warning("❌ Звуковой файл не найден: %s (вариант %s)", chord_name, variant)
                 return False
 
         except Exception as e:
-            print(f"❌ Ошибка воспроизведения звука: {e}")
+            logger.error("❌ Ошибка воспроизведения звука: %s", e)
             return False
 
+    def _play_with_media_player(self, file_path):
+        """Воспроизведение через QMediaPlayer, если звук не удалось декодировать заранее"""
+        # Останавливаем предыдущее воспроизведение и запускаем новое
+        self.media_player.stop()
+        self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(file_path)))
+        self.media_player.play()
+
+    def preload_chords(self, chords):
+        """
+        Декодирует заранее звуки аккордов [(аккорд, вариант)].
+        Если звука варианта нет, берется базовый - как при воспроизведении
+        """
+        paths = []
+        for chord_name, variant in chords:
+            file_path = self.find_sound(chord_name, variant) or self.find_sound(chord_name)
+            if file_path:
+                paths.append((file_path, file_path))
+        self.audio_engine.preload(paths)
+        logger.debug("🎼 Предзагрузка звуков: %s из %s аккордов", len(paths), len(chords))
+
     def stop_playback(self):
         """Остановка воспроизведения"""
-        self.media_player.stop()
\ No newline at end of file
+        self.audio_engine.stop()
+        self.media_player.stop()
@@ -0,0 +1,162 @@
+"""
+Бинарный пакет ресурсов аккордов (chords_data.pack)
+
+Формат файла:
+    заголовок    - сигнатура CHRDPACK, версия, количество блоков,
+                   смещения таблицы блоков и JSON индекса
+    блоки        - сырые байты шаблона и звуков, выровненные по 8 байт
+    таблица      - для каждого блока пара (смещение, размер)
+    JSON индекс  - метаданные, конфигурация и аккорды со ссылками на блоки
+
+Чтение идет через mmap: блоки отдаются как memoryview без копирования
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+PACK_MAGIC = b'CHRDPACK'
+PACK_VERSION = 1
+
+# сигнатура, версия, количество блоков, смещение таблицы, смещение индекса, размер индекса
+_HEADER = struct.Struct('<8sIIQQQ')
+_TABLE_ENTRY = struct.Struct('<QQ')
+_ALIGNMENT = 8
+
+
+class AssetPackError(Exception):
+    """Ошибка чтения пакета ресурсов"""
+
+
+class AssetPackWriter:
+    """
+    Записывает пакет ресурсов: блоки добавляются через add_blob,
+    индекс и таблица блоков дописываются в finish.
+    Запись идет во временный файл, который заменяет пакет только в finish:
+    работающее приложение держит старый пакет через mmap, и обрезать его нельзя
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temp_path = f"{path}.tmp{os.getpid()}"
+        self._entries: List[Tuple[int, int]] = []
+        self._file = open(self.temp_path, 'wb')
+        # Заголовок перезаписывается в finish, когда известны смещения
+        self._file.write(b'\0' * _HEADER.size)
+
+    def add_blob(self, data) -> int:
+        """Добавляет блок данных, возвращает его номер для ссылки из индекса"""
+        self._pad_to_alignment()
+        offset = self._file.tell()
+        self._file.write(data)
+        self._entries.append((offset, len(data)))
+        return len(self._entries) - 1
+
+    def finish(self, index: Dict[str, Any]):
+        """Дописывает таблицу блоков и JSON индекс, заполняет заголовок и заменяет пакет"""
+        self._pad_to_alignment()
+        table_offset = self._file.tell()
+        for offset, size in self._entries:
+            self._file.write(_TABLE_ENTRY.pack(offset, size))
+
+        index_data = json.dumps(index, ensure_ascii=False).encode('utf-8')
+        index_offset = self._file.tell()
+        self._file.write(index_data)
+
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(self._entries),
+                                      table_offset, index_offset, len(index_data)))
+        self._file.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        """Закрывает и удаляет недописанный пакет, прежний пакет остается на месте"""
+        self._file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def _pad_to_alignment(self):
+        padding = -self._file.tell() % _ALIGNMENT
+        if padding:
+            self._file.write(b'\0' * padding)
+
+
+class AssetPackReader:
+    """
+    Открывает пакет ресурсов через mmap.
+    Память под блоки не выделяется: get_blob возвращает memoryview на отображение файла
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise AssetPackError(f"Пустой файл пакета: {path}")
+
+        self._view = memoryview(self._mmap)
+        try:
+            self._read_header()
+        except AssetPackError:
+            self.close()
+            raise
+
+    def _read_header(self):
+        if len(self._mmap) < _HEADER.size:
+            raise AssetPackError(f"Поврежденный пакет: {self.path}")
+
+        magic, version, blob_count, table_offset, index_offset, index_size = \
+            _HEADER.unpack_from(self._mmap, 0)
+
+        if magic != PACK_MAGIC:
+            raise AssetPackError(f"Неизвестный формат файла: {self.path}")
+        if version != PACK_VERSION:
+            raise AssetPackError(f"Неподдерживаемая версия пакета {version}: {self.path}")
+        if index_offset + index_size > len(self._mmap) or \
+                table_offset + blob_count * _TABLE_ENTRY.size > len(self._mmap):
+            raise AssetPackError(f"Пакет обрезан: {self.path}")
+
+        self.blob_count = blob_count
+        self._table_offset = table_offset
+        try:
+            self.index = json.loads(self._mmap[index_offset:index_offset + index_size].decode('utf-8'))
+        except ValueError as e:
+            raise AssetPackError(f"Поврежденный индекс пакета {self.path}: {e}")
+
+    def get_blob(self, blob_id: Optional[int]) -> Optional[memoryview]:
+        """Возвращает блок по номеру как memoryview (без копирования)"""
+        if blob_id is None or not 0 <= blob_id < self.blob_count:
+            return None
+
+        offset, size = _TABLE_ENTRY.unpack_from(self._mmap, self._table_offset + blob_id * _TABLE_ENTRY.size)
+        return self._view[offset:offset + size]
+
+    def get_blob_size(self, blob_id: Optional[int]) -> int:
+        """Размер блока в байтах"""
+        if blob_id is None or not 0 <= blob_id < self.blob_count:
+            return 0
+        return _TABLE_ENTRY.unpack_from(self._mmap, self._table_offset + blob_id * _TABLE_ENTRY.size)[1]
+
+    def prefetch_blob(self, blob_id: Optional[int]) -> bool:
+        """Просит систему заранее подгрузить страницы блока (где доступен madvise)"""
+        if blob_id is None or not 0 <= blob_id < self.blob_count or not hasattr(self._mmap, 'madvise'):
+            return False
+
+        offset, size = _TABLE_ENTRY.unpack_from(self._mmap, self._table_offset + blob_id * _TABLE_ENTRY.size)
+        # madvise требует начало, выровненное по странице
+        start = offset - offset % mmap.PAGESIZE
+        try:
+            self._mmap.madvise(mmap.MADV_WILLNEED, start, offset + size - start)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def close(self):
+        """Закрывает отображение (выданные memoryview должны быть освобождены)"""
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
@@ -1,42 +1,98 @@
 """
-Загрузчик данных из chords_data.py для основного приложения
+Загрузчик данных аккордов для основного приложения.
+Основной источник - бинарный пакет chords_data.pack (читается через mmap),
+запасной - старый сгенерированный модуль chords_data.py
 """
 
 import base64
-import json
+import importlib.util
+import os
 from typing import Dict, List, Optional, Tuple
 
-try:
-    from chords_data import CHORDS_DATA, get_template_image, get_chord_config, get_all_chords, get_chord_sound
-    HAS_CHORDS_DATA = True
-except ImportError:
-    HAS_CHORDS_DATA = False
-    print("⚠️ chords_data.py не найден, запустите конвертер сначала")
+from chords_asset_pack import AssetPackError, AssetPackReader
+from size_bounded_cache import SizeBoundedLRUCache
+
+PACK_FILE_NAME = "chords_data.pack"
+
+# Лимит памяти кэша декодированных звуков
+SOUND_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def find_pack_file() -> Optional[str]:
+    """Ищет пакет ресурсов в текущей папке и рядом с загрузчиком"""
+    possible_paths = [
+        PACK_FILE_NAME,
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), PACK_FILE_NAME),
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+HAS_ASSET_PACK = find_pack_file() is not None
+# Старый модуль не импортируем: его разбор стоит мегабайты base64 в памяти
+HAS_LEGACY_DATA = importlib.util.find_spec('chords_data') is not None
+HAS_CHORDS_DATA = HAS_ASSET_PACK or HAS_LEGACY_DATA
+
+if not HAS_CHORDS_DATA:
+    print(f"⚠️ {PACK_FILE_NAME} не найден, запустите конвертер сначала")
 
 class ChordsDataLoader:
     """
-    Загружает все данные из автономного файла chords_data.py
+    Загружает все данные из пакета ресурсов chords_data.pack.
+    Шаблон и звуки отдаются как memoryview на отображенный файл без копирования
     """
 
-    def __init__(self):
-        if not HAS_CHORDS_DATA:
-            raise ImportError("Файл chords_data.py не найден")
-
-        self.metadata = CHORDS_DATA.get('metadata', {})
+    def __init__(self, pack_path: Optional[str] = None):
+        pack_path = pack_path or find_pack_file()
+        self.pack = None
+        self.legacy_data = None
+
+        if pack_path:
+            try:
+                self.pack = AssetPackReader(pack_path)
+            except (OSError, AssetPackError) as e:
+                raise ImportError(f"Не удалось открыть {pack_path}: {e}")
+            data = self.pack.index
+            self.source_name = pack_path
+        elif HAS_LEGACY_DATA:
+            from chords_data import CHORDS_DATA
+            self.legacy_data = CHORDS_DATA
+            data = CHORDS_DATA
+            self.source_name = "chords_data.py"
+        else:
+            raise ImportError(f"Файл {PACK_FILE_NAME} не найден")
+
+        self.metadata = data.get('metadata', {})
         self.template_image = None
-        self.original_config = CHORDS_DATA.get('original_json_config', {})
-        self.chords_data = CHORDS_DATA.get('chords', {})
+        self.original_config = data.get('original_json_config', {})
+        self.chords_data = data.get('chords', {})
 
-        # Загружаем шаблон изображения
-        self._load_template_image()
+        # Декодированные звуки старого формата: (аккорд, вариант) -> bytes
+        self.sound_cache = SizeBoundedLRUCache(SOUND_CACHE_MAX_BYTES)
 
-    def _load_template_image(self):
-        """Загружает шаблон изображения из base64"""
-        template_b64 = CHORDS_DATA.get('template_image')
-        if template_b64:
-            self.template_image = base64.b64decode(template_b64)
+        # Загружаем шаблон изображения
+        self._load_template_image(data)
+
+    def _load_template_image(self, data: Dict):
+        """Получает шаблон изображения из пакета (или из base64 старого модуля)"""
+        if self.pack:
+            self.template_image = self.pack.get_blob(data.get('template_image'))
+        else:
+            template_b64 = data.get('template_image')
+            if template_b64:
+                self.template_image = base64.b64decode(template_b64)
+
+    def _get_variant_sound(self, variant: Dict):
+        """Звуковые данные варианта: срез пакета или декодированный base64"""
+        if self.pack:
+            return self.pack.get_blob(variant.get('sound_blob'))
+        if variant.get('sound_data'):
+            return base64.b64decode(variant['sound_data'])
+        return None
 
-    def get_template_image_data(self) -> Optional[bytes]:
+    def get_template_image_data(self) -> Optional[memoryview]:
         """Возвращает данные шаблонного изображения"""
         return self.template_image
 
@@ -53,14 +109,43 @@ class ChordsDataLoader:
         chord_data = self.get_chord_data(chord_name)
         return chord_data.get('variants', []) if chord_data else []
 
-    def get_chord_sound_data(self, chord_name: str, variant: int = 1) -> Optional[bytes]:
-        """Возвращает звуковые данные аккорда"""
+    def has_chord_sound(self, chord_name: str) -> bool:
+        """Есть ли у аккорда хотя бы один вариант со звуком"""
+        for var in self.get_chord_variants(chord_name):
+            if var.get('sound_blob') is not None or var.get('sound_data'):
+                return True
+        return False
+
+    def get_chord_sound_data(self, chord_name: str, variant: int = 1) -> Optional[memoryview]:
+        """Возвращает звуковые данные аккорда (декодированные звуки берутся из кэша)"""
+        cache_key = (chord_name, variant)
+        sound_data = self.sound_cache.get(cache_key)
+        if sound_data is not None:
+            return sound_data
+
         variants = self.get_chord_variants(chord_name)
         for var in variants:
-            if var.get('position') == variant and var.get('sound_data'):
-                return base64.b64decode(var['sound_data'])
+            if var.get('position') == variant:
+                sound_data = self._get_variant_sound(var)
+                if sound_data:
+                    # Срезы пакета ничего не стоят, кэшируются только декодированные данные
+                    if not self.pack:
+                        self.sound_cache.put(cache_key, sound_data)
+                    return sound_data
         return None
 
+    def prefetch_chords(self, chord_names: List[str]):
+        """
+        Подготавливает звуки всех вариантов аккордов заранее:
+        для пакета - подгрузка страниц с диска, для старого формата - декодирование в кэш
+        """
+        for chord_name in chord_names:
+            for var in self.get_chord_variants(chord_name):
+                if self.pack:
+                    self.pack.prefetch_blob(var.get('sound_blob'))
+                elif var.get('sound_data') and (chord_name, var.get('position')) not in self.sound_cache:
+                    self.sound_cache.put((chord_name, var.get('position')), self._get_variant_sound(var))
+
     def get_chord_json_parameters(self, chord_name: str, variant: int = 1) -> Optional[Dict]:
         """Возвращает JSON параметры для отрисовки аккорда"""
         variants = self.get_chord_variants(chord_name)
@@ -79,7 +164,7 @@ class ChordsDataLoader:
 
     def print_stats(self):
         """Выводит статистику загруженных данных"""
-        print("📊 ДАННЫЕ ИЗ chords_data.py:")
+        print(f"📊 ДАННЫЕ ИЗ {self.source_name}:")
         print(f"🎸 Аккордов: {len(self.get_chord_names())}")
         print(f"🖼️  Шаблон: {'✅ загружен' if self.template_image else '❌ отсутствует'}")
         print(f"📋 Конфигурация: {'✅ загружена' if self.original_config else '❌ отсутствует'}")
@@ -103,4 +188,4 @@ if __name__ == "__main__":
             print(f"   Вариантов: {len(chord_data.get('variants', []))}")
 
     except ImportError as e:
-        print("❌ Сначала запустите конвертер для создания chords_data.py")
\ No newline at end of file
+        print(f"❌ Сначала запустите конвертер для создания {PACK_FILE_NAME}")
@@ -0,0 +1,63 @@
+"""
+Фоновая загрузка конфигурации аккордов, чтобы разбор Excel/JSON и декодирование
+шаблона не блокировали цикл событий Qt
+"""
+
+import os
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from chord_config_manager import ChordConfigManager
+from startup_profiler import startup_timeline
+from template_pyramid import TemplatePyramid
+
+
+class ConfigLoaderThread(QThread):
+    """
+    Загружает конфигурацию в новый ChordConfigManager в отдельном потоке.
+    Сигналы приходят по мере готовности частей, менеджер передается в GUI целиком в конце
+    """
+
+    stage_changed = pyqtSignal(str)           # название этапа загрузки
+    groups_loaded = pyqtSignal(list)          # группы аккордов сразу после листа CHORDS
+    image_loaded = pyqtSignal(QImage)         # декодированный шаблон
+    pyramid_built = pyqtSignal(object)        # TemplatePyramid шаблона с фонами областей RAM
+    loading_finished = pyqtSignal(object, bool)  # менеджер и успешность загрузки
+
+    STAGE_NAMES = {
+        'chords': "аккорды",
+        'ram': "области RAM",
+        'note': "таблица NOTE",
+        'templates': "JSON шаблоны",
+        'image': "изображение",
+        'pyramid': "пирамида шаблона"
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.config_manager = ChordConfigManager()
+
+    def run(self):
+        success = self.config_manager.load_config_data(progress_callback=self._on_progress)
+
+        if success and os.path.exists(self.config_manager.image_path):
+            # QPixmap нельзя создавать вне GUI потока, поэтому декодируем в QImage
+            with startup_timeline.phase("декодирование PNG"):
+                image = QImage(self.config_manager.image_path)
+            self._on_progress('image')
+            if not image.isNull():
+                self.image_loaded.emit(image)
+
+                # Уменьшенные уровни и фоны всех RAM готовятся здесь, а не при первой отрисовке
+                with startup_timeline.phase("пирамида шаблона"):
+                    pyramid = TemplatePyramid(image).build(self.config_manager.get_ram_crop_areas())
+                self._on_progress('pyramid')
+                self.pyramid_built.emit(pyramid)
+
+        self.loading_finished.emit(self.config_manager, success)
+
+    def _on_progress(self, stage):
+        self.stage_changed.emit(self.STAGE_NAMES.get(stage, stage))
+        if stage == 'chords':
+            self.groups_loaded.emit(self.config_manager.get_chord_groups())
@@ -0,0 +1,156 @@
+"""
+Скомпилированный снимок конфигурации аккордов (source/chord_config.snapshot)
+
+Снимок хранит листы CHORDS, RAM, NOTE и template.json в формате marshal,
+вместе с отпечатками исходных файлов (размер, mtime, sha256).
+Пока исходники не изменились, приложение загружает снимок без pandas и openpyxl.
+
+Компиляция вручную:
+    python config_snapshot.py
+"""
+
+import hashlib
+import marshal
+import os
+from typing import Dict, List, Optional
+
+SNAPSHOT_MAGIC = b'CHRDSNAP'
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = os.path.join("source", "chord_config.snapshot")
+
+
+class ConfigSnapshotError(Exception):
+    """Некорректные данные для снимка конфигурации"""
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> Dict:
+    """Отпечаток исходного файла"""
+    stat = os.stat(path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _file_sha256(path)
+    }
+
+
+def _source_matches(path: str, fingerprint: Dict) -> bool:
+    """Файл не изменился: совпали размер и mtime, либо (после копирования/checkout) содержимое"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+
+    if stat.st_size != fingerprint.get('size'):
+        return False
+    if stat.st_mtime_ns == fingerprint.get('mtime_ns'):
+        return True
+    return _file_sha256(path) == fingerprint.get('sha256')
+
+
+def _normalize_value(value):
+    """Приводит значения ячеек к встроенным типам (marshal не знает numpy и pandas)"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        # NaN пустых ячеек сохраняется как есть: менеджер проверяет пустоту через value != value
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _normalize_records(records: List[Dict], sheet_name: str) -> List[Dict]:
+    if not isinstance(records, list):
+        raise ConfigSnapshotError(f"Лист {sheet_name}: ожидается список строк")
+
+    normalized = []
+    for row in records:
+        if not isinstance(row, dict):
+            raise ConfigSnapshotError(f"Лист {sheet_name}: строка не является словарем")
+        normalized.append({str(key): _normalize_value(value) for key, value in row.items()})
+    return normalized
+
+
+def _validate_templates(templates: Dict):
+    if not isinstance(templates, dict):
+        raise ConfigSnapshotError("template.json: ожидается объект")
+    for section, items in templates.items():
+        if not isinstance(items, dict):
+            raise ConfigSnapshotError(f"template.json: раздел {section} не является объектом")
+
+
+def save_snapshot(snapshot_path: str, source_paths: List[str], chord_data: List[Dict],
+                  ram_data: List[Dict], note_data: List[Dict], templates: Dict):
+    """Проверяет данные и записывает снимок (через временный файл)"""
+    if not chord_data or not any('CHORD' in row for row in chord_data):
+        raise ConfigSnapshotError("Лист CHORDS пуст или без колонки CHORD")
+    _validate_templates(templates)
+
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'sources': {path: file_fingerprint(path) for path in source_paths},
+        'chord_data': _normalize_records(chord_data, 'CHORDS'),
+        'ram_data': _normalize_records(ram_data, 'RAM'),
+        'note_data': _normalize_records(note_data, 'NOTE'),
+        'templates': templates
+    }
+
+    try:
+        payload = marshal.dumps(snapshot)
+    except ValueError as e:
+        raise ConfigSnapshotError(f"Неподдерживаемый тип данных: {e}")
+
+    temp_path = f"{snapshot_path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(payload)
+    os.replace(temp_path, snapshot_path)
+
+
+def load_snapshot(snapshot_path: str, source_paths: List[str]) -> Optional[Dict]:
+    """Возвращает данные снимка, если он есть и исходные файлы не менялись, иначе None"""
+    try:
+        with open(snapshot_path, 'rb') as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                return None
+            snapshot = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        return None
+
+    sources = snapshot.get('sources', {})
+    if set(sources) != set(source_paths):
+        return None
+    for path in source_paths:
+        if not _source_matches(path, sources[path]):
+            return None
+
+    return snapshot
+
+
+def compile_config() -> bool:
+    """Разбирает Excel и JSON заново и записывает снимок"""
+    from chord_config_manager import ChordConfigManager
+
+    config_manager = ChordConfigManager()
+    if not config_manager.load_config_data(use_snapshot=False):
+        return False
+    return config_manager.save_snapshot()
+
+
+if __name__ == "__main__":
+    print("📦 Компиляция снимка конфигурации...")
+    if compile_config():
+        print(f"✅ Снимок сохранен: {DEFAULT_SNAPSHOT_PATH}")
+    else:
+        print("❌ Не удалось скомпилировать снимок конфигурации")
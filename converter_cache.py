@@ -0,0 +1,89 @@
+"""
+Кэш сборки конвертера: оптимизированные звуки по хэшу содержимого
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+# Увеличивается при изменении алгоритма оптимизации, чтобы сбросить старые записи
+CACHE_FORMAT_VERSION = 1
+
+
+class OptimizedSoundCache:
+    """
+    Хранит оптимизированные звуки на диске.
+    Ключ - sha256 от содержимого исходного файла и параметров оптимизации,
+    поэтому измененный файл или новые параметры дают новую запись
+    """
+
+    def __init__(self, cache_dir: str, params: Dict):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        params_data = json.dumps({'version': CACHE_FORMAT_VERSION, 'params': params}, sort_keys=True)
+        self.params_digest = hashlib.sha256(params_data.encode('utf-8')).hexdigest()
+
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, sound_path: Path) -> str:
+        """Ключ кэша для исходного звукового файла"""
+        digest = hashlib.sha256(self.params_digest.encode('ascii'))
+        with open(sound_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        # Подпапки по первым символам, чтобы не держать тысячи файлов в одной папке
+        return self.cache_dir / key[:2] / f"{key}.bin"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """
+        Путь к записи или None, если ее нет. Единственное место учета попаданий и промахов:
+        данные можно прочитать позже через read, не держа их в памяти
+        """
+        entry_path = self._entry_path(key)
+        if entry_path.exists():
+            self.hits += 1
+            return entry_path
+        self.misses += 1
+        return None
+
+    @staticmethod
+    def read(entry_path: Path) -> Optional[bytes]:
+        """Данные записи, найденной lookup, или None, если запись успела пропасть"""
+        try:
+            with open(entry_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Возвращает оптимизированные данные или None"""
+        entry_path = self.lookup(key)
+        return self.read(entry_path) if entry_path else None
+
+    def __contains__(self, key: str) -> bool:
+        """Есть ли запись (без чтения данных и без учета в статистике)"""
+        return self._entry_path(key).exists()
+
+    def put(self, key: str, data: bytes):
+        """Сохраняет оптимизированные данные (запись через временный файл)"""
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = entry_path.with_suffix(f".tmp{os.getpid()}")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, entry_path)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Статистика кэша"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses
+        }
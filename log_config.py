@@ -0,0 +1,55 @@
+"""
+Настройка логирования приложений аккордов
+
+Уровень по умолчанию - INFO: загрузка и ошибки видны, а подробности
+разрешения и отрисовки аккордов (DEBUG) не выводятся совсем.
+
+Переменные окружения:
+    CHORDS_LOG_LEVEL=DEBUG                                  - общий уровень
+    CHORDS_LOG_LEVELS=chord_config_manager=DEBUG,main=WARNING - уровни по модулям
+
+Имя логгера - имя модуля (logging.getLogger(__name__)). Запускаемые скриптом
+main.py и updated_main_app.py используют постоянные имена "main" и
+"updated_main_app", потому что их __name__ при запуске - "__main__"
+"""
+
+import logging
+import os
+
+DEFAULT_LOG_LEVEL = "INFO"
+LOG_FORMAT = "%(message)s"
+DEBUG_LOG_FORMAT = "%(asctime)s %(name)s %(levelname)s: %(message)s"
+
+
+def parse_module_levels(spec):
+    """Разбирает строку вида 'модуль=УРОВЕНЬ,модуль=УРОВЕНЬ' в словарь"""
+    levels = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        name, level = name.strip(), level.strip().upper()
+        if name and isinstance(logging.getLevelName(level), int):
+            levels[name] = level
+    return levels
+
+
+def setup_logging(level=None, module_levels=None):
+    """
+    Настраивает корневой логгер и уровни отдельных модулей.
+    Аргументы имеют приоритет над переменными окружения
+    """
+    level = (level or os.environ.get("CHORDS_LOG_LEVEL") or DEFAULT_LOG_LEVEL).upper()
+    if not isinstance(logging.getLevelName(level), int):
+        level = DEFAULT_LOG_LEVEL
+
+    levels = parse_module_levels(os.environ.get("CHORDS_LOG_LEVELS"))
+    levels.update(module_levels or {})
+
+    # Подробный формат нужен, только когда включены отладочные сообщения
+    verbose = level == "DEBUG" or "DEBUG" in levels.values()
+    logging.basicConfig(level=level, format=DEBUG_LOG_FORMAT if verbose else LOG_FORMAT)
+    logging.getLogger().setLevel(level)
+
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
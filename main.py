@@ -1,25 +1,39 @@
+from startup_profiler import startup_timeline
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QComboBox, QLabel, QScrollArea, QGridLayout,
                              QGroupBox, QMessageBox, QSizePolicy, QFileDialog, QMainWindow, QApplication, QToolBar,
                              QAction)
-from PyQt5.QtCore import Qt, QSize, QRectF
-from PyQt5.QtGui import QPixmap, QPainter, QPen, QBrush, QColor, QFont, QFontMetrics
+from PyQt5.QtCore import Qt, QSize, QTimer, QEvent
+from PyQt5.QtGui import QPixmap
+import logging
 import os
-import pandas as pd
 import json
-import openpyxl
-import subprocess
 import sys
 import re
+from datetime import datetime
 
 from chord_config_manager import ChordConfigManager
+from config_loader import ConfigLoaderThread
+from chord_renderer import ChordRenderer
 from chord_sound_player import ChordSoundPlayer
+from log_config import setup_logging
+from size_bounded_cache import SizeBoundedLRUCache, pixmap_size_in_bytes
+
+startup_timeline.mark("импорты")
+
+# Имя логгера не зависит от запуска скриптом (__name__ == "__main__"), чтобы работал CHORDS_LOG_LEVELS=main=...
+logger = logging.getLogger("main")
+
+# Лимит памяти кэша готовых изображений аккордов
+PIXMAP_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
 
 class ChordConfigTab(QWidget):
     def __init__(self):
         super().__init__()
         self.config_manager = ChordConfigManager()
+        self.renderer = ChordRenderer(self.config_manager)
         self.current_display_type = "fingers"  # fingers или notes
         self.current_scale_type = "small1"  # small1, small2, medium1, medium2 или original
         self.current_fret_type = "roman"  # roman или numeric
@@ -30,11 +44,25 @@ class ChordConfigTab(QWidget):
         self.current_chord = None
         self.original_pixmap = None  # Сохраняем оригинальное изображение
 
+        # Фоновая загрузка конфигурации
+        self.config_loader = None
+        self.loading_refresh = False
+        self.refresh_pending = False  # обновление запрошено во время загрузки - повторим после нее
+        self.colors_refresh_pending = False  # сообщить об обновлении цветов после перезагрузки
+        self.loaded_pixmap = None
+        self.loaded_pyramid = None
+
+        # LRU кэш готовых изображений аккордов
+        self.pixmap_cache = SizeBoundedLRUCache(PIXMAP_CACHE_MAX_BYTES, pixmap_size_in_bytes)
+
         # Добавляем плеер звуков
         self.sound_player = ChordSoundPlayer()
 
         self.initUI()
-        self.load_configuration()
+
+        # Окно показывается сразу, конфигурация загружается после его первой отрисовки
+        self.configuration_scheduled = False
+        self.image_label.installEventFilter(self)
 
     def initUI(self):
         layout = QVBoxLayout(self)
@@ -203,7 +231,7 @@ class ChordConfigTab(QWidget):
                 # Преобразуем вариант в строку и убираем лишние пробелы
                 variant_str = str(variant).strip() if variant else "1"
 
-                print(f"🎵 Попытка воспроизведения: {chord_name}, вариант {variant_str}")
+                logger.debug("🎵 Попытка воспроизведения: %s, вариант %s", chord_name, variant_str)
 
                 # Пробуем воспроизвести звук
                 success = self.sound_player.play_chord_sound(chord_name, variant_str)
@@ -213,10 +241,10 @@ class ChordConfigTab(QWidget):
                     success = self.sound_player.play_chord_sound(chord_name)
 
                 if not success:
-                    print(f"❌ Не удалось найти звуковой файл для аккорда {chord_name}")
+                    logger.warning("❌ Не удалось найти звуковой файл для аккорда %s", chord_name)
 
         except Exception as e:
-            print(f"❌ Ошибка при воспроизведении звука: {e}")
+            logger.error("❌ Ошибка при воспроизведении звука: %s", e)
 
         # Восстанавливаем кнопку после небольшой задержки
         from PyQt5.QtCore import QTimer
@@ -343,7 +371,7 @@ class ChordConfigTab(QWidget):
                 self.chord_info_label.setText("Информация об аккорде недоступна")
                 self.play_sound_btn.setEnabled(False)
         except Exception as e:
-            print(f"Ошибка при обновлении информации об аккорде: {e}")
+            logger.error("Ошибка при обновлении информации об аккорде: %s", e)
             self.chord_info_label.setText("Ошибка загрузки информации")
             self.play_sound_btn.setEnabled(False)
 
@@ -364,7 +392,7 @@ class ChordConfigTab(QWidget):
             # Если ничего не нашли, возвращаем "1" по умолчанию
             return "1"
         except Exception as e:
-            print(f"Ошибка в get_variant_number: {e}")
+            logger.error("Ошибка в get_variant_number: %s", e)
             return "1"
 
     def load_chord_buttons(self):
@@ -384,6 +412,13 @@ class ChordConfigTab(QWidget):
                 self.chords_layout.addWidget(label)
                 return
 
+            # Звуки группы декодируются заранее, пока пользователь выбирает аккорд
+            self.sound_player.preload_chords([
+                (chord_info.get('data', {}).get('CHORD', ''),
+                 str(chord_info.get('data', {}).get('VARIANT', '')).strip() or "1")
+                for chord_info in self.current_chords
+            ])
+
             # Создаем кнопки - все в одну строку
             for chord_info in self.current_chords:
                 try:
@@ -415,7 +450,7 @@ class ChordConfigTab(QWidget):
                     btn.clicked.connect(lambda checked, c=chord_info: self.on_chord_clicked(c))
                     self.chords_layout.addWidget(btn)
                 except Exception as e:
-                    print(f"Ошибка при создании кнопки аккорда: {e}")
+                    logger.error("Ошибка при создании кнопки аккорда: %s", e)
                     continue
 
             # АВТОМАТИЧЕСКИ ЗАГРУЖАЕМ ПЕРВЫЙ АККОРД ГРУППЫ
@@ -425,43 +460,28 @@ class ChordConfigTab(QWidget):
                 self.update_chord_info(self.current_chord)
 
         except Exception as e:
-            print(f"Ошибка при загрузке кнопок аккордов: {e}")
+            logger.error("Ошибка при загрузке кнопок аккордов: %s", e)
             label = QLabel("Ошибка загрузки аккордов")
             self.chords_layout.addWidget(label)
 
     def load_configuration(self):
-        """Загрузка конфигурации"""
-        try:
-            if self.config_manager.load_config_data():
-                # Загружаем оригинальное изображение
-                if os.path.exists(self.config_manager.image_path):
-                    self.original_pixmap = QPixmap(self.config_manager.image_path)
-                    if not self.original_pixmap.isNull():
-                        # Показываем оригинальное изображение при запуске
-                        self.display_original_image()
-                    else:
-                        self.image_label.setText("Ошибка загрузки изображения")
-                else:
-                    self.image_label.setText(f"Изображение не найдено: {self.config_manager.image_path}")
-
-                # Заполняем комбобокс групп
-                groups = self.config_manager.get_chord_groups()
-                self.group_combo.clear()
-                self.group_combo.addItems(groups)
-
-                if groups:
-                    self.current_group = groups[0]
-                    self.load_chord_buttons()
-                else:
-                    self.image_label.setText("Группы аккордов не найдены")
-            else:
-                self.image_label.setText("Ошибка загрузки конфигурации. Проверьте файлы в папке templates2")
-        except Exception as e:
-            error_msg = f"Ошибка при загрузке конфигурации: {str(e)}"
-            self.image_label.setText(error_msg)
-            print(f"❌ {error_msg}")
-            import traceback
-            traceback.print_exc()
+        """Загрузка конфигурации (в фоновом потоке)"""
+        self.start_configuration_loading(refresh=False)
+
+    def eventFilter(self, obj, event):
+        """Запуск загрузки после первой отрисовки окна и отметки для хронологии запуска"""
+        if obj is self.image_label and event.type() == QEvent.Paint:
+            if not self.configuration_scheduled:
+                self.configuration_scheduled = True
+                startup_timeline.mark("первая отрисовка окна")
+                QTimer.singleShot(0, self.load_configuration)
+                if not startup_timeline.enabled:
+                    self.image_label.removeEventFilter(self)
+            elif self.current_chord is not None and self.image_label.pixmap() is not None:
+                startup_timeline.mark("первый аккорд на экране")
+                startup_timeline.report()
+                self.image_label.removeEventFilter(self)
+        return super().eventFilter(obj, event)
 
     def display_original_image(self):
         """Отображение оригинального изображения при запуске с масштабированием"""
@@ -474,97 +494,189 @@ class ChordConfigTab(QWidget):
                 Qt.SmoothTransformation
             )
             self.image_label.setPixmap(scaled_pixmap)
-            print(
-                f"📏 Оригинальное изображение: {self.original_pixmap.width()}x{self.original_pixmap.height()} -> {scaled_pixmap.width()}x{scaled_pixmap.height()}")
+            logger.debug("📏 Оригинальное изображение: %sx%s -> %sx%s",
+                         self.original_pixmap.width(), self.original_pixmap.height(), scaled_pixmap.width(), scaled_pixmap.height())
 
     def refresh_configuration(self):
-        """Обновление конфигурации из Excel файла"""
-        try:
-            print("🔄 Обновление конфигурации...")
+        """Обновление конфигурации из Excel файла (в фоне, интерфейс не блокируется)"""
+        logger.info("🔄 Обновление конфигурации...")
+        self.start_configuration_loading(refresh=True)
+
+    def start_configuration_loading(self, refresh):
+        """Запуск потока загрузки конфигурации в новый менеджер"""
+        if self.config_loader is not None:
+            if refresh:
+                # Текущая загрузка могла прочитать файлы до изменений - перезагрузим после нее
+                self.refresh_pending = True
+                logger.info("⏳ Конфигурация уже загружается, обновление будет выполнено после загрузки")
+            else:
+                logger.info("⏳ Конфигурация уже загружается")
+            return
+
+        self.loading_refresh = refresh
+        self.loaded_pixmap = None
+        self.loaded_pyramid = None
+        self.config_loader = ConfigLoaderThread(self)
+        self.config_loader.stage_changed.connect(self.on_loading_stage)
+        self.config_loader.groups_loaded.connect(self.on_groups_loaded)
+        self.config_loader.image_loaded.connect(self.on_template_image_loaded)
+        self.config_loader.pyramid_built.connect(self.on_template_pyramid_built)
+        self.config_loader.loading_finished.connect(self.on_configuration_loaded)
+        self.config_loader.start()
+
+    def on_loading_stage(self, stage):
+        """Этап фоновой загрузки завершен"""
+        logger.debug("⏳ Загружено: %s", stage)
+        if self.current_chord is None and not self.loaded_pixmap:
+            self.image_label.setText(f"Загрузка: {stage}...")
+
+    def on_groups_loaded(self, groups):
+        """Группы доступны сразу после листа CHORDS - показываем их до окончания загрузки"""
+        if self.loading_refresh:
+            # При обновлении до конца загрузки работаем со старыми данными
+            return
+
+        self.group_combo.blockSignals(True)
+        self.group_combo.clear()
+        self.group_combo.addItems(groups)
+        self.group_combo.blockSignals(False)
+
+    def on_template_image_loaded(self, image):
+        """Шаблон декодирован в фоновом потоке"""
+        self.loaded_pixmap = QPixmap.fromImage(image)
+        if not self.loading_refresh:
+            # Показываем оригинальное изображение при запуске
+            self.original_pixmap = self.loaded_pixmap
+            self.renderer.set_template(self.original_pixmap)
+            self.display_original_image()
+
+    def on_template_pyramid_built(self, pyramid):
+        """Пирамида шаблона построена в фоновом потоке"""
+        self.loaded_pyramid = pyramid
+        if not self.loading_refresh:
+            self.renderer.set_template(self.original_pixmap, pyramid)
+
+    def on_configuration_loaded(self, config_manager, success):
+        """Загрузка завершена: применяем результат и выполняем отложенное обновление"""
+        self.config_loader.wait()
+        self.config_loader.deleteLater()
+        self.config_loader = None
+
+        success = self.apply_loaded_configuration(config_manager, success)
+
+        if self.refresh_pending:
+            # Результат уже показан, но мог устареть - загружаем еще раз
+            self.refresh_pending = False
+            logger.info("🔄 Повторная загрузка конфигурации")
+            self.start_configuration_loading(refresh=True)
+        elif self.colors_refresh_pending:
+            self.colors_refresh_pending = False
+            if success:
+                QMessageBox.information(self, "Успех", "Цвета успешно обновлены!")
+                logger.info("✅ Цвета обновлены успешно")
+
+    def apply_loaded_configuration(self, config_manager, success):
+        """
+        Подменяет менеджер и восстанавливает выбранный аккорд.
+        False - загрузка или применение не удались
+        """
+        if not success:
+            if self.loading_refresh:
+                QMessageBox.warning(self, "Ошибка", "Не удалось загрузить конфигурацию из Excel файла")
+                logger.error("❌ Ошибка обновления конфигурации")
+            else:
+                self.image_label.setText("Ошибка загрузки конфигурации. Проверьте файлы в папке templates2")
+            return False
 
+        try:
             # Сохраняем текущее состояние
             current_group = self.current_group
             current_chord = self.current_chord
 
-            # Перезагружаем данные
-            if self.config_manager.load_config_data():
-                # Перезагружаем изображение
-                if os.path.exists(self.config_manager.image_path):
-                    self.original_pixmap = QPixmap(self.config_manager.image_path)
-
-                # Обновляем комбобокс групп
-                groups = self.config_manager.get_chord_groups()
-                self.group_combo.clear()
-                self.group_combo.addItems(groups)
-
-                if groups:
-                    # Пытаемся восстановить предыдущее состояние
-                    if current_group in groups:
-                        self.current_group = current_group
-                        self.group_combo.setCurrentText(current_group)
-                    else:
-                        self.current_group = groups[0]
-                        self.group_combo.setCurrentText(groups[0])
-
-                    self.load_chord_buttons()
-
-                    # Пытаемся восстановить предыдущий аккорд
-                    if current_chord:
-                        chord_names = [chord['name'] for chord in self.current_chords]
-                        if current_chord['name'] in chord_names:
-                            # Находим и активируем кнопку нужного аккорда
-                            index = chord_names.index(current_chord['name'])
-                            self.current_chord = self.current_chords[index]
-                            self.display_chord(self.current_chord)
-                            self.update_chord_info(self.current_chord)
-                        else:
-                            # Показываем первый аккорд группы
-                            self.current_chord = self.current_chords[0]
-                            self.display_chord(self.current_chord)
-                            self.update_chord_info(self.current_chord)
+            # Новый менеджер приходит с пустым кэшем, готовые изображения устарели
+            self.config_manager = config_manager
+            self.renderer.config_manager = config_manager
+            self.pixmap_cache.clear()
+
+            if self.loaded_pixmap is not None:
+                self.original_pixmap = self.loaded_pixmap
+                self.renderer.set_template(self.original_pixmap, self.loaded_pyramid)
+            elif not os.path.exists(self.config_manager.image_path):
+                self.image_label.setText(f"Изображение не найдено: {self.config_manager.image_path}")
+            else:
+                self.image_label.setText("Ошибка загрузки изображения")
+
+            # Обновляем комбобокс групп
+            groups = self.config_manager.get_chord_groups()
+            self.group_combo.clear()
+            self.group_combo.addItems(groups)
+
+            if groups:
+                # Пытаемся восстановить предыдущее состояние
+                if current_group in groups:
+                    self.current_group = current_group
+                    self.group_combo.setCurrentText(current_group)
+                else:
+                    self.current_group = groups[0]
+                    self.group_combo.setCurrentText(groups[0])
+
+                self.load_chord_buttons()
+
+                # Пытаемся восстановить предыдущий аккорд
+                if current_chord:
+                    chord_names = [chord['name'] for chord in self.current_chords]
+                    if current_chord['name'] in chord_names:
+                        # Находим и активируем кнопку нужного аккорда
+                        index = chord_names.index(current_chord['name'])
+                        self.current_chord = self.current_chords[index]
+                        self.display_chord(self.current_chord)
+                        self.update_chord_info(self.current_chord)
                     else:
                         # Показываем первый аккорд группы
                         self.current_chord = self.current_chords[0]
                         self.display_chord(self.current_chord)
                         self.update_chord_info(self.current_chord)
-                else:
-                    self.image_label.setText("Группы аккордов не найдены после обновления")
-
-                print("✅ Конфигурация обновлена успешно")
+                elif self.current_chords:
+                    # Показываем первый аккорд группы
+                    self.current_chord = self.current_chords[0]
+                    self.display_chord(self.current_chord)
+                    self.update_chord_info(self.current_chord)
             else:
-                QMessageBox.warning(self, "Ошибка", "Не удалось загрузить конфигурацию из Excel файла")
-                print("❌ Ошибка обновления конфигурации")
+                self.image_label.setText("Группы аккордов не найдены")
+
+            logger.info("✅ Конфигурация загружена успешно")
+            return True
 
         except Exception as e:
-            error_msg = f"Ошибка при обновлении конфигурации: {str(e)}"
-            QMessageBox.critical(self, "Ошибка", error_msg)
-            print(f"❌ {error_msg}")
-            import traceback
-            traceback.print_exc()
+            error_msg = f"Ошибка при загрузке конфигурации: {str(e)}"
+            self.image_label.setText(error_msg)
+            logger.exception("❌ %s", error_msg)
+            return False
 
     def refresh_colors(self):
         """Обновление цветов из Excel файла"""
         try:
-            print("🎨 Обновление цветов...")
+            logger.info("🎨 Обновление цветов...")
 
             # Запускаем функцию обновления цветов напрямую
             success = self.update_note_styles_no_pandas()
 
             if success:
-                # Перезагружаем конфигурацию для применения новых цветов
+                # Стили в JSON изменились - разрешенные элементы и изображения устарели
+                self.config_manager.invalidate_cache()
+                self.pixmap_cache.clear()
+                # Перезагружаем конфигурацию для применения новых цветов,
+                # об успехе сообщит on_configuration_loaded
+                self.colors_refresh_pending = True
                 self.refresh_configuration()
-                QMessageBox.information(self, "Успех", "Цвета успешно обновлены!")
-                print("✅ Цвета обновлены успешно")
             else:
                 QMessageBox.warning(self, "Ошибка", "Не удалось обновить цвета")
-                print("❌ Ошибка обновления цветов")
+                logger.error("❌ Ошибка обновления цветов")
 
         except Exception as e:
             error_msg = f"Ошибка при обновлении цветов: {str(e)}"
             QMessageBox.critical(self, "Ошибка", error_msg)
-            print(f"❌ {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ %s", error_msg)
 
     def update_note_styles_no_pandas(self):
         """
@@ -574,7 +686,8 @@ class ChordConfigTab(QWidget):
         json_path = os.path.join("source", "template.json")
 
         try:
-            print("Чтение Excel файла...")
+            logger.info("Чтение Excel файла...")
+            import openpyxl
             workbook = openpyxl.load_workbook(excel_path)
             sheet = workbook['COLOR']
 
@@ -588,7 +701,7 @@ class ChordConfigTab(QWidget):
                 ton_col = headers.index('ton')
                 color_col = headers.index('color')
             except ValueError:
-                print("Ошибка: В таблице должны быть колонки 'ton' и 'color'")
+                logger.error("Ошибка: В таблице должны быть колонки 'ton' и 'color'")
                 return False
 
             # Читаем данные
@@ -599,17 +712,17 @@ class ChordConfigTab(QWidget):
 
                     if note_name.lower() == 'barre':
                         barre_style = style_name
-                        print(f"Загружен стиль для барре: {barre_style}")
+                        logger.info("Загружен стиль для барре: %s", barre_style)
                     else:
                         note_to_style[note_name] = style_name
-                        print(f"Загружено: {note_name} -> {style_name}")
+                        logger.debug("Загружено: %s -> %s", note_name, style_name)
 
-            print(f"Всего загружено {len(note_to_style)} соответствий для нот")
+            logger.info("Всего загружено %s соответствий для нот", len(note_to_style))
             if barre_style:
-                print(f"Стиль для барре: {barre_style}")
+                logger.info("Стиль для барре: %s", barre_style)
 
             # Чтение и обновление JSON
-            print("Чтение JSON файла...")
+            logger.info("Чтение JSON файла...")
             with open(json_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
@@ -625,10 +738,10 @@ class ChordConfigTab(QWidget):
                             old_style = note_data.get('style', 'не установлен')
                             note_data['style'] = note_to_style[note_name]
                             updated_notes_count += 1
-                            print(
-                                f"Обновлена нота: {note_key} - '{note_name}' - '{old_style}' -> '{note_to_style[note_name]}'")
+                            logger.debug("Обновлена нота: %s - '%s' - '%s' -> '%s'",
+                                         note_key, note_name, old_style, note_to_style[note_name])
             else:
-                print("Раздел 'notes' не найден в JSON")
+                logger.info("Раздел 'notes' не найден в JSON")
 
             # Обновляем барре (раздел 'barres')
             if 'barres' in data and barre_style:
@@ -636,22 +749,22 @@ class ChordConfigTab(QWidget):
                     old_style = barre_data.get('style', 'не установлен')
                     barre_data['style'] = barre_style
                     updated_barre_count += 1
-                    print(f"Обновлено барре: {barre_key} - '{old_style}' -> '{barre_style}'")
+                    logger.debug("Обновлено барре: %s - '%s' -> '%s'", barre_key, old_style, barre_style)
             else:
                 if 'barres' not in data:
-                    print("Раздел 'barres' не найден в JSON")
+                    logger.info("Раздел 'barres' не найден в JSON")
                 if not barre_style:
-                    print("Стиль для барре не задан в Excel")
+                    logger.info("Стиль для барре не задан в Excel")
 
             # Сохранение
             with open(json_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
 
-            print(f"Готово! Обновлено {updated_notes_count} нот и {updated_barre_count} барре")
+            logger.info("Готово! Обновлено %s нот и %s барре", updated_notes_count, updated_barre_count)
             return True
 
         except Exception as e:
-            print(f"Ошибка: {e}")
+            logger.error("Ошибка: %s", e)
             return False
 
     def save_chord_configuration(self):
@@ -672,7 +785,7 @@ class ChordConfigTab(QWidget):
             if not file_path:
                 return
 
-            print("💾 Сохранение конфигурации аккордов...")
+            logger.info("💾 Сохранение конфигурации аккордов...")
 
             # Создаем структуру для сохранения
             config_data = {
@@ -684,7 +797,7 @@ class ChordConfigTab(QWidget):
                         "note_outline": self.current_note_outline,
                         "scale_type": "original"  # Всегда оригинальный масштаб
                     },
-                    "created_date": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+                    "created_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 },
                 "chords": {}
             }
@@ -762,370 +875,37 @@ class ChordConfigTab(QWidget):
                 f"Аккордов: {total_saved}\n"
                 f"Файл: {os.path.basename(file_path)}"
             )
-            print(f"✅ Конфигурация сохранена: {total_saved} аккордов")
+            logger.info("✅ Конфигурация сохранена: %s аккордов", total_saved)
 
         except Exception as e:
             error_msg = f"Ошибка при сохранении конфигурации: {str(e)}"
             QMessageBox.critical(self, "Ошибка", error_msg)
-            print(f"❌ {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ %s", error_msg)
 
     def _serialize_elements(self, elements):
         """Сериализация элементов для сохранения в JSON"""
         serialized = []
         for element in elements:
-            element_data = {
-                "type": element['type'],
-                "data": element['data'].copy()
-            }
-            # Убираем временные поля
-            if '_key' in element_data['data']:
-                del element_data['data']['_key']
-            serialized.append(element_data)
+            serialized.append({
+                "type": element.type,
+                "data": dict(element.data)
+            })
         return serialized
 
-    def apply_outline_settings(self, elements):
-        """Применение настроек обводки к элементам с улучшенной отрисовкой"""
-        # Определяем толщину обводки для барре
-        barre_outline_widths = {
-            "none": 0,
-            "thin": 3,  # Увеличил для лучшей видимости
-            "medium": 5,
-            "thick": 8
-        }
-
-        # Определяем толщину обводки для нот
-        note_outline_widths = {
-            "none": 0,
-            "thin": 2,
-            "medium": 3,
-            "thick": 5
-        }
-
-        barre_width = barre_outline_widths.get(self.current_barre_outline, 0)
-        note_width = note_outline_widths.get(self.current_note_outline, 0)
-
-        modified_elements = []
-        for element in elements:
-            if element['type'] == 'barre' and barre_width > 0:
-                # Добавляем улучшенную обводку к барре
-                modified_element = element.copy()
-                modified_element['data'] = element['data'].copy()
-                modified_element['data']['outline_width'] = barre_width
-                modified_element['data']['outline_color'] = [0, 0, 0]  # Черный цвет
-                modified_elements.append(modified_element)
-            elif element['type'] == 'note' and note_width > 0:
-                # Добавляем улучшенную обводку к нотам
-                modified_element = element.copy()
-                modified_element['data'] = element['data'].copy()
-                modified_element['data']['outline_width'] = note_width
-                modified_element['data']['outline_color'] = [0, 0, 0]  # Черный цвет
-                modified_elements.append(modified_element)
-            else:
-                # Для других элементов оставляем как есть
-                modified_elements.append(element)
-
-        return modified_elements
-
-    def draw_elements_with_outline(self, painter, elements, crop_offset=None):
-        """Улучшенная отрисовка элементов с обводкой - ПРАВИЛЬНЫЙ ПОРЯДОК"""
-        try:
-            # Сначала рисуем все элементы через стандартный метод config_manager
-            # но с учетом смещения области обрезки
-            if crop_offset:
-                crop_x, crop_y, crop_width, crop_height = crop_offset
-                self.config_manager.draw_elements_on_canvas(painter, elements,
-                                                            (crop_x, crop_y, crop_width, crop_height))
-            else:
-                self.config_manager.draw_elements_on_canvas(painter, elements, None)
-
-            # РАЗДЕЛЯЕМ ЭЛЕМЕНТЫ ПО ТИПАМ ДЛЯ ПРАВИЛЬНОГО ПОРЯДКА ОТРИСОВКИ
-            barre_elements = []
-            note_elements = []
-
-            for element in elements:
-                if element['type'] == 'barre':
-                    barre_elements.append(element)
-                elif element['type'] == 'note':
-                    note_elements.append(element)
-
-            # ПРАВИЛЬНЫЙ ПОРЯДОК ОТРИСОВКИ:
-            # 1. Сначала рисуем обводку баре (самый нижний слой)
-            for element in barre_elements:
-                data = element['data']
-                if data.get('outline_width', 0) > 0:
-                    self._draw_barre_with_outline(painter, data, crop_offset)
-
-            # 2. Затем рисуем основное баре (поверх обводки баре)
-            for element in barre_elements:
-                data = element['data']
-                # Рисуем основное баре (без обводки)
-                self._draw_barre_fill_only(painter, data, crop_offset)
-
-            # 3. Затем рисуем ноты с обводкой (поверх баре)
-            for element in note_elements:
-                data = element['data']
-                if data.get('outline_width', 0) > 0:
-                    self._draw_note_with_outline(painter, data, crop_offset)
-
-            # 4. Наконец рисуем основные ноты (поверх обводки нот)
-            for element in note_elements:
-                data = element['data']
-                # Рисуем основную ноту (без обводки)
-                self._draw_note_fill_only(painter, data, crop_offset)
-
-        except Exception as e:
-            print(f"Ошибка при отрисовке элементов с обводкой: {e}")
-
-    def _draw_barre_fill_only(self, painter, data, crop_offset=None):
-        """Отрисовка только заливки баре (без обводки)"""
-        try:
-            x = data.get('x', 0)
-            y = data.get('y', 0)
-            width = data.get('width', 50)
-            height = data.get('height', 20)
-            radius = data.get('radius', 10)
-            style = data.get('style', 'wood')
-
-            # Корректируем координаты с учетом смещения области обрезки
-            if crop_offset:
-                crop_x, crop_y, _, _ = crop_offset
-                x = x - crop_x
-                y = y - crop_y
-
-            # Сохраняем настройки painter
-            painter.save()
-
-            # Включаем сглаживание для плавных краев
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
-
-            # Получаем кисть для заливки
-            brush = self.config_manager.get_brush_from_style(style, x, y, 0, width, height)
-
-            # Рисуем только заливку (без обводки)
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(brush)
-
-            # Рисуем скругленный прямоугольник для заливки
-            fill_rect = QRectF(x - width / 2, y - height / 2, width, height)
-            painter.drawRoundedRect(fill_rect, radius, radius)
-
-            # Восстанавливаем настройки painter
-            painter.restore()
-
-        except Exception as e:
-            print(f"Ошибка при отрисовке заливки баре: {e}")
-
-    def _draw_note_fill_only(self, painter, data, crop_offset=None):
-        """Отрисовка только заливки ноты (без обводки)"""
-        try:
-            x = data.get('x', 0)
-            y = data.get('y', 0)
-            radius = data.get('radius', 10)
-            style = data.get('style', 'red_3d')
-
-            # Корректируем координаты с учетом смещения области обрезки
-            if crop_offset:
-                crop_x, crop_y, _, _ = crop_offset
-                x = x - crop_x
-                y = y - crop_y
-
-            # Сохраняем настройки painter
-            painter.save()
-
-            # Включаем сглаживание для плавных краев
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
-
-            # Получаем кисть для заливки
-            from drawing_elements import DrawingElements
-            brush = DrawingElements.get_brush_from_style(style, x, y, radius)
-
-            # Рисуем только заливку (без обводки)
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(brush)
-            painter.drawEllipse(int(x - radius), int(y - radius),
-                                int(radius * 2), int(radius * 2))
-
-            # Рисуем текст ноты
-            self._draw_note_text(painter, data, x, y, radius)
-
-            # Восстанавливаем настройки painter
-            painter.restore()
-
-        except Exception as e:
-            print(f"Ошибка при отрисовке заливки ноты: {e}")
-
-    def _draw_note_text(self, painter, data, x, y, radius):
-        """Отрисовка текста ноты"""
-        try:
-            # Определяем отображаемый текст
-            display_text = data.get('display_text', 'finger')
-            if display_text == 'note_name':
-                symbol = data.get('note_name', '')
-            elif display_text == 'symbol':
-                symbol = data.get('symbol', '')
-            else:  # finger
-                symbol = data.get('finger', '1')
-
-            if not symbol:
-                return
-
-            # Настраиваем цвет текста
-            from drawing_elements import DrawingElements
-            text_color = DrawingElements.get_color_from_data(data.get('text_color', [255, 255, 255]))
-            painter.setPen(QPen(text_color))
-
-            # Настраиваем шрифт
-            font_size = max(10, radius)
-            font = QFont("Arial", font_size)
-
-            font_style = data.get('font_style', 'normal')
-            if font_style == 'bold':
-                font.setWeight(QFont.Bold)
-            elif font_style == 'light':
-                font.setWeight(QFont.Light)
-            elif font_style == 'italic':
-                font.setItalic(True)
-            elif font_style == 'bold_italic':
-                font.setWeight(QFont.Bold)
-                font.setItalic(True)
-
-            painter.setFont(font)
-
-            # Идеальное центрирование текста
-            font_metrics = QFontMetrics(font)
-            text_width = font_metrics.width(symbol)
-            text_height = font_metrics.height()
-
-            # Если текст слишком большой для круга, уменьшаем шрифт
-            if text_width > radius * 1.8 or text_height > radius * 1.8:
-                font_size = max(8, radius * 3 // 4)
-                font.setPointSize(font_size)
-                painter.setFont(font)
-                font_metrics = QFontMetrics(font)
-                text_width = font_metrics.width(symbol)
-                text_height = font_metrics.height()
-
-            # Центрируем по горизонтали и вертикали
-            text_x = x - text_width // 2
-            text_y = y + text_height // 4
-
-            painter.drawText(text_x, text_y, symbol)
-
-        except Exception as e:
-            print(f"Ошибка при отрисовке текста ноты: {e}")
-
-    def _draw_barre_with_outline(self, painter, data, crop_offset=None):
-        """Отрисовка ТОЛЬКО обводки баре"""
-        try:
-            x = data.get('x', 0)
-            y = data.get('y', 0)
-            width = data.get('width', 50)
-            height = data.get('height', 20)
-            outline_width = data.get('outline_width', 3)
-            radius = data.get('radius', 10)
-
-            # Корректируем координаты с учетом смещения области обрезки
-            if crop_offset:
-                crop_x, crop_y, _, _ = crop_offset
-                x = x - crop_x
-                y = y - crop_y
-
-            # Сохраняем настройки painter
-            painter.save()
-
-            # Включаем сглаживание для плавных краев
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
-
-            # Рисуем ТОЛЬКО обводку (внешний прямоугольник)
-            outline_pen = QPen(QColor(0, 0, 0))  # Черный цвет обводки
-            outline_pen.setWidth(outline_width)
-            outline_pen.setCapStyle(Qt.RoundCap)
-            outline_pen.setJoinStyle(Qt.RoundJoin)
-            painter.setPen(outline_pen)
-            painter.setBrush(Qt.NoBrush)  # Важно: без заливки!
-
-            # Рисуем скругленный прямоугольник для обводки
-            outline_rect = QRectF(x - width / 2, y - height / 2, width, height)
-            painter.drawRoundedRect(outline_rect, radius, radius)
-
-            # Восстанавливаем настройки painter
-            painter.restore()
-
-        except Exception as e:
-            print(f"Ошибка при отрисовке обводки баре: {e}")
-
-    def _draw_note_with_outline(self, painter, data, crop_offset=None):
-        """Отрисовка ТОЛЬКО обводки ноты"""
-        try:
-            x = data.get('x', 0)
-            y = data.get('y', 0)
-            radius = data.get('radius', 10)
-            outline_width = data.get('outline_width', 2)
-
-            # Корректируем координаты с учетом смещения области обрезки
-            if crop_offset:
-                crop_x, crop_y, _, _ = crop_offset
-                x = x - crop_x
-                y = y - crop_y
-
-            # Сохраняем настройки painter
-            painter.save()
-
-            # Включаем сглаживание для плавных краев
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
-
-            # Рисуем ТОЛЬКО обводку (внешний круг)
-            outline_pen = QPen(QColor(0, 0, 0))  # Черный цвет обводки
-            outline_pen.setWidth(outline_width)
-            outline_pen.setCapStyle(Qt.RoundCap)
-            outline_pen.setJoinStyle(Qt.RoundJoin)
-            painter.setPen(outline_pen)
-            painter.setBrush(Qt.NoBrush)  # Важно: без заливки!
-
-            painter.drawEllipse(int(x - radius), int(y - radius),
-                                int(radius * 2), int(radius * 2))
-
-            # Восстанавливаем настройки painter
-            painter.restore()
-
-        except Exception as e:
-            print(f"Ошибка при отрисовке обводки ноты: {e}")
-
-    def convert_frets_to_numeric(self, elements):
-        """Преобразование римских цифр ладов в обычные цифры"""
-        roman_to_numeric = {
-            'I': '1', 'II': '2', 'III': '3', 'IV': '4', 'V': '5',
-            'VI': '6', 'VII': '7', 'VIII': '8', 'IX': '9', 'X': '10',
-            'XI': '11', 'XII': '12', 'XIII': '13', 'XIV': '14', 'XV': '15',
-            'XVI': '16'
-        }
-
-        converted_elements = []
-        for element in elements:
-            if element['type'] == 'fret':
-                # Создаем копию данных элемента
-                converted_element = element.copy()
-                fret_data = converted_element['data'].copy()
-
-                # Преобразуем символ лада
-                original_symbol = fret_data.get('symbol', 'I')
-                if original_symbol in roman_to_numeric:
-                    fret_data['symbol'] = roman_to_numeric[original_symbol]
-                    print(f"🎯 Преобразован лад: {original_symbol} -> {fret_data['symbol']}")
-
-                converted_element['data'] = fret_data
-                converted_elements.append(converted_element)
-            else:
-                # Для других типов элементов оставляем как есть
-                converted_elements.append(element)
-
-        return converted_elements
+    def _pixmap_cache_key(self, chord_info, crop_rect):
+        """Ключ кэша изображения: аккорд и все настройки отображения"""
+        key = (
+            chord_info['name'],
+            self.current_display_type,
+            self.current_fret_type,
+            self.current_barre_outline,
+            self.current_note_outline,
+            self.current_scale_type
+        )
+        if not crop_rect:
+            # Без обрезки "Маленький 1" подгоняется под размер метки
+            key += (self.image_label.width(), self.image_label.height())
+        return key
 
     def display_chord(self, chord_info):
         """Отображение выбранного аккорда на изображении с выбранным масштабом"""
@@ -1138,176 +918,34 @@ class ChordConfigTab(QWidget):
             ram_key = chord_info['data'].get('RAM')
             crop_rect = self.config_manager.get_ram_crop_area(ram_key)
 
-            print(f"🎯 Оригинальное изображение: {self.original_pixmap.width()}x{self.original_pixmap.height()}")
-            print(f"🎯 Область обрезки для RAM '{ram_key}': {crop_rect}")
-
-            # Получаем элементы для отображения
-            elements = self.config_manager.get_chord_elements(
-                chord_info['data'],
-                self.current_display_type
-            )
-
-            print(f"🎯 Отображение аккорда: {chord_info['name']}")
-            print(f"📊 Найдено элементов: {len(elements)}")
-
-            # Преобразуем символы ладов в зависимости от выбранного типа
-            if self.current_fret_type == "numeric":
-                elements = self.convert_frets_to_numeric(elements)
-
-            # Применяем настройки обводки к элементам
-            elements = self.apply_outline_settings(elements)
-
-            # ВСЕГДА используем обрезку по RAM, если она определена
-            if crop_rect:
-                crop_x, crop_y, crop_width, crop_height = crop_rect
-
-                # Проверяем границы и корректируем при необходимости
-                crop_x = max(0, min(crop_x, self.original_pixmap.width() - 1))
-                crop_y = max(0, min(crop_y, self.original_pixmap.height() - 1))
-                crop_width = max(1, min(crop_width, self.original_pixmap.width() - crop_x))
-                crop_height = max(1, min(crop_height, self.original_pixmap.height() - crop_y))
-
-                print(f"🎯 Финальная область обрезки: ({crop_x}, {crop_y}, {crop_width}, {crop_height})")
-
-                # СОЗДАЕМ НОВОЕ ИЗОБРАЖЕНИЕ РАЗМЕРОМ С ОБЛАСТЬ ОБРЕЗКИ
-                result_pixmap = QPixmap(crop_width, crop_height)
-                result_pixmap.fill(Qt.white)  # Белый фон
-
-                # Создаем painter для нового изображения
-                painter = QPainter(result_pixmap)
-
-                # Включаем сглаживание для всего изображения
-                painter.setRenderHint(QPainter.Antialiasing)
-                painter.setRenderHint(QPainter.SmoothPixmapTransform)
-                painter.setRenderHint(QPainter.TextAntialiasing)
-
-                # Копируем область из оригинального изображения
-                painter.drawPixmap(0, 0, self.original_pixmap,
-                                   crop_x, crop_y, crop_width, crop_height)
-
-                # Рисуем элементы на НОВОМ изображении с правильными координатами
-                # Используем улучшенную отрисовку с обводкой и передаем смещение
-                self.draw_elements_with_outline(painter, elements, (crop_x, crop_y, crop_width, crop_height))
-
-                painter.end()
-
-                # Применяем выбранный масштаб
-                if self.current_scale_type == "small1":
-                    # МАЛЕНЬКИЙ 1 - как было раньше (авто масштаб)
-                    display_width = min(400, crop_width)
-                    scale_factor = display_width / crop_width
-                    display_height = int(crop_height * scale_factor)
-
-                    scaled_pixmap = result_pixmap.scaled(
-                        display_width,
-                        display_height,
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    self.image_label.setPixmap(scaled_pixmap)
-                    print(f"📏 Маленький 1: {crop_width}x{crop_height} -> {display_width}x{display_height}")
-
-                elif self.current_scale_type == "small2":
-                    # МАЛЕНЬКИЙ 2 - 30% от оригинального
-                    display_width = int(crop_width * 0.3)
-                    display_height = int(crop_height * 0.3)
-
-                    scaled_pixmap = result_pixmap.scaled(
-                        display_width,
-                        display_height,
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    self.image_label.setPixmap(scaled_pixmap)
-                    print(f"📏 Маленький 2 (30%): {crop_width}x{crop_height} -> {display_width}x{display_height}")
-
-                elif self.current_scale_type == "medium1":
-                    # СРЕДНИЙ 1 - 50% от оригинального
-                    display_width = int(crop_width * 0.5)
-                    display_height = int(crop_height * 0.5)
-
-                    scaled_pixmap = result_pixmap.scaled(
-                        display_width,
-                        display_height,
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    self.image_label.setPixmap(scaled_pixmap)
-                    print(f"📏 Средний 1 (50%): {crop_width}x{crop_height} -> {display_width}x{display_height}")
-
-                elif self.current_scale_type == "medium2":
-                    # СРЕДНИЙ 2 - 70% от оригинального
-                    display_width = int(crop_width * 0.7)
-                    display_height = int(crop_height * 0.7)
-
-                    scaled_pixmap = result_pixmap.scaled(
-                        display_width,
-                        display_height,
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    self.image_label.setPixmap(scaled_pixmap)
-                    print(f"📏 Средний 2 (70%): {crop_width}x{crop_height} -> {display_width}x{display_height}")
-
-                else:
-                    # ОРИГИНАЛЬНЫЙ РАЗМЕР
-                    self.image_label.setPixmap(result_pixmap)
-                    print(f"📏 Оригинальный размер: {crop_width}x{crop_height}")
+            # Повторный показ аккорда с теми же настройками - без перерисовки
+            cache_key = self._pixmap_cache_key(chord_info, crop_rect)
+            cached_pixmap = self.pixmap_cache.get(cache_key)
+            if cached_pixmap is not None:
+                self.image_label.setPixmap(cached_pixmap)
+                logger.debug("⚡ Изображение %s из кэша: %s", chord_info['name'], self.pixmap_cache.get_stats())
+                return
 
-            else:
-                # Если нет обрезки, рисуем на полном изображении
-                result_pixmap = QPixmap(self.original_pixmap.size())
-                result_pixmap.fill(Qt.white)
-
-                painter = QPainter(result_pixmap)
-                painter.setRenderHint(QPainter.Antialiasing)
-                painter.setRenderHint(QPainter.SmoothPixmapTransform)
-
-                painter.drawPixmap(0, 0, self.original_pixmap)
-                self.draw_elements_with_outline(painter, elements, None)
-                painter.end()
-
-                # Применяем выбранный масштаб
-                if self.current_scale_type == "small1":
-                    scaled_pixmap = result_pixmap.scaled(
-                        self.image_label.width(),
-                        self.image_label.height(),
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    self.image_label.setPixmap(scaled_pixmap)
-                elif self.current_scale_type == "small2":
-                    display_width = int(result_pixmap.width() * 0.3)
-                    display_height = int(result_pixmap.height() * 0.3)
-                    scaled_pixmap = result_pixmap.scaled(
-                        display_width, display_height,
-                        Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                    self.image_label.setPixmap(scaled_pixmap)
-                elif self.current_scale_type == "medium1":
-                    display_width = int(result_pixmap.width() * 0.5)
-                    display_height = int(result_pixmap.height() * 0.5)
-                    scaled_pixmap = result_pixmap.scaled(
-                        display_width, display_height,
-                        Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                    self.image_label.setPixmap(scaled_pixmap)
-                elif self.current_scale_type == "medium2":
-                    display_width = int(result_pixmap.width() * 0.7)
-                    display_height = int(result_pixmap.height() * 0.7)
-                    scaled_pixmap = result_pixmap.scaled(
-                        display_width, display_height,
-                        Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                    self.image_label.setPixmap(scaled_pixmap)
-                else:
-                    self.image_label.setPixmap(result_pixmap)
+            final_pixmap = self.render_chord_pixmap(chord_info)
+            self.pixmap_cache.put(cache_key, final_pixmap)
+            self.image_label.setPixmap(final_pixmap)
 
         except Exception as e:
             self.image_label.setText(f"Ошибка отображения: {str(e)}")
-            print(f"Ошибка при отображении аккорда: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка при отображении аккорда: %s", e)
+
+    def render_chord_pixmap(self, chord_info):
+        """Отрисовка аккорда с текущими настройками и выбранным масштабом"""
+        logger.debug("🎯 Отображение аккорда: %s", chord_info['name'])
+        return self.renderer.render_chord(
+            chord_info['data'],
+            display_type=self.current_display_type,
+            fret_type=self.current_fret_type,
+            barre_outline=self.current_barre_outline,
+            note_outline=self.current_note_outline,
+            scale_type=self.current_scale_type,
+            fit_size=(self.image_label.width(), self.image_label.height())
+        )
 
 
 class MainWindow(QMainWindow):
@@ -1351,12 +989,16 @@ class MainWindow(QMainWindow):
 
 
 def main():
+    setup_logging()
+
     # Создаем экземпляр приложения
     app = QApplication(sys.argv)
+    startup_timeline.mark("QApplication создан")
 
     # Создаем и показываем главное окно
     window = MainWindow()
     window.show()
+    startup_timeline.mark("окно создано")
 
     # Запускаем цикл событий
     sys.exit(app.exec_())
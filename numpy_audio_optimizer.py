@@ -0,0 +1,206 @@
+"""
+Оптимизация звуков на NumPy.
+
+Звук один раз декодируется FFmpeg в float32, затем сведение в моно, смена частоты,
+обрезка тишины, нормализация по RMS, компрессия и high-pass фильтр выполняются
+векторными операциями над массивом, и результат один раз кодируется в MP3.
+В цепочке pydub detect_silence, compress_dynamic_range и high_pass_filter -
+циклы Python по фрагментам звука, здесь - операции над всем массивом сразу.
+
+Массивы звука имеют форму (кадры, каналы), отсчеты в диапазоне [-1, 1].
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Атака и восстановление компрессора (как по умолчанию в pydub)
+COMPRESS_ATTACK_MS = 5.0
+COMPRESS_RELEASE_MS = 50.0
+
+# Запас тишины вокруг сигнала для фильтра в частотной области (убирает заворот отклика)
+HIGH_PASS_PADDING_MS = 50
+
+MIN_LEVEL = 1e-10  # -200 dBFS вместо log10(0)
+
+
+def decode(sound_path: Path, ffmpeg_path: str) -> Tuple[np.ndarray, int]:
+    """Декодирует файл в float32 без смены частоты и числа каналов. Возвращает (отсчеты, частота)"""
+    result = subprocess.run([ffmpeg_path, '-v', 'error', '-i', str(sound_path),
+                             '-f', 'wav', '-acodec', 'pcm_f32le', 'pipe:1'],
+                            capture_output=True, check=True)
+    return parse_wav(result.stdout)
+
+
+def parse_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """
+    Разбирает WAV с отсчетами float32.
+    Размер блока data не проверяется: при выводе в pipe FFmpeg не знает его заранее
+    """
+    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError("Не WAV данные")
+
+    channels = sample_rate = None
+    position = 12
+    while position + 8 <= len(data):
+        chunk_id = data[position:position + 4]
+        chunk_size = int.from_bytes(data[position + 4:position + 8], 'little')
+        if chunk_id == b'fmt ':
+            channels = int.from_bytes(data[position + 10:position + 12], 'little')
+            sample_rate = int.from_bytes(data[position + 12:position + 16], 'little')
+        elif chunk_id == b'data':
+            if not channels:
+                raise ValueError("В WAV нет блока fmt")
+            samples = data[position + 8:]
+            frame_size = 4 * channels
+            samples = samples[:len(samples) - len(samples) % frame_size]
+            return np.frombuffer(samples, dtype='<f4').reshape(-1, channels), sample_rate
+        position += 8 + chunk_size + chunk_size % 2
+
+    raise ValueError("В WAV нет блока data")
+
+
+def encode_mp3(samples: np.ndarray, sample_rate: int, bitrate: str, ffmpeg_path: str) -> bytes:
+    """Кодирует отсчеты в MP3"""
+    pcm = np.clip(samples, -1.0, 1.0).astype('<f4').tobytes()
+    result = subprocess.run([ffmpeg_path, '-v', 'error',
+                             '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(samples.shape[1]), '-i', 'pipe:0',
+                             '-b:a', bitrate, '-f', 'mp3', 'pipe:1'],
+                            input=pcm, capture_output=True, check=True)
+    return result.stdout
+
+
+def level_db(samples: np.ndarray) -> float:
+    """Уровень RMS в dBFS"""
+    if not samples.size:
+        return -float('inf')
+    return 20 * np.log10(max(float(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))), MIN_LEVEL))
+
+
+def downmix(samples: np.ndarray, channels: int) -> np.ndarray:
+    """Сводит каналы в моно (channels=1), другие раскладки остаются как есть"""
+    if channels == 1 and samples.shape[1] > 1:
+        return samples.mean(axis=1, keepdims=True)
+    return samples
+
+
+def resample(samples: np.ndarray, rate_in: int, rate_out: int) -> np.ndarray:
+    """
+    Смена частоты в частотной области: спектр обрезается (или дополняется нулями)
+    до новой длины - это и ресемплинг, и фильтр от наложения частот
+    """
+    if rate_in == rate_out or not len(samples):
+        return samples
+
+    frames_out = max(1, round(len(samples) * rate_out / rate_in))
+    spectrum = np.fft.rfft(samples, axis=0)
+    bins_out = frames_out // 2 + 1
+    if bins_out <= len(spectrum):
+        spectrum = spectrum[:bins_out]
+    else:
+        spectrum = np.pad(spectrum, ((0, bins_out - len(spectrum)), (0, 0)))
+    return (np.fft.irfft(spectrum, frames_out, axis=0) * (frames_out / len(samples))).astype(np.float32)
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, silence_thresh: float, min_silence_len: int,
+                 seek_step: int, padding_start: int, padding_end: int) -> np.ndarray:
+    """
+    Обрезает тишину в начале и конце (длительности в мс).
+    Окна длиной min_silence_len с шагом seek_step тише silence_thresh считаются тишиной,
+    звук сохраняется от первого до последнего громкого окна с отступами
+    """
+    window = max(1, sample_rate * min_silence_len // 1000)
+    step = max(1, sample_rate * seek_step // 1000)
+    if len(samples) <= window:
+        return samples
+
+    # Энергия всех окон сразу через накопленную сумму квадратов
+    energy = np.concatenate(([0.0], np.cumsum(np.square(samples, dtype=np.float64).sum(axis=1))))
+    starts = np.arange(0, len(samples) - window + 1, step)
+    mean_square = (energy[starts + window] - energy[starts]) / (window * samples.shape[1])
+    loud = np.flatnonzero(mean_square >= 10 ** (silence_thresh / 10))
+    if not len(loud):
+        return samples
+
+    start = max(0, starts[loud[0]] - sample_rate * padding_start // 1000)
+    end = min(len(samples), starts[loud[-1]] + window + sample_rate * padding_end // 1000)
+    return samples[start:end]
+
+
+def normalize(samples: np.ndarray, target_dBFS: float) -> np.ndarray:
+    """Приводит уровень RMS к target_dBFS"""
+    current = level_db(samples)
+    if current <= 20 * np.log10(MIN_LEVEL):
+        return samples
+    return samples * np.float32(10 ** ((target_dBFS - current) / 20))
+
+
+def compress(samples: np.ndarray, sample_rate: int, threshold: float, ratio: float,
+             attack: float = COMPRESS_ATTACK_MS, release: float = COMPRESS_RELEASE_MS) -> np.ndarray:
+    """
+    Компрессия динамического диапазона: уровень считается по блокам длиной attack,
+    ослабление над порогом удерживается release мс и плавно переходит между блоками
+    """
+    block = max(1, int(sample_rate * attack / 1000))
+    blocks = -(-len(samples) // block)
+    if not blocks:
+        return samples
+
+    padded = np.zeros((blocks * block, samples.shape[1]), dtype=np.float32)
+    padded[:len(samples)] = samples
+    mean_square = np.square(padded, dtype=np.float64).reshape(blocks, -1).mean(axis=1)
+    levels = 10 * np.log10(np.maximum(mean_square, MIN_LEVEL ** 2))
+    reduction = np.maximum(levels - threshold, 0.0) * (1.0 - 1.0 / ratio)
+
+    # Восстановление: ослабление держится максимумом по предыдущим release мс
+    hold = max(1, int(release / attack))
+    if hold > 1:
+        reduction = np.lib.stride_tricks.sliding_window_view(
+            np.pad(reduction, (hold - 1, 0)), hold).max(axis=1)
+
+    centers = np.arange(blocks) * block + block / 2
+    gain_db = np.interp(np.arange(len(samples)), centers, -reduction)
+    return samples * (10 ** (gain_db / 20)).astype(np.float32)[:, None]
+
+
+def high_pass(samples: np.ndarray, sample_rate: int, cutoff: float) -> np.ndarray:
+    """RC фильтр высоких частот первого порядка (как high_pass_filter в pydub), примененный в частотной области"""
+    if not len(samples):
+        return samples
+
+    # Длина FFT - степень двойки с запасом (длины с большими простыми множителями считаются в разы дольше)
+    frames = 1 << (len(samples) + sample_rate * HIGH_PASS_PADDING_MS // 1000 - 1).bit_length()
+    spectrum = np.fft.rfft(samples, frames, axis=0)
+    ratio = 1j * np.fft.rfftfreq(frames, 1 / sample_rate) / cutoff
+    spectrum *= (ratio / (1 + ratio))[:, None]
+    return np.fft.irfft(spectrum, frames, axis=0)[:len(samples)].astype(np.float32)
+
+
+def optimize_sound(sound_path: Path, params: Dict, ffmpeg_path: str) -> Tuple[bytes, Dict]:
+    """
+    Полная цепочка оптимизации с параметрами AudioOptimizer.OPTIMIZATION_PARAMS.
+    Возвращает (MP3 данные, сведения о звуке до и после)
+    """
+    samples, sample_rate = decode(sound_path, ffmpeg_path)
+    info = {
+        'duration_in': len(samples) * 1000 // max(1, sample_rate),
+        'channels_in': samples.shape[1],
+        'sample_rate_in': sample_rate
+    }
+
+    # Сначала уменьшаем объем данных: остальные шаги работают с моно 22 кГц
+    samples = downmix(samples, params['channels'])
+    samples = resample(samples, sample_rate, params['sample_rate'])
+    sample_rate = params['sample_rate']
+
+    samples = trim_silence(samples, sample_rate, params['silence_thresh'], params['min_silence_len'],
+                           params['seek_step'], params['trim_padding_start'], params['trim_padding_end'])
+    samples = normalize(samples, params['target_dBFS'])
+    samples = compress(samples, sample_rate, params['compress_threshold'], params['compress_ratio'])
+    samples = high_pass(samples, sample_rate, params['highpass_cutoff'])
+
+    info['duration_out'] = len(samples) * 1000 // sample_rate
+    info['dBFS_out'] = level_db(samples)
+    return encode_mp3(samples, sample_rate, params['bitrate'], ffmpeg_path), info
@@ -0,0 +1,79 @@
+"""
+LRU кэш, ограниченный суммарным размером значений в байтах
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def pixmap_size_in_bytes(pixmap) -> int:
+    """Размер пикселей QPixmap/QImage в байтах"""
+    return pixmap.width() * pixmap.height() * max(1, pixmap.depth()) // 8
+
+
+class SizeBoundedLRUCache:
+    """
+    LRU кэш с вытеснением по суммарному размеру значений.
+    Размер значения вычисляется функцией size_of (по умолчанию len).
+    """
+
+    def __init__(self, max_bytes: int, size_of: Callable[[Any], int] = len):
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self._items = OrderedDict()  # ключ -> (значение, размер)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Возвращает значение и помечает его как недавно использованное"""
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """Добавляет значение, вытесняя самые старые. False если значение не помещается"""
+        size = self.size_of(value)
+        if size > self.max_bytes:
+            return False
+
+        self.discard(key)
+        self._items[key] = (value, size)
+        self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._items.popitem(last=False)
+            self.total_bytes -= evicted_size
+        return True
+
+    def discard(self, key: Hashable):
+        """Удаляет значение из кэша, если оно есть"""
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.total_bytes -= item[1]
+
+    def clear(self):
+        """Полная очистка кэша"""
+        self._items.clear()
+        self.total_bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Статистика кэша"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'items': len(self._items),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes
+        }
@@ -0,0 +1,251 @@
+"""
+Атлас спрайтов нот и символов ладов.
+
+Каждое уникальное сочетание (стиль, радиус, текст, обводка, масштаб) рисуется
+один раз в страницу атласа - QImage с полочной упаковкой. При отрисовке аккорда
+ноты и лады не рисуются заново, а копируются из атласа через drawImage.
+
+Кисти стилей не зависят от положения элемента (градиент привязан к центру),
+поэтому спрайт, нарисованный в центре, совпадает с элементом на месте.
+"""
+
+import math
+
+from PyQt5.QtCore import Qt, QPoint, QPointF, QRect, QRectF
+from PyQt5.QtGui import QColor, QImage, QPainter, QPen, QTransform
+
+from drawing_elements import DrawingElements
+from text_layout import text_layout_cache
+
+ATLAS_PAGE_SIZE = 1024
+ATLAS_MAX_PAGES = 8  # 4 МБ на страницу: сверх этого атлас очищается перед следующей отрисовкой
+SPRITE_MARGIN = 2  # запас в пикселях на сглаживание краев
+TEXT_MARGIN = 4  # запас на выступающие за метрики части глифов
+
+
+class Sprite:
+    """Спрайт в атласе: страница, область на ней и положение центра элемента внутри области"""
+
+    __slots__ = ('page', 'rect', 'center_x', 'center_y')
+
+    def __init__(self, page, rect, center_x, center_y):
+        self.page = page
+        self.rect = rect
+        self.center_x = center_x
+        self.center_y = center_y
+
+
+class SpriteAtlas:
+    """
+    Атлас спрайтов элементов аккорда.
+    Спрайты создаются при первом использовании или заранее через prebuild.
+    Спрайт ссылается на страницу по индексу, поэтому страницы удаляются только
+    между отрисовками (evict_if_full): во время отрисовки атлас может временно
+    превысить max_pages
+    """
+
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, max_pages=ATLAS_MAX_PAGES):
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = []
+        self.sprites = {}  # ключ сочетания -> Sprite
+        self.hits = 0
+        self.misses = 0
+
+        # Текущая страница и полка упаковки
+        self._shelf_page = None
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+
+    # ---- ключи и спрайты элементов ----
+
+    @staticmethod
+    def note_key(data, scale):
+        """Ключ ноты: все, что влияет на пиксели обводки, заливки и текста"""
+        return ('note', data.get('style', 'red_3d'), data.get('radius', 10),
+                DrawingElements.get_note_symbol(data), data.get('font_style', 'normal'),
+                tuple(data.get('text_color', [255, 255, 255])), data.get('outline_width', 0), scale)
+
+    @staticmethod
+    def fret_key(data, scale):
+        """Ключ символа лада"""
+        return ('fret', data.get('symbol', 'I'), data.get('font_family', 'Arial'), data.get('size', 60),
+                data.get('style', 'default'), tuple(data.get('color') or ()), scale)
+
+    def get_note_sprite(self, data, scale=1.0):
+        """Спрайт ноты: обводка (если задана), заливка и текст"""
+        key = self.note_key(data, scale)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        radius = data.get('radius', 10)
+        outline_width = data.get('outline_width', 0)
+        extent = radius + outline_width
+        bounds = QRectF(-extent, -extent, extent * 2, extent * 2)
+
+        symbol = DrawingElements.get_note_symbol(data)
+        if symbol:
+            layout = text_layout_cache.note_layout(symbol, radius, data.get('font_style', 'normal'))
+            bounds = bounds.united(self._text_bounds(layout))
+
+        return self._add_sprite(key, bounds, scale, lambda painter: self._paint_note(painter, data))
+
+    def get_fret_sprite(self, data, scale=1.0):
+        """Спрайт символа лада"""
+        key = self.fret_key(data, scale)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        layout = text_layout_cache.fret_layout(data.get('symbol', 'I'), data.get('font_family', 'Arial'),
+                                               data.get('size', 60))
+        return self._add_sprite(key, self._text_bounds(layout), scale,
+                                lambda painter: DrawingElements.draw_fret(painter, data, 0, 0))
+
+    def draw_sprite(self, painter, sprite, device_x, device_y):
+        """Копирует спрайт так, чтобы центр элемента попал в точку устройства (device_x, device_y)"""
+        painter.drawImage(QPoint(device_x - sprite.center_x, device_y - sprite.center_y),
+                          self.pages[sprite.page], sprite.rect)
+
+    def prebuild(self, elements, scales=(1.0,)):
+        """Заранее растеризует спрайты для данных нот и ладов ('type' и координаты в данных не важны)"""
+        self.evict_if_full()
+        for scale in scales:
+            for element_type, data in elements:
+                if element_type == 'note':
+                    self.get_note_sprite(data, scale)
+                elif element_type == 'fret':
+                    self.get_fret_sprite(data, scale)
+
+    def evict_if_full(self):
+        """
+        Очищает атлас, если страниц больше max_pages. Вызывается перед отрисовкой,
+        когда ни один полученный ранее спрайт уже не используется
+        """
+        if len(self.pages) > self.max_pages:
+            self.clear()
+
+    def clear(self):
+        """Удаляет все спрайты и страницы"""
+        self.pages = []
+        self.sprites.clear()
+        self._shelf_page = None
+        self._shelf_x = self._shelf_y = self._shelf_height = 0
+
+    def get_stats(self):
+        """Статистика атласа"""
+        return {
+            'sprites': len(self.sprites),
+            'pages': len(self.pages),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    # ---- растеризация ----
+
+    @staticmethod
+    def _text_bounds(layout):
+        """Логические границы текста относительно центра элемента с запасом на глифы"""
+        size = layout.static_text.size()
+        return QRectF(layout.offset_x - TEXT_MARGIN, layout.offset_y - TEXT_MARGIN,
+                      size.width() + TEXT_MARGIN * 2, size.height() + TEXT_MARGIN * 2)
+
+    @staticmethod
+    def _paint_note(painter, data):
+        """Нота в центре (0, 0) - те же примитивы, что и в слоях ChordRenderer"""
+        radius = data.get('radius', 10)
+        outline_width = data.get('outline_width', 0)
+        ellipse_args = (int(-radius), int(-radius), int(radius * 2), int(radius * 2))
+
+        if outline_width > 0:
+            outline_pen = QPen(QColor(0, 0, 0))
+            outline_pen.setWidth(outline_width)
+            outline_pen.setCapStyle(Qt.RoundCap)
+            outline_pen.setJoinStyle(Qt.RoundJoin)
+            painter.setPen(outline_pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawEllipse(*ellipse_args)
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(DrawingElements.get_brush_from_style(data.get('style', 'red_3d'), 0, 0, radius))
+        painter.drawEllipse(*ellipse_args)
+
+        symbol = DrawingElements.get_note_symbol(data)
+        if symbol:
+            text_color = DrawingElements.get_color_from_data(data.get('text_color', [255, 255, 255]))
+            painter.setPen(QPen(text_color))
+            text_layout_cache.note_layout(symbol, radius, data.get('font_style', 'normal')).draw(painter, 0, 0)
+
+    def _add_sprite(self, key, bounds, scale, paint):
+        """Выделяет место в атласе и рисует спрайт с центром элемента в целой точке"""
+        left = math.floor(bounds.left() * scale) - SPRITE_MARGIN
+        top = math.floor(bounds.top() * scale) - SPRITE_MARGIN
+        width = math.ceil(bounds.right() * scale) + SPRITE_MARGIN - left
+        height = math.ceil(bounds.bottom() * scale) + SPRITE_MARGIN - top
+
+        page_index, x, y = self._allocate(width, height)
+        sprite = Sprite(page_index, QRect(x, y, width, height), -left, -top)
+
+        painter = QPainter(self.pages[page_index])
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setClipRect(sprite.rect)
+        painter.setTransform(QTransform(scale, 0, 0, scale, x - left, y - top))
+        paint(painter)
+        painter.end()
+
+        self.sprites[key] = sprite
+        return sprite
+
+    def _allocate(self, width, height):
+        """Полочная упаковка: место для области width x height, возвращает (страница, x, y)"""
+        if width > self.page_size or height > self.page_size:
+            # Крупный спрайт получает отдельную страницу по размеру
+            self.pages.append(self._new_page(width, height))
+            return len(self.pages) - 1, 0, 0
+
+        if self._shelf_x + width > self.page_size:
+            # Текущая полка заполнена - начинаем новую под ней
+            self._shelf_x = 0
+            self._shelf_y += self._shelf_height
+            self._shelf_height = 0
+
+        if self._shelf_page is None or self._shelf_y + height > self.page_size:
+            self.pages.append(self._new_page(self.page_size, self.page_size))
+            self._shelf_page = len(self.pages) - 1
+            self._shelf_x = self._shelf_y = self._shelf_height = 0
+
+        x, y = self._shelf_x, self._shelf_y
+        self._shelf_x += width
+        self._shelf_height = max(self._shelf_height, height)
+        return self._shelf_page, x, y
+
+    @staticmethod
+    def _new_page(width, height):
+        page = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        page.fill(Qt.transparent)
+        return page
+
+
+def sprite_scale(painter):
+    """
+    Масштаб для спрайтов по текущей трансформации painter.
+    None - трансформация не сводится к равномерному масштабу со сдвигом, спрайты неприменимы
+    """
+    transform = painter.worldTransform()
+    if transform.type() > QTransform.TxScale or transform.m11() != transform.m22() or transform.m11() <= 0:
+        return None
+    return transform.m11()
+
+
+def device_point(painter, x, y):
+    """Целая точка устройства для логических координат (x, y)"""
+    point = painter.worldTransform().map(QPointF(x, y))
+    return int(round(point.x())), int(round(point.y()))
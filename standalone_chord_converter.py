@@ -1,10 +1,14 @@
 import os
 import sys
-import base64
 import json
+import argparse
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from chords_asset_pack import AssetPackWriter
+from converter_cache import OptimizedSoundCache
 
 # =============================================================================
 # НАСТРОЙКА FFMPEG ДЛЯ PYDUB
@@ -71,15 +75,205 @@ except ImportError:
     print("⚠️ pydub не установлен. Установите: pip install pydub")
     print("⚠️ Звуки будут сохраняться без оптимизации")
 
+try:
+    import numpy_audio_optimizer
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    print("⚠️ numpy не установлен, оптимизация звуков только через pydub")
+
+# Способы оптимизации звуков: векторная цепочка на NumPy или эффекты pydub
+OPTIMIZERS = ("numpy", "pydub")
+
+
+class AudioOptimizer:
+    """
+    Оптимизация звуков через NumPy (по умолчанию) или pydub.
+    Хранит только параметры, поэтому передается в процессы пула вместе с задачей
+    """
+
+    # Параметры оптимизации (входят в ключ кэша сборки)
+    OPTIMIZATION_PARAMS = {
+        'optimizer': 'numpy',
+        'bitrate': '64k',
+        'channels': 1,
+        'sample_rate': 22050,
+        'silence_thresh': -40.0,
+        'min_silence_len': 100,
+        'seek_step': 10,
+        'trim_padding_start': 50,
+        'trim_padding_end': 100,
+        'target_dBFS': -16.0,
+        'compress_threshold': -20.0,
+        'compress_ratio': 2.0,
+        'highpass_cutoff': 80
+    }
+
+    def __init__(self, params: Optional[Dict] = None):
+        self.params = dict(self.OPTIMIZATION_PARAMS, **(params or {}))
+        if self.params['optimizer'] == 'numpy' and not HAS_NUMPY:
+            # Способ входит в ключ кэша, поэтому фиксируем тот, что реально будет работать
+            self.params['optimizer'] = 'pydub'
+
+    def is_available(self) -> bool:
+        """Доступна ли оптимизация (иначе звуки сохраняются как есть)"""
+        if self.params['optimizer'] == 'numpy':
+            return HAS_FFMPEG
+        return HAS_PYDUB and HAS_FFMPEG
+
+    def optimize(self, sound_path: Path) -> Tuple[bytes, int, bool]:
+        """
+        Оптимизирует аудио файл с реальным сжатием.
+        Возвращает (данные, исходный размер, была ли оптимизация)
+        """
+        try:
+            original_size = sound_path.stat().st_size
+
+            if not self.is_available():
+                print(f"    ⚠️ {self.params['optimizer']}/FFmpeg не доступен, сохраняем оригинал: {sound_path.name}")
+                with open(sound_path, 'rb') as f:
+                    return f.read(), original_size, False
+
+            if self.params['optimizer'] == 'numpy':
+                return self._optimize_with_numpy(sound_path, original_size)
+
+            # Оптимизация с pydub
+            return self._optimize_with_pydub(sound_path, original_size)
+
+        except Exception as e:
+            print(f"    ❌ Ошибка оптимизации {sound_path.name}: {e}")
+            # Возвращаем оригинальный файл в случае ошибки
+            with open(sound_path, 'rb') as f:
+                data = f.read()
+            return data, len(data), False
+
+    def _optimize_with_numpy(self, sound_path: Path, original_size: int) -> Tuple[bytes, int, bool]:
+        """Оптимизирует аудио векторной цепочкой NumPy: одно декодирование и одно кодирование"""
+        try:
+            compressed_data, info = numpy_audio_optimizer.optimize_sound(sound_path, self.params, FFMPEG_PATH)
+            compressed_size = len(compressed_data)
+
+            compression_ratio = (original_size - compressed_size) / original_size * 100
+            print(
+                f"    ✅ {sound_path.name}: {info['duration_in']} ms, {info['channels_in']} каналов, "
+                f"{info['sample_rate_in']} Hz → {info['duration_out']} ms, {info['dBFS_out']:.1f} dBFS; "
+                f"{original_size / 1024:.1f}KB → {compressed_size / 1024:.1f}KB ({compression_ratio:+.1f}%)")
+
+            return compressed_data, original_size, True
+
+        except Exception as e:
+            print(f"    ❌ Ошибка NumPy оптимизации {sound_path.name}: {e}")
+            # Возвращаем оригинальный файл
+            with open(sound_path, 'rb') as f:
+                return f.read(), original_size, False
+
+    def _optimize_with_pydub(self, sound_path: Path, original_size: int) -> Tuple[bytes, int, bool]:
+        """Оптимизирует аудио с помощью pydub"""
+        import io
+
+        try:
+            print(f"    🔧 Оптимизация {sound_path.name} с pydub...")
+
+            # Загружаем аудио
+            audio_format = sound_path.suffix.lower()[1:]  # убираем точку
+            audio = AudioSegment.from_file(sound_path, format=audio_format)
+            print(f"    📊 Загружено: {len(audio)} ms, {audio.channels} каналов, {audio.frame_rate} Hz")
+
+            # 1. Обрезаем тишину
+            audio = self._remove_silence(audio)
+            print(f"    ✂️  После обрезки тишины: {len(audio)} ms")
+
+            # 2. Нормализуем громкость
+            audio = self._normalize_volume(audio)
+            print(f"    🔊 После нормализации: {audio.dBFS:.1f} dBFS")
+
+            # 3. Компрессия динамического диапазона
+            audio = compress_dynamic_range(audio, threshold=self.params['compress_threshold'],
+                                           ratio=self.params['compress_ratio'])
+            print(f"    🎛️  После компрессии: {len(audio)} ms")
+
+            # 4. High-pass фильтр для чистоты звука
+            audio = high_pass_filter(audio, cutoff=self.params['highpass_cutoff'])
+            print(f"    🎵 После фильтра: {len(audio)} ms")
+
+            # 5. Экспортируем с оптимизацией
+            buffer = io.BytesIO()
+            audio.export(
+                buffer,
+                format="mp3",
+                bitrate=self.params['bitrate'],
+                parameters=["-ac", str(self.params['channels']),
+                            "-ar", str(self.params['sample_rate'])]  # моно, пониженная частота
+            )
+
+            compressed_data = buffer.getvalue()
+            compressed_size = len(compressed_data)
+
+            compression_ratio = (original_size - compressed_size) / original_size * 100
+            print(
+                f"    ✅ {sound_path.name}: {original_size / 1024:.1f}KB → {compressed_size / 1024:.1f}KB ({compression_ratio:+.1f}%)")
+
+            return compressed_data, original_size, True
+
+        except Exception as e:
+            print(f"    ❌ Ошибка pydub оптимизации: {e}")
+            import traceback
+            traceback.print_exc()
+            # Возвращаем оригинальный файл
+            with open(sound_path, 'rb') as f:
+                return f.read(), original_size, False
+
+    def _remove_silence(self, audio):
+        """Обрезает тишину в начале и конце"""
+        try:
+            print(f"    🔇 Поиск тишины...")
+            non_silent = audio.detect_silence(
+                silence_thresh=self.params['silence_thresh'],
+                min_silence_len=self.params['min_silence_len'],
+                seek_step=self.params['seek_step']
+            )
+
+            if not non_silent:
+                print(f"    🔇 Тишина не найдена")
+                return audio
+
+            start = max(0, non_silent[0][0] - self.params['trim_padding_start'])
+            end = min(len(audio), non_silent[-1][1] + self.params['trim_padding_end'])
+
+            print(f"    ✂️  Обрезка: {len(audio)}ms → {end - start}ms")
+            return audio[start:end]
+        except Exception as e:
+            print(f"    ⚠️ Ошибка обрезки тишины: {e}")
+            return audio
+
+    def _normalize_volume(self, audio):
+        """Нормализует громкость"""
+        try:
+            target_dBFS = self.params['target_dBFS']
+            current_dBFS = audio.dBFS
+            change_in_dBFS = target_dBFS - current_dBFS
+            print(f"    🔊 Нормализация: {current_dBFS:.1f}dBFS → {target_dBFS:.1f}dBFS")
+            return audio.apply_gain(change_in_dBFS)
+        except Exception as e:
+            print(f"    ⚠️ Ошибка нормализации громкости: {e}")
+            return audio
+
 
 class StandaloneChordConverter:
     """
-    Автономный конвертер аккордов - упаковывает ВСЕ данные в один Python файл
+    Автономный конвертер аккордов - упаковывает ВСЕ данные в один файл ресурсов
     """
 
-    def __init__(self, config_path: str, sounds_base_dir: str = None):
+    def __init__(self, config_path: str, sounds_base_dir: str = None, workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None, optimizer: str = 'numpy'):
         self.config_path = Path(config_path)
         self.sounds_base_dir = Path(sounds_base_dir) if sounds_base_dir else None
+        # Количество процессов для оптимизации звуков (по умолчанию - число ядер)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.audio_optimizer = AudioOptimizer({'optimizer': optimizer})
+        # Кэш оптимизированных звуков между запусками (None - без кэша)
+        self.sound_cache = OptimizedSoundCache(cache_dir, self.audio_optimizer.params) if cache_dir else None
         self.converted_data = {
             'metadata': {
                 'converter_version': '2.0',
@@ -88,7 +282,8 @@ class StandaloneChordConverter:
                 'sounds_count': 0,
                 'compression_stats': {},
                 'ffmpeg_configured': HAS_FFMPEG,
-                'pydub_available': HAS_PYDUB
+                'pydub_available': HAS_PYDUB,
+                'sound_optimizer': self.audio_optimizer.params['optimizer']
             },
             'template_image': None,
             'original_json_config': None,
@@ -148,7 +343,7 @@ class StandaloneChordConverter:
             return obj
 
     def load_template_image(self):
-        """Загружает основной шаблон изображения в base64"""
+        """Загружает основной шаблон изображения"""
         possible_paths = [
             self.config_path.parent / 'img.png',
             self.config_path.parent / 'img.jpg',
@@ -174,8 +369,7 @@ class StandaloneChordConverter:
             with open(template_path, 'rb') as f:
                 template_data = f.read()
 
-            template_b64 = base64.b64encode(template_data).decode('utf-8')
-            self.converted_data['template_image'] = template_b64
+            self.converted_data['template_image'] = template_data
             self.converted_data['metadata']['template_size'] = len(template_data)
             self.converted_data['metadata']['template_path'] = str(template_path)
             print(f"✅ Шаблон изображения сохранен: {len(template_data)} bytes")
@@ -185,115 +379,73 @@ class StandaloneChordConverter:
 
     def optimize_audio_file(self, sound_path: Path) -> Optional[bytes]:
         """Оптимизирует аудио файл с реальным сжатием"""
-        try:
-            original_size = sound_path.stat().st_size
-
-            if not HAS_PYDUB or not HAS_FFMPEG:
-                print(f"    ⚠️ pydub/FFmpeg не доступен, сохраняем оригинал: {sound_path.name}")
-                with open(sound_path, 'rb') as f:
-                    return f.read()
-
-            # Оптимизация с pydub
-            return self._optimize_with_pydub(sound_path, original_size)
-
-        except Exception as e:
-            print(f"    ❌ Ошибка оптимизации {sound_path.name}: {e}")
-            # Возвращаем оригинальный файл в случае ошибки
-            with open(sound_path, 'rb') as f:
-                return f.read()
-
-    def _optimize_with_pydub(self, sound_path: Path, original_size: int) -> bytes:
-        """Оптимизирует аудио с помощью pydub"""
-        import io
-
-        try:
-            print(f"    🔧 Оптимизация {sound_path.name} с pydub...")
-
-            # Загружаем аудио
-            audio_format = sound_path.suffix.lower()[1:]  # убираем точку
-            audio = AudioSegment.from_file(sound_path, format=audio_format)
-            print(f"    📊 Загружено: {len(audio)} ms, {audio.channels} каналов, {audio.frame_rate} Hz")
-
-            # 1. Обрезаем тишину
-            audio = self._remove_silence(audio)
-            print(f"    ✂️  После обрезки тишины: {len(audio)} ms")
-
-            # 2. Нормализуем громкость
-            audio = self._normalize_volume(audio)
-            print(f"    🔊 После нормализации: {audio.dBFS:.1f} dBFS")
-
-            # 3. Компрессия динамического диапазона
-            audio = compress_dynamic_range(audio, threshold=-20.0, ratio=2.0)
-            print(f"    🎛️  После компрессии: {len(audio)} ms")
-
-            # 4. High-pass фильтр для чистоты звука
-            audio = high_pass_filter(audio, cutoff=80)
-            print(f"    🎵 После фильтра: {len(audio)} ms")
-
-            # 5. Экспортируем с оптимизацией
-            buffer = io.BytesIO()
-            audio.export(
-                buffer,
-                format="mp3",
-                bitrate="64k",
-                parameters=["-ac", "1", "-ar", "22050"]  # моно, пониженная частота
-            )
-
-            compressed_data = buffer.getvalue()
-            compressed_size = len(compressed_data)
-
-            # Обновляем статистику
+        result = self.audio_optimizer.optimize(sound_path)
+        self._add_compression_stats(result)
+        return result[0]
+
+    def _add_compression_stats(self, result: Tuple[bytes, int, bool]):
+        """Учитывает результат оптимизации одного файла в статистике"""
+        data, original_size, optimized = result
+        if optimized:
             self.compression_stats['original_size'] += original_size
-            self.compression_stats['compressed_size'] += compressed_size
+            self.compression_stats['compressed_size'] += len(data)
             self.compression_stats['sounds_optimized'] += 1
 
-            compression_ratio = (original_size - compressed_size) / original_size * 100
-            print(
-                f"    ✅ {sound_path.name}: {original_size / 1024:.1f}KB → {compressed_size / 1024:.1f}KB ({compression_ratio:+.1f}%)")
-
-            return compressed_data
-
-        except Exception as e:
-            print(f"    ❌ Ошибка pydub оптимизации: {e}")
-            import traceback
-            traceback.print_exc()
-            # Возвращаем оригинальный файл
-            with open(sound_path, 'rb') as f:
-                return f.read()
-
-    def _remove_silence(self, audio, silence_thresh=-40.0):
-        """Обрезает тишину в начале и конце"""
-        try:
-            print(f"    🔇 Поиск тишины...")
-            non_silent = audio.detect_silence(
-                silence_thresh=silence_thresh,
-                min_silence_len=100,
-                seek_step=10
-            )
-
-            if not non_silent:
-                print(f"    🔇 Тишина не найдена")
-                return audio
-
-            start = max(0, non_silent[0][0] - 50)
-            end = min(len(audio), non_silent[-1][1] + 100)
-
-            print(f"    ✂️  Обрезка: {len(audio)}ms → {end - start}ms")
-            return audio[start:end]
-        except Exception as e:
-            print(f"    ⚠️ Ошибка обрезки тишины: {e}")
-            return audio
+    def iter_optimized_sounds(self, sound_files: List[Path]) -> Iterator[Tuple[Path, bytes]]:
+        """
+        Оптимизирует звуки параллельно в пуле процессов и отдает (файл, данные) по одному в порядке файлов.
+        Неизмененные файлы читаются из кэша сборки в момент выдачи, поэтому в памяти
+        держатся только результаты, пришедшие раньше своей очереди.
+        Статистика собирается в порядке файлов и не зависит от порядка завершения задач
+        """
+        cache_keys = {}
+        cached_paths = {}
+        pending = []
+        for sound_file in sound_files:
+            if self.sound_cache:
+                cache_keys[sound_file] = self.sound_cache.make_key(sound_file)
+                cached_paths[sound_file] = self.sound_cache.lookup(cache_keys[sound_file])
+                if cached_paths[sound_file]:
+                    continue
+            pending.append(sound_file)
+
+        if self.sound_cache:
+            print(f"📦 Кэш сборки: {len(sound_files) - len(pending)} звуков готово, {len(pending)} к оптимизации")
+
+        workers = min(self.workers, len(pending))
+        if workers <= 1 or not self.audio_optimizer.is_available():
+            yield from self._collect_optimized(sound_files, cache_keys, cached_paths, pending,
+                                               map(self.audio_optimizer.optimize, pending))
+        else:
+            print(f"⚡ Оптимизация {len(pending)} звуков в {workers} процессах...")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                yield from self._collect_optimized(sound_files, cache_keys, cached_paths, pending,
+                                                   executor.map(self.audio_optimizer.optimize, pending))
+
+    def _collect_optimized(self, sound_files: List[Path], cache_keys: Dict[Path, str],
+                           cached_paths: Dict[Path, Path], pending: List[Path],
+                           pending_results: Iterator[Tuple[bytes, int, bool]]) -> Iterator[Tuple[Path, bytes]]:
+        """Сводит звуки из кэша и результаты оптимизации (в порядке pending) в один поток в порядке файлов"""
+        pending_results = iter(pending_results)
+        pending_files = set(pending)
+        for sound_file in sound_files:
+            from_cache = False
+            if sound_file in pending_files:
+                result = next(pending_results)
+            else:
+                cached_data = self.sound_cache.read(cached_paths[sound_file])
+                if cached_data is not None:
+                    result = (cached_data, sound_file.stat().st_size, True)
+                    from_cache = True
+                else:
+                    # Запись пропала из кэша после проверки - оптимизируем здесь
+                    result = self.audio_optimizer.optimize(sound_file)
 
-    def _normalize_volume(self, audio, target_dBFS=-16.0):
-        """Нормализует громкость"""
-        try:
-            current_dBFS = audio.dBFS
-            change_in_dBFS = target_dBFS - current_dBFS
-            print(f"    🔊 Нормализация: {current_dBFS:.1f}dBFS → {target_dBFS:.1f}dBFS")
-            return audio.apply_gain(change_in_dBFS)
-        except Exception as e:
-            print(f"    ⚠️ Ошибка нормализации громкости: {e}")
-            return audio
+            self._add_compression_stats(result)
+            # В кэш попадают только успешно оптимизированные звуки
+            if self.sound_cache and result[2] and not from_cache:
+                self.sound_cache.put(cache_keys[sound_file], result[0])
+            yield sound_file, result[0]
 
     def find_sound_files_for_chord(self, chord_name: str) -> List[Path]:
         """Находит звуковые файлы для аккорда"""
@@ -342,8 +494,12 @@ class StandaloneChordConverter:
         base_name = re.sub(r'\d+$', '', chord_name)
         return self.get_safe_chord_name(base_name)
 
-    def process_all_chords(self):
-        """Обрабатывает все аккорды из конфигурации"""
+    def process_all_chords(self, writer: AssetPackWriter):
+        """
+        Обрабатывает все аккорды из конфигурации.
+        Каждый оптимизированный звук сразу дописывается в пакет writer,
+        в converted_data остаются только метаданные и номера блоков
+        """
         if not self.config:
             print("❌ Конфигурация не загружена")
             return
@@ -351,6 +507,21 @@ class StandaloneChordConverter:
         chords_data = self.config.get('chords', {})
         print(f"🔧 Обработка {len(chords_data)} аккордов...")
 
+        # Сначала ищем звуки всех аккордов, чтобы оптимизировать их одним пулом
+        chord_sound_files = {}
+        all_sound_files = []
+        for chord_key, chord_data in chords_data.items():
+            base_info = chord_data.get('base_info', {})
+            chord_name = base_info.get('base_chord', chord_key)
+            chord_sound_files[chord_key] = self.find_sound_files_for_chord(chord_name)
+            for sound_file in chord_sound_files[chord_key]:
+                if sound_file not in all_sound_files:
+                    all_sound_files.append(sound_file)
+
+        sound_blobs = {}
+        for sound_file, sound_data in self.iter_optimized_sounds(all_sound_files):
+            sound_blobs[sound_file] = writer.add_blob(sound_data)
+
         for chord_key, chord_data in chords_data.items():
             print(f"  🎵 {chord_key}")
 
@@ -359,17 +530,12 @@ class StandaloneChordConverter:
             chord_name = base_info.get('base_chord', chord_key)
             group_name = chord_data.get('group', 'unknown')
 
-            # Ищем звуковые файлы
-            sound_files = self.find_sound_files_for_chord(chord_name)
+            sound_files = chord_sound_files[chord_key]
             variants = []
 
             # Создаем варианты аккорда
             for i, sound_file in enumerate(sound_files, 1):
-                print(f"    🎵 Обработка варианта {i}: {sound_file.name}")
-
-                # Оптимизируем звук
-                sound_data = self.optimize_audio_file(sound_file)
-                sound_b64 = base64.b64encode(sound_data).decode() if sound_data else None
+                print(f"    🎵 Вариант {i}: {sound_file.name}")
 
                 # Создаем вариант с JSON параметрами
                 variant = {
@@ -381,7 +547,8 @@ class StandaloneChordConverter:
                         'elements_notes': chord_data.get('elements_notes', []),
                         'display_settings': chord_data.get('display_settings', {})
                     },
-                    'sound_data': sound_b64
+                    # Звук уже записан в пакет
+                    'sound_blob': sound_blobs[sound_file]
                 }
                 variants.append(variant)
 
@@ -396,7 +563,7 @@ class StandaloneChordConverter:
                         'elements_notes': chord_data.get('elements_notes', []),
                         'display_settings': chord_data.get('display_settings', {})
                     },
-                    'sound_data': None
+                    'sound_blob': None
                 })
 
             # Сохраняем аккорд
@@ -410,164 +577,62 @@ class StandaloneChordConverter:
 
             # Обновляем статистику
             self.compression_stats['chords_processed'] += 1
-            if any(v['sound_data'] for v in variants):
+            if any(v['sound_blob'] is not None for v in variants):
                 self.compression_stats['chords_with_sound'] += 1
             else:
                 self.compression_stats['chords_without_sound'] += 1
 
             print(f"    ✅ {len(variants)} вариантов")
 
-    def save_as_python_file(self, output_path: str = "chords_data.py"):
-        """Сохраняет все данные в один Python файл"""
-        print(f"💾 Сохранение в {output_path}...")
+    def _build_metadata(self) -> Dict:
+        """Метаданные пакета с итоговой статистикой"""
+        metadata = self.converted_data['metadata'].copy()
+        metadata.update({
+            'total_chords': len(self.converted_data['chords']),
+            'chords_with_sound': self.compression_stats['chords_with_sound'],
+            'chords_without_sound': self.compression_stats['chords_without_sound'],
+            'sounds_optimized': self.compression_stats['sounds_optimized'],
+            'compression_ratio': f"{(self.compression_stats['original_size'] - self.compression_stats['compressed_size']) / self.compression_stats['original_size'] * 100:.1f}%" if
+            self.compression_stats['original_size'] > 0 else "0%"
+        })
+        return metadata
+
+    def build_asset_pack(self, output_path: str = "chords_data.pack"):
+        """
+        Собирает бинарный пакет ресурсов (сырые байты без base64).
+        Шаблон и звуки пишутся в пакет по мере готовности, индекс - в конце
+        """
+        if not self.config:
+            print("❌ Конфигурация не загружена")
+            return
+
+        print(f"💾 Сборка {output_path}...")
 
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            # Заголовок файла
-            f.write('''"""
-АВТОНОМНЫЕ ДАННЫЕ АККОРДОВ
-Генератор: StandaloneChordConverter
-ВСЕ данные для работы приложения в одном файле
-"""
-
-import base64
-import json
-from typing import Dict, List, Optional
-
-# Основные данные аккордов
-CHORDS_DATA = {
-''')
-
-            # Метаданные
-            f.write('    "metadata": {\n')
-            metadata = self.converted_data['metadata'].copy()
-            metadata.update({
-                'total_chords': len(self.converted_data['chords']),
-                'chords_with_sound': self.compression_stats['chords_with_sound'],
-                'chords_without_sound': self.compression_stats['chords_without_sound'],
-                'sounds_optimized': self.compression_stats['sounds_optimized'],
-                'compression_ratio': f"{(self.compression_stats['original_size'] - self.compression_stats['compressed_size']) / self.compression_stats['original_size'] * 100:.1f}%" if
-                self.compression_stats['original_size'] > 0 else "0%"
-            })
-
-            for key, value in metadata.items():
-                if isinstance(value, str):
-                    f.write(f'        "{key}": "{value}",\n')
-                else:
-                    f.write(f'        "{key}": {value},\n')
-            f.write('    },\n')
-
-            # Шаблон изображения
-            f.write('    "template_image": """\\\n')
+        writer = AssetPackWriter(str(output_file))
+        try:
+            template_blob = None
             if self.converted_data['template_image']:
-                f.write(self.converted_data['template_image'])
-            f.write('""",\n\n')
-
-            # Оригинальная JSON конфигурация
-            f.write('    "original_json_config": ')
-            json_str = json.dumps(self.converted_data['original_json_config'],
-                                  ensure_ascii=False, indent=4)
-            # Заменяем null на None для Python
-            json_str = json_str.replace(': null', ': None')
-            f.write(json_str)
-            f.write(',\n\n')
-
-            # Данные аккордов
-            f.write('    "chords": {\n')
-
-            for i, (chord_name, chord_data) in enumerate(self.converted_data['chords'].items()):
-                f.write(f'        "{chord_name}": {{\n')
-                f.write(f'            "name": "{chord_data["name"]}",\n')
-                f.write(f'            "group": "{chord_data["group"]}",\n')
-                f.write(f'            "description": "{chord_data["description"]}",\n')
-                f.write(f'            "type": "{chord_data["type"]}",\n')
-                f.write(f'            "variants": [\n')
-
-                for variant in chord_data['variants']:
-                    f.write('                {\n')
-                    f.write(f'                    "position": {variant["position"]},\n')
-                    f.write(f'                    "description": "{variant["description"]}",\n')
-
-                    # JSON параметры
-                    f.write('                    "json_parameters": {\n')
-                    params = variant['json_parameters']
-                    f.write(f'                        "crop_rect": {json.dumps(params["crop_rect"])},\n')
-                    f.write(
-                        f'                        "elements_fingers": {json.dumps(params["elements_fingers"], ensure_ascii=False)},\n')
-                    f.write(
-                        f'                        "elements_notes": {json.dumps(params["elements_notes"], ensure_ascii=False)},\n')
-                    f.write(f'                        "display_settings": {json.dumps(params["display_settings"])}\n')
-                    f.write('                    },\n')
-
-                    # Звуковые данные
-                    if variant['sound_data']:
-                        f.write(f'                    "sound_data": """{variant["sound_data"]}"""\n')
-                    else:
-                        f.write(f'                    "sound_data": None\n')
-
-                    f.write('                },\n')
-
-                f.write('            ]\n')
-                f.write('        }')
-
-                # Запятая для всех кроме последнего
-                if i < len(self.converted_data['chords']) - 1:
-                    f.write(',')
-                f.write('\n')
-
-            f.write('    }\n')
-            f.write('}\n\n')
-
-            # Вспомогательные функции для загрузки данных
-            f.write('''
-def get_template_image() -> bytes:
-    """Возвращает шаблон изображения как bytes"""
-    if CHORDS_DATA["template_image"]:
-        return base64.b64decode(CHORDS_DATA["template_image"])
-    return None
-
-def get_chord_config(chord_name: str) -> Optional[Dict]:
-    """Возвращает конфигурацию аккорда по имени"""
-    return CHORDS_DATA["chords"].get(chord_name)
-
-def get_all_chords() -> List[str]:
-    """Возвращает список всех доступных аккордов"""
-    return list(CHORDS_DATA["chords"].keys())
-
-def get_chord_sound(chord_name: str, variant: int = 1) -> Optional[bytes]:
-    """Возвращает звук аккорда для указанного варианта"""
-    chord_data = CHORDS_DATA["chords"].get(chord_name)
-    if not chord_data:
-        return None
-
-    for variant_data in chord_data['variants']:
-        if variant_data['position'] == variant and variant_data['sound_data']:
-            return base64.b64decode(variant_data['sound_data'])
+                template_blob = writer.add_blob(self.converted_data['template_image'])
+                # Шаблон уже в пакете, его размер остается в метаданных
+                self.converted_data['template_image'] = None
 
-    return None
-
-def get_original_config() -> Dict:
-    """Возвращает оригинальную JSON конфигурацию"""
-    return CHORDS_DATA["original_json_config"]
+            self.process_all_chords(writer)
 
-def get_metadata() -> Dict:
-    """Возвращает метаданные"""
-    return CHORDS_DATA["metadata"]
+            writer.finish({
+                'metadata': self._build_metadata(),
+                'template_image': template_blob,
+                'original_json_config': self.converted_data['original_json_config'],
+                'chords': self.converted_data['chords']
+            })
+        except BaseException:
+            # В том числе Ctrl-C: удаляется только временный файл, прежний пакет цел
+            writer.abort()
+            raise
 
-if __name__ == "__main__":
-    print("📊 Статистика данных аккордов:")
-    metadata = get_metadata()
-    print(f"🎸 Аккордов: {len(get_all_chords())}")
-    print(f"🖼️  Размер шаблона: {metadata.get('template_size', 0) / 1024:.1f} KB")
-    print(f"🔊 Звуков: {metadata.get('sounds_optimized', 0)}")
-    print(f"⚙️  FFmpeg: {'✅ настроен' if metadata.get('ffmpeg_configured') else '❌ не настроен'}")
-    print(f"🔧 pydub: {'✅ доступен' if metadata.get('pydub_available') else '❌ не доступен'}")
-    print(f"📦 Версия: {metadata.get('converter_version', 'unknown')}")
-''')
-
-        print(f"✅ Файл сохранен: {output_file}")
+        print(f"✅ Файл сохранен: {output_file} ({output_file.stat().st_size / 1024 / 1024:.2f} MB)")
 
     def print_statistics(self):
         """Выводит подробную статистику"""
@@ -577,9 +642,13 @@ if __name__ == "__main__":
         print(f"   🔇 Без звука: {self.compression_stats['chords_without_sound']}")
         print(f"   ⚙️  FFmpeg: {'✅ настроен' if HAS_FFMPEG else '❌ не настроен'}")
         print(f"   🔧 pydub: {'✅ доступен' if HAS_PYDUB else '❌ не доступен'}")
+        print(f"   🔢 Оптимизация звуков: {self.audio_optimizer.params['optimizer']}")
+        if self.sound_cache:
+            cache_stats = self.sound_cache.get_stats()
+            print(f"   📦 Кэш сборки: {cache_stats['hits']} из кэша, {cache_stats['misses']} оптимизировано")
 
-        if self.converted_data['template_image']:
-            template_size = len(base64.b64decode(self.converted_data['template_image']))
+        template_size = self.converted_data['metadata']['template_size']
+        if template_size:
             print(f"   🖼️  Шаблон изображения: {template_size / 1024:.1f} KB")
 
         if self.compression_stats['sounds_optimized'] > 0:
@@ -630,13 +699,28 @@ def find_sounds_directory() -> Optional[Path]:
     return None
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Упаковка данных аккордов в файл ресурсов")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="количество процессов для оптимизации звуков (по умолчанию - число ядер)")
+    parser.add_argument("--cache-dir", default=".converter_cache",
+                        help="папка кэша оптимизированных звуков")
+    parser.add_argument("--no-cache", action="store_true", help="оптимизировать все звуки заново")
+    parser.add_argument("--optimizer", choices=OPTIMIZERS, default="numpy",
+                        help="способ оптимизации звуков (по умолчанию - векторная цепочка NumPy)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Основная функция конвертера"""
+    args = parse_args(argv)
+
     print("🎸 STANDALONE CHORD CONVERTER")
     print("=" * 50)
-    print("Упаковывает ВСЕ данные аккордов в один Python файл")
+    print("Упаковывает ВСЕ данные аккордов в один файл ресурсов")
     print(f"⚙️  FFmpeg: {'✅ настроен' if HAS_FFMPEG else '❌ не настроен'}")
     print(f"🔧 pydub: {'✅ доступен' if HAS_PYDUB else '❌ не доступен'}")
+    print(f"🔢 numpy: {'✅ доступен' if HAS_NUMPY else '❌ не доступен'}")
 
     # Автопоиск файлов
     config_path = find_config_file()
@@ -646,12 +730,13 @@ def main():
     sounds_dir = find_sounds_directory()
 
     # Создаем и запускаем конвертер
-    converter = StandaloneChordConverter(config_path, sounds_dir)
-    converter.process_all_chords()
-    converter.save_as_python_file("chords_data.py")
+    converter = StandaloneChordConverter(config_path, sounds_dir, workers=args.workers,
+                                         cache_dir=None if args.no_cache else args.cache_dir,
+                                         optimizer=args.optimizer)
+    converter.build_asset_pack("chords_data.pack")
     converter.print_statistics()
 
-    print(f"\n✅ ГОТОВО! Все данные сохранены в chords_data.py")
+    print(f"\n✅ ГОТОВО! Все данные сохранены в chords_data.pack")
     print("💡 Теперь приложение может работать полностью автономно!")
 
 
@@ -0,0 +1,65 @@
+"""
+Профилирование запуска приложения: время по фазам от старта процесса до первого аккорда.
+Включается переменной окружения CHORDS_STARTUP_PROFILE=1 или флагом --profile-startup
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupTimeline:
+    """
+    Хронология запуска: фазы с длительностью и отметки времени от старта.
+    В выключенном состоянии ничего не измеряет и не печатает
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start_time = time.perf_counter()
+        self.entries = []  # (название, время от старта, длительность или None)
+        self._marks = set()
+        self._reported = False
+
+    @contextmanager
+    def phase(self, name):
+        """Измеряет длительность фазы"""
+        if not self.enabled:
+            yield
+            return
+
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phase_end = time.perf_counter()
+            self.entries.append((name, phase_end - self.start_time, phase_end - phase_start))
+
+    def mark(self, name):
+        """Отметка момента запуска (учитывается только первая с таким названием)"""
+        if not self.enabled or name in self._marks:
+            return
+        self._marks.add(name)
+        self.entries.append((name, time.perf_counter() - self.start_time, None))
+
+    def report(self):
+        """Печатает хронологию запуска один раз"""
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+
+        print("⏱️  ХРОНОЛОГИЯ ЗАПУСКА:")
+        for name, elapsed, duration in self.entries:
+            if duration is None:
+                print(f"   {elapsed * 1000:8.1f} ms  ● {name}")
+            else:
+                print(f"   {elapsed * 1000:8.1f} ms  {name}: {duration * 1000:.1f} ms")
+
+
+def _profiling_requested():
+    return os.environ.get("CHORDS_STARTUP_PROFILE") == "1" or "--profile-startup" in sys.argv
+
+
+# Общая хронология процесса, создается при первом импорте
+startup_timeline = StartupTimeline(_profiling_requested())
@@ -0,0 +1,124 @@
+"""
+Пирамида шаблона аккордов.
+
+Шаблон (source/img.png) один раз уменьшается до уровней 70/50/30%, а для каждой
+области RAM из templates['crop_rects'] заранее вырезаются фоны всех масштабов.
+Отрисовка аккорда начинается с готового фона нужного размера.
+
+Пирамида хранит только QImage, поэтому ее можно строить в фоновом потоке загрузки.
+"""
+
+from PyQt5.QtCore import Qt, QSize
+
+from size_bounded_cache import SizeBoundedLRUCache, pixmap_size_in_bytes
+
+PYRAMID_SCALES = (0.7, 0.5, 0.3)
+TILE_CACHE_MAX_BYTES = 128 * 1024 * 1024  # заранее вырезанные фоны 9 областей RAM занимают около 60 МБ
+
+# Доля от размера области для масштабов small2, medium1, medium2
+SCALE_FACTORS = {
+    "small2": 0.3,
+    "medium1": 0.5,
+    "medium2": 0.7
+}
+SCALE_TYPES = ("small1", "small2", "medium1", "medium2", "original")
+
+
+def clamp_crop_rect(crop_rect, width, height):
+    """Область обрезки (x, y, ширина, высота) в границах шаблона width x height"""
+    crop_x, crop_y, crop_width, crop_height = crop_rect
+    crop_x = max(0, min(crop_x, width - 1))
+    crop_y = max(0, min(crop_y, height - 1))
+    crop_width = max(1, min(crop_width, width - crop_x))
+    crop_height = max(1, min(crop_height, height - crop_y))
+    return crop_x, crop_y, crop_width, crop_height
+
+
+def get_target_size(width, height, scale_type, fit_size=None):
+    """
+    Итоговый размер изображения width x height для масштаба:
+    small1 - не шире 400 (или вписать в fit_size), small2/medium1/medium2 - 30/50/70%
+    """
+    if scale_type == "small1":
+        if fit_size:
+            display_width, display_height = fit_size
+        else:
+            display_width = min(400, width)
+            scale_factor = display_width / width
+            display_height = int(height * scale_factor)
+    elif scale_type in SCALE_FACTORS:
+        scale_factor = SCALE_FACTORS[scale_type]
+        display_width = int(width * scale_factor)
+        display_height = int(height * scale_factor)
+    else:
+        return width, height
+
+    # Сохраняем пропорции так же, как QPixmap.scaled с Qt.KeepAspectRatio
+    size = QSize(width, height).scaled(display_width, display_height, Qt.KeepAspectRatio)
+    return max(1, size.width()), max(1, size.height())
+
+
+class TemplatePyramid:
+    """Уменьшенные уровни шаблона и готовые фоны областей обрезки"""
+
+    def __init__(self, image):
+        self.image = image  # шаблон 100%
+        self.levels = {1.0: image}  # масштаб -> QImage
+        self.tiles = SizeBoundedLRUCache(TILE_CACHE_MAX_BYTES, pixmap_size_in_bytes)
+
+    def build(self, crop_rects, scale_types=SCALE_TYPES):
+        """Строит уровни пирамиды и фоны областей crop_rects для всех масштабов scale_types"""
+        for scale in PYRAMID_SCALES:
+            self.get_level(scale)
+
+        for crop_rect in crop_rects:
+            crop_rect = clamp_crop_rect(crop_rect, self.image.width(), self.image.height())
+            for scale_type in scale_types:
+                size = get_target_size(crop_rect[2], crop_rect[3], scale_type)
+                if size != crop_rect[2:]:
+                    # Фон 100% рисуется прямо из шаблона и отдельной копии не требует
+                    self.get_tile(crop_rect, size)
+        return self
+
+    def get_level(self, scale):
+        """Шаблон, сглаженно уменьшенный до масштаба scale"""
+        level = self.levels.get(scale)
+        if level is None:
+            level = self.image.scaled(max(1, round(self.image.width() * scale)),
+                                      max(1, round(self.image.height() * scale)),
+                                      Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            self.levels[scale] = level
+        return level
+
+    def get_tile(self, crop_rect, size):
+        """Фон области crop_rect шаблона, уменьшенный до size (ширина, высота)"""
+        key = (tuple(crop_rect), tuple(size))
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self._make_tile(crop_rect, size)
+            self.tiles.put(key, tile)
+        return tile
+
+    def _make_tile(self, crop_rect, size):
+        crop_x, crop_y, crop_width, crop_height = crop_rect
+        tile_width, tile_height = size
+        scale = tile_width / crop_width
+
+        # Ближайший уровень не мельче нужного масштаба (для увеличения - сам шаблон)
+        level_scale = min((level_scale for level_scale in self.levels if level_scale >= scale), default=1.0)
+        level = self.levels[level_scale]
+
+        if level_scale == scale:
+            return level.copy(round(crop_x * scale), round(crop_y * scale), tile_width, tile_height)
+
+        source = level.copy(round(crop_x * level_scale), round(crop_y * level_scale),
+                            max(1, round(crop_width * level_scale)), max(1, round(crop_height * level_scale)))
+        return source.scaled(tile_width, tile_height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+    def get_stats(self):
+        """Статистика пирамиды"""
+        return {
+            'levels': sorted(self.levels),
+            'tiles': len(self.tiles),
+            'tile_bytes': self.tiles.total_bytes
+        }
@@ -0,0 +1,147 @@
+"""
+Попиксельное сравнение послойной отрисовки аккордов с отрисовкой до нее.
+
+Эталоны в tests/data/layered_render нарисованы деревом 0531493 (последний коммит
+с двухпроходной отрисовкой: все элементы через draw_elements_on_canvas, затем баре
+и ноты еще раз поверх). Шаблон заменен белым изображением того же размера,
+поэтому в эталонах только элементы аккорда.
+
+Допуск. Двухпроходная отрисовка накладывала сглаженный край каждой фигуры дважды:
+край с покрытием a получал непрозрачность 1 - (1 - a)^2 вместо a. Разница
+a * (1 - a) * контраст не превышает контраст / 4, то есть 64 уровня на канал.
+Поэтому:
+    - расхождение на канал не больше 64;
+    - расхождения больше 1 только на краях фигур (контраст с соседним пикселем от 32);
+      внутри фигур допускается 1 уровень округления градиентов;
+    - расходится не больше 0.25% пикселей.
+
+Пересоздание эталонов из другого дерева:
+    python tests/test_layered_render.py <корень дерева> tests/data/layered_render
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QGuiApplication, QImage, QPixmap
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REFERENCE_DIR = os.path.join(REPO_ROOT, "tests", "data", "layered_render")
+
+# A1 - только лады и ноты, A2 - с баре
+CHORDS = [("A", 1), ("A", 2)]
+DISPLAY_TYPES = ("fingers", "notes")
+OUTLINES = ("none", "thick")
+
+MAX_CHANNEL_DELTA = 64
+EDGE_CONTRAST = 32
+MAX_DIFF_FRACTION = 0.0025
+
+_app = None
+
+
+def reference_name(chord, variant, display_type, outline):
+    return f"{chord}{variant}_{display_type}_{outline}.png"
+
+
+def render_references(root, output_dir):
+    """Рисует все случаи теста рендерером дерева root на белом шаблоне"""
+    global _app
+    _app = QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+    os.chdir(root)
+    sys.path.insert(0, root)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from chord_config_manager import ChordConfigManager
+        from chord_renderer import ChordRenderer
+
+        config_manager = ChordConfigManager()
+        if not config_manager.load_config_data():
+            raise RuntimeError("Не удалось загрузить конфигурацию аккордов")
+
+        template = QPixmap(config_manager.image_path)
+        white = QPixmap(template.size())
+        white.fill(Qt.white)
+        renderer = ChordRenderer(config_manager, white)
+
+        images = {}
+        for chord_config in config_manager.chord_data:
+            key = (chord_config.get('CHORD'), chord_config.get('VARIANT'))
+            if key not in CHORDS:
+                continue
+            for display_type in DISPLAY_TYPES:
+                for outline in OUTLINES:
+                    pixmap = renderer.render_chord(chord_config, display_type=display_type, fret_type="roman",
+                                                   barre_outline=outline, note_outline=outline,
+                                                   scale_type="original")
+                    images[reference_name(*key, display_type, outline)] = pixmap.toImage()
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        for name, image in images.items():
+            image.save(os.path.join(output_dir, name))
+    return images
+
+
+def image_to_array(image):
+    image = image.convertToFormat(QImage.Format_ARGB32)
+    bits = image.constBits()
+    bits.setsize(image.byteCount())
+    rows = np.frombuffer(bits, np.uint8).reshape(image.height(), image.bytesPerLine())
+    return rows[:, :image.width() * 4].reshape(image.height(), image.width(), 4).astype(np.int16)
+
+
+def neighbor_contrast(pixels):
+    """Наибольшая разница канала с соседями 3x3 для каждого пикселя"""
+    height, width = pixels.shape[:2]
+    padded = np.pad(pixels, ((1, 1), (1, 1), (0, 0)), mode='edge')
+    contrast = np.zeros((height, width), np.int16)
+    for dy in range(3):
+        for dx in range(3):
+            shifted = padded[dy:dy + height, dx:dx + width]
+            contrast = np.maximum(contrast, np.abs(shifted - pixels).max(axis=2))
+    return contrast
+
+
+@pytest.fixture(scope="module")
+def rendered():
+    cwd = os.getcwd()
+    try:
+        return render_references(REPO_ROOT, None)
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.mark.parametrize("name", [reference_name(chord, variant, display_type, outline)
+                                  for chord, variant in CHORDS
+                                  for display_type in DISPLAY_TYPES
+                                  for outline in OUTLINES])
+def test_layered_render_matches_two_pass(rendered, name):
+    reference = QImage(os.path.join(REFERENCE_DIR, name))
+    assert not reference.isNull(), f"нет эталона {name}"
+    assert name in rendered, f"аккорд для {name} не найден в конфигурации"
+
+    expected = image_to_array(reference)
+    actual = image_to_array(rendered[name])
+    assert actual.shape == expected.shape
+
+    delta = np.abs(actual - expected).max(axis=2)
+    assert delta.max() <= MAX_CHANNEL_DELTA
+
+    edges = np.minimum(neighbor_contrast(expected), neighbor_contrast(actual)) >= EDGE_CONTRAST
+    assert not ((delta > 1) & ~edges).any(), "расхождения вне краев фигур"
+
+    assert (delta > 0).mean() <= MAX_DIFF_FRACTION
+
+
+if __name__ == "__main__":
+    render_references(os.path.abspath(sys.argv[1]), os.path.abspath(sys.argv[2]))
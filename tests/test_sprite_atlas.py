@@ -0,0 +1,115 @@
+"""
+Переполнение атласа спрайтов.
+
+Спрайты ссылаются на страницы атласа по индексу, поэтому атлас не должен
+очищаться, пока отрисовка (или prebuild) держит полученные спрайты.
+Маленькие страницы и max_pages=1 заставляют атлас переполняться на каждом аккорде.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtGui import QGuiApplication, QPixmap
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from sprite_atlas import SpriteAtlas  # noqa: E402
+
+SMALL_PAGE_SIZE = 32  # меньше большинства спрайтов: почти каждый получает свою страницу
+NOTE_RADII = (6, 8, 10, 12, 14)
+
+_app = QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+
+
+def note_data(radius):
+    return {'style': 'red_3d', 'radius': radius, 'finger': '1'}
+
+
+def assert_sprites_valid(atlas):
+    for sprite in atlas.sprites.values():
+        assert sprite.page < len(atlas.pages)
+        page = atlas.pages[sprite.page]
+        assert page.rect().contains(sprite.rect)
+        center = sprite.rect.topLeft() + sprite.rect.bottomRight()
+        assert page.pixelColor(center.x() // 2, center.y() // 2).alpha() > 0, "спрайт на чужой странице"
+
+
+@pytest.fixture(scope="module")
+def chord_setup():
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from chord_config_manager import ChordConfigManager
+            from chord_renderer import ChordRenderer
+
+            config_manager = ChordConfigManager()
+            assert config_manager.load_config_data()
+            renderer = ChordRenderer(config_manager)
+            renderer.set_template(QPixmap(config_manager.image_path))
+        chords = [chord for chord in config_manager.chord_data
+                  if (chord.get('CHORD'), chord.get('VARIANT')) in (("A", 1), ("A", 2))]
+        assert len(chords) == 2
+        yield renderer, chords
+    finally:
+        os.chdir(cwd)
+
+
+def render(renderer, chord_config, atlas):
+    renderer.sprite_atlas = atlas
+    with contextlib.redirect_stdout(io.StringIO()):
+        return renderer.render_chord(chord_config, display_type="fingers", fret_type="roman",
+                                     barre_outline="thick", note_outline="thick",
+                                     scale_type="original").toImage()
+
+
+def test_overflow_keeps_sprites_until_eviction():
+    atlas = SpriteAtlas(page_size=SMALL_PAGE_SIZE, max_pages=1)
+    sprites = [atlas.get_note_sprite(note_data(radius)) for radius in NOTE_RADII]
+
+    assert len(atlas.pages) > atlas.max_pages
+    assert list(atlas.sprites.values()) == sprites
+    assert_sprites_valid(atlas)
+
+    atlas.evict_if_full()
+    assert atlas.pages == [] and not atlas.sprites
+
+
+def test_evict_if_full_keeps_atlas_within_limit():
+    atlas = SpriteAtlas(page_size=256, max_pages=1)
+    atlas.get_note_sprite(note_data(10))
+    atlas.evict_if_full()
+    assert len(atlas.pages) == 1 and len(atlas.sprites) == 1
+
+
+def test_prebuild_overflow_keeps_built_sprites():
+    atlas = SpriteAtlas(page_size=SMALL_PAGE_SIZE, max_pages=1)
+    scales = (1.0, 1.5, 2.0)
+    atlas.prebuild([('note', note_data(radius)) for radius in NOTE_RADII], scales)
+
+    assert len(atlas.sprites) == len(NOTE_RADII) * len(scales)
+    assert_sprites_valid(atlas)
+
+
+def test_render_with_overflowing_atlas_matches_default(chord_setup):
+    renderer, chords = chord_setup
+    for chord_config in chords:
+        expected = render(renderer, chord_config, SpriteAtlas())
+
+        small_atlas = SpriteAtlas(page_size=SMALL_PAGE_SIZE, max_pages=1)
+        first = render(renderer, chord_config, small_atlas)
+        assert len(small_atlas.pages) > small_atlas.max_pages
+        # Повторная отрисовка начинается с очистки переполненного атласа
+        second = render(renderer, chord_config, small_atlas)
+
+        assert first == expected
+        assert second == expected
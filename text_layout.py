@@ -0,0 +1,113 @@
+"""
+Кэш раскладки текста нот и ладов.
+
+Шрифт, замеры QFontMetrics и QStaticText считаются один раз на сочетание
+шрифта и символа, повторная отрисовка тех же пальцев и названий нот
+обходится без измерений текста.
+"""
+
+from PyQt5.QtCore import QPointF, Qt
+from PyQt5.QtGui import QFont, QFontMetrics, QStaticText
+
+from size_bounded_cache import SizeBoundedLRUCache
+
+TEXT_LAYOUT_CACHE_MAX_ITEMS = 1024
+NOTE_FONT_FAMILY = "Arial"
+
+
+def apply_font_style(font, font_style):
+    """Применяет стиль текста ноты (bold, light, italic, bold_italic) к шрифту"""
+    if font_style == 'bold':
+        font.setWeight(QFont.Bold)
+    elif font_style == 'light':
+        font.setWeight(QFont.Light)
+    elif font_style == 'italic':
+        font.setItalic(True)
+    elif font_style == 'bold_italic':
+        font.setWeight(QFont.Bold)
+        font.setItalic(True)
+
+
+class TextLayout:
+    """Готовая раскладка текста: шрифт, подготовленный QStaticText и смещение от центра элемента"""
+
+    __slots__ = ('font', 'static_text', 'offset_x', 'offset_y')
+
+    def __init__(self, font, symbol, baseline_x, baseline_y):
+        """baseline_x, baseline_y - начало базовой линии текста относительно центра элемента"""
+        self.font = font
+        self.static_text = QStaticText(symbol)
+        self.static_text.setTextFormat(Qt.PlainText)
+        self.static_text.prepare(font=font)
+
+        # QStaticText рисуется от левого верхнего угла, а drawText - от базовой линии
+        self.offset_x = baseline_x
+        self.offset_y = baseline_y - QFontMetrics(font).ascent()
+
+    def draw(self, painter, x, y):
+        """Рисует текст с центром в (x, y) текущим пером painter"""
+        painter.setFont(self.font)
+        painter.drawStaticText(QPointF(x + self.offset_x, y + self.offset_y), self.static_text)
+
+
+class TextLayoutCache:
+    """Кэш раскладок текста по параметрам шрифта и символу"""
+
+    def __init__(self, max_items=TEXT_LAYOUT_CACHE_MAX_ITEMS):
+        self.layouts = SizeBoundedLRUCache(max_items, lambda layout: 1)
+
+    def note_layout(self, symbol, radius, font_style='normal'):
+        """
+        Раскладка текста ноты: шрифт по радиусу круга,
+        уменьшенный, если текст не помещается в круг
+        """
+        key = ('note', symbol, radius, font_style)
+        layout = self.layouts.get(key)
+        if layout is not None:
+            return layout
+
+        font = QFont(NOTE_FONT_FAMILY, max(10, radius))
+        apply_font_style(font, font_style)
+
+        font_metrics = QFontMetrics(font)
+        text_width = font_metrics.width(symbol)
+        text_height = font_metrics.height()
+
+        # Если текст слишком большой для круга, уменьшаем шрифт
+        if text_width > radius * 1.8 or text_height > radius * 1.8:
+            font.setPointSize(max(8, radius * 3 // 4))
+            font_metrics = QFontMetrics(font)
+            text_width = font_metrics.width(symbol)
+            text_height = font_metrics.height()
+
+        # Центрируем по горизонтали и вертикали
+        layout = TextLayout(font, symbol, -(text_width // 2), text_height // 4)
+        self.layouts.put(key, layout)
+        return layout
+
+    def fret_layout(self, symbol, font_family, size):
+        """Раскладка символа лада: жирный шрифт заданного размера"""
+        key = ('fret', symbol, font_family, size)
+        layout = self.layouts.get(key)
+        if layout is not None:
+            return layout
+
+        font = QFont(font_family, size, QFont.Bold)
+        font_metrics = QFontMetrics(font)
+
+        # Правильное центрирование по вертикали для ладов - треть высоты строки
+        layout = TextLayout(font, symbol, -(font_metrics.width(symbol) // 2), font_metrics.height() // 3)
+        self.layouts.put(key, layout)
+        return layout
+
+    def clear(self):
+        """Очистка кэша"""
+        self.layouts.clear()
+
+    def get_stats(self):
+        """Статистика кэша"""
+        return self.layouts.get_stats()
+
+
+# Общий кэш процесса
+text_layout_cache = TextLayoutCache()
@@ -1,6 +1,6 @@
 """
 ОБНОВЛЕННОЕ ОСНОВНОЕ ПРИЛОЖЕНИЕ
-Работает с автономными данными из chords_data.py
+Работает с автономными данными из пакета ресурсов chords_data.pack
 """
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
@@ -9,22 +9,36 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QAction)
 from PyQt5.QtCore import Qt, QSize, QRectF
 from PyQt5.QtGui import QPixmap, QPainter, QPen, QBrush, QColor, QFont, QFontMetrics
+import logging
 import os
 import json
 import sys
 from io import BytesIO
 
+from log_config import setup_logging
+
+# Имя логгера не зависит от запуска скриптом (__name__ == "__main__"), чтобы работал CHORDS_LOG_LEVELS=updated_main_app=...
+logger = logging.getLogger("updated_main_app")
+
 # Импортируем наш загрузчик автономных данных
 try:
-    from chords_data_loader import ChordsDataLoader
-    HAS_STANDALONE_DATA = True
+    from chords_data_loader import ChordsDataLoader, HAS_CHORDS_DATA
+    HAS_STANDALONE_DATA = HAS_CHORDS_DATA
 except ImportError:
     HAS_STANDALONE_DATA = False
-    print("⚠️ chords_data_loader не найден")
+    logger.warning("⚠️ chords_data_loader не найден")
 
+from chord_elements import ChordElements
 from drawing_elements import DrawingElements
+from size_bounded_cache import SizeBoundedLRUCache, pixmap_size_in_bytes
+from audio_engine import AudioEngine, SoundBuffer
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtCore import QUrl, QBuffer, QByteArray
+from PyQt5.QtCore import QUrl
+
+# Лимит памяти кэша готовых изображений аккордов
+PIXMAP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Лимит данных звуков, на которые держатся буферы QMediaPlayer
+SOUND_BUFFER_CACHE_MAX_BYTES = 32 * 1024 * 1024
 
 class StandaloneChordSoundPlayer:
     """Плеер звуков для автономных данных"""
@@ -33,36 +47,68 @@ class StandaloneChordSoundPlayer:
         self.chords_loader = chords_loader
         self.media_player = QMediaPlayer()
 
+        # Постоянные буферы QMediaPlayer над данными загрузчика: (аккорд, вариант) -> SoundBuffer
+        self.sound_buffers = SizeBoundedLRUCache(SOUND_BUFFER_CACHE_MAX_BYTES, SoundBuffer.size)
+        self.current_sound_buffer = None
+
+        # Звуки активной группы декодируются заранее и играют из PCM без задержки на загрузку
+        self.audio_engine = AudioEngine()
+        self.audio_engine.decode_failed.connect(lambda key: self._play_with_media_player(*key))
+
     def play_chord_sound(self, chord_name, variant=1):
         """Воспроизведение звука аккорда из автономных данных"""
         try:
-            # Получаем звуковые данные
-            sound_data = self.chords_loader.get_chord_sound_data(chord_name, variant)
-
-            if not sound_data:
-                print(f"❌ Звук не найден для {chord_name}, вариант {variant}")
-                return False
-
-            # Создаем временный буфер для медиаплеера
-            buffer = QBuffer()
-            buffer.setData(sound_data)
-            buffer.open(QBuffer.ReadOnly)
+            key = (chord_name, variant)
+            if not self.audio_engine.is_loaded(key):
+                # Получаем звуковые данные
+                sound_data = self.chords_loader.get_chord_sound_data(chord_name, variant)
 
-            # Создаем медиаконтент из буфера
-            media_content = QMediaContent(QUrl.fromLocalFile(""))  # Создаем пустой URL
-            self.media_player.setMedia(media_content, buffer)
+                if not sound_data:
+                    logger.warning("❌ Звук не найден для %s, вариант %s", chord_name, variant)
+                    return False
 
-            # Останавливаем предыдущее воспроизведение и запускаем новое
-            self.media_player.stop()
-            self.media_player.play()
+                if not self.audio_engine.play(key, sound_data):
+                    return self._play_with_media_player(chord_name, variant)
+            else:
+                self.audio_engine.play(key)
 
-            print(f"🎵 Воспроизводится: {chord_name}, вариант {variant}")
+            logger.debug("🎵 Воспроизводится: %s, вариант %s", chord_name, variant)
             return True
 
         except Exception as e:
-            print(f"❌ Ошибка воспроизведения: {e}")
+            logger.error("❌ Ошибка воспроизведения: %s", e)
             return False
 
+    def _play_with_media_player(self, chord_name, variant):
+        """Воспроизведение через QMediaPlayer, если звук не удалось декодировать заранее"""
+        key = (chord_name, variant)
+        sound_buffer = self.sound_buffers.get(key)
+        if sound_buffer is None:
+            sound_data = self.chords_loader.get_chord_sound_data(chord_name, variant)
+            if not sound_data:
+                return False
+            sound_buffer = SoundBuffer(sound_data)
+            self.sound_buffers.put(key, sound_buffer)
+
+        # Останавливаем предыдущее воспроизведение и запускаем новое
+        self.media_player.stop()
+        if sound_buffer is self.current_sound_buffer:
+            self.media_player.setPosition(0)
+        else:
+            self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile("")), sound_buffer.rewind())
+            # Устройство должно пережить воспроизведение, даже если буфер вытеснен из кэша
+            self.current_sound_buffer = sound_buffer
+        self.media_player.play()
+        return True
+
+    def preload_chords(self, chord_names, variant=1):
+        """Декодирует заранее звуки аккордов (по умолчанию вариант 1 - его играет кнопка)"""
+        self.audio_engine.preload(
+            ((chord_name, variant), self.chords_loader.get_chord_sound_data(chord_name, variant))
+            for chord_name in chord_names
+            if not self.audio_engine.is_loaded((chord_name, variant))
+        )
+
 class StandaloneChordConfigTab(QWidget):
     """Вкладка конфигурации аккордов для автономных данных"""
 
@@ -72,9 +118,9 @@ class StandaloneChordConfigTab(QWidget):
         # Загружаем автономные данные
         try:
             self.chords_loader = ChordsDataLoader()
-            print("✅ Автономные данные загружены")
+            logger.info("✅ Автономные данные загружены")
         except ImportError as e:
-            print(f"❌ Ошибка загрузки автономных данных: {e}")
+            logger.error("❌ Ошибка загрузки автономных данных: %s", e)
             # Здесь можно добавить fallback на старую систему
             return
 
@@ -88,6 +134,9 @@ class StandaloneChordConfigTab(QWidget):
         self.current_chord = None
         self.original_pixmap = None
 
+        # LRU кэш готовых изображений аккордов
+        self.pixmap_cache = SizeBoundedLRUCache(PIXMAP_CACHE_MAX_BYTES, pixmap_size_in_bytes)
+
         # Плеер звуков для автономных данных
         self.sound_player = StandaloneChordSoundPlayer(self.chords_loader)
 
@@ -238,14 +287,15 @@ class StandaloneChordConfigTab(QWidget):
                 self.original_pixmap.loadFromData(template_data)
 
                 if not self.original_pixmap.isNull():
-                    print(f"✅ Шаблон изображения загружен: {self.original_pixmap.width()}x{self.original_pixmap.height()}")
+                    logger.info("✅ Шаблон изображения загружен: %sx%s",
+                                self.original_pixmap.width(), self.original_pixmap.height())
                     self.display_original_image()
                 else:
                     self.image_label.setText("Ошибка загрузки шаблона")
-                    print("❌ Не удалось загрузить шаблон изображения")
+                    logger.warning("❌ Не удалось загрузить шаблон изображения")
             else:
                 self.image_label.setText("Шаблон не найден в автономных данных")
-                print("❌ Шаблон изображения не найден в данных")
+                logger.warning("❌ Шаблон изображения не найден в данных")
 
             # Загружаем группы аккордов
             groups = self.get_chord_groups()
@@ -257,7 +307,7 @@ class StandaloneChordConfigTab(QWidget):
                 self.load_chord_buttons()
             else:
                 self.image_label.setText("Группы аккордов не найдены")
-                print("❌ Группы аккордов не найдены")
+                logger.warning("❌ Группы аккордов не найдены")
 
             # Выводим статистику
             self.chords_loader.print_stats()
@@ -265,9 +315,7 @@ class StandaloneChordConfigTab(QWidget):
         except Exception as e:
             error_msg = f"Ошибка загрузки автономных данных: {str(e)}"
             self.image_label.setText(error_msg)
-            print(f"❌ {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ %s", error_msg)
 
     def get_chord_groups(self):
         """Получение списка групп аккордов из автономных данных"""
@@ -302,7 +350,12 @@ class StandaloneChordConfigTab(QWidget):
 
             # Получаем аккорды для текущей группы
             self.current_chords = self.get_chords_by_group(self.current_group)
-            print(f"🔧 Загружено {len(self.current_chords)} аккордов для группы '{self.current_group}'")
+            logger.info("🔧 Загружено %s аккордов для группы '%s'", len(self.current_chords), self.current_group)
+
+            # Звуки соседних аккордов группы готовим заранее
+            chord_names = [chord_info['name'] for chord_info in self.current_chords]
+            self.chords_loader.prefetch_chords(chord_names)
+            self.sound_player.preload_chords(chord_names)
 
             if not self.current_chords:
                 label = QLabel("Аккорды не найдены")
@@ -336,24 +389,24 @@ class StandaloneChordConfigTab(QWidget):
                     self.chords_layout.addWidget(btn)
 
                 except Exception as e:
-                    print(f"Ошибка при создании кнопки аккорда: {e}")
+                    logger.error("Ошибка при создании кнопки аккорда: %s", e)
                     continue
 
             # Автоматически загружаем первый аккорд группы
             if self.current_chords:
                 self.current_chord = self.current_chords[0]
-                print(f"🎵 Автовыбор первого аккорда: {self.current_chord['name']}")
+                logger.debug("🎵 Автовыбор первого аккорда: %s", self.current_chord['name'])
                 self.display_chord(self.current_chord)
                 self.update_chord_info(self.current_chord)
 
         except Exception as e:
-            print(f"Ошибка при загрузке кнопок аккордов: {e}")
+            logger.error("Ошибка при загрузке кнопок аккордов: %s", e)
             label = QLabel("Ошибка загрузки аккордов")
             self.chords_layout.addWidget(label)
 
     def on_chord_clicked(self, chord_info):
         """Обработчик клика по кнопке аккорда"""
-        print(f"🎯 Выбран аккорд: {chord_info['name']}")
+        logger.debug("🎯 Выбран аккорд: %s", chord_info['name'])
         self.current_chord = chord_info
         self.display_chord(chord_info)
         self.update_chord_info(chord_info)
@@ -371,17 +424,17 @@ class StandaloneChordConfigTab(QWidget):
                 self.chord_info_label.setText(info_text)
 
                 # Включаем кнопку воспроизведения если есть звук
-                has_sound = any(variant.get('sound_data') for variant in chord_data.get('variants', []))
+                has_sound = self.chords_loader.has_chord_sound(chord_name)
                 self.play_sound_btn.setEnabled(has_sound)
 
-                print(f"📋 Информация обновлена: {chord_name}, звук: {'✅' if has_sound else '❌'}")
+                logger.debug("📋 Информация обновлена: %s, звук: %s", chord_name, '✅' if has_sound else '❌')
 
             else:
                 self.chord_info_label.setText("Информация об аккорде недоступна")
                 self.play_sound_btn.setEnabled(False)
 
         except Exception as e:
-            print(f"Ошибка при обновлении информации об аккорде: {e}")
+            logger.error("Ошибка при обновлении информации об аккорде: %s", e)
             self.chord_info_label.setText("Ошибка загрузки информации")
             self.play_sound_btn.setEnabled(False)
 
@@ -408,18 +461,18 @@ class StandaloneChordConfigTab(QWidget):
             self.play_sound_btn.setEnabled(False)
 
             # Воспроизводим звук (вариант 1 по умолчанию)
-            print(f"🔊 Попытка воспроизведения: {chord_name}")
+            logger.debug("🔊 Попытка воспроизведения: %s", chord_name)
             success = self.sound_player.play_chord_sound(chord_name, 1)
 
             if not success:
-                print(f"❌ Не удалось воспроизвести звук для аккорда {chord_name}")
+                logger.warning("❌ Не удалось воспроизвести звук для аккорда %s", chord_name)
 
             # Восстанавливаем кнопку через 0.5 секунды
             from PyQt5.QtCore import QTimer
             QTimer.singleShot(500, self.restore_play_button)
 
         except Exception as e:
-            print(f"❌ Ошибка при воспроизведении звука: {e}")
+            logger.error("❌ Ошибка при воспроизведении звука: %s", e)
             self.restore_play_button()
 
     def restore_play_button(self):
@@ -450,7 +503,7 @@ class StandaloneChordConfigTab(QWidget):
                 Qt.SmoothTransformation
             )
             self.image_label.setPixmap(scaled_pixmap)
-            print(f"🖼️ Оригинальное изображение отображено: {scaled_pixmap.width()}x{scaled_pixmap.height()}")
+            logger.debug("🖼️ Оригинальное изображение отображено: %sx%s", scaled_pixmap.width(), scaled_pixmap.height())
 
     def display_chord(self, chord_info):
         """Отображение выбранного аккорда"""
@@ -469,9 +522,9 @@ class StandaloneChordConfigTab(QWidget):
                 # Берем первый вариант
                 variant_data = variants[0]
                 json_params = variant_data.get('json_parameters', {})
-                print(f"🎨 Получены JSON параметры для {chord_name}: {len(variants)} вариантов")
+                logger.debug("🎨 Получены JSON параметры для %s: %s вариантов", chord_name, len(variants))
             else:
-                print(f"❌ Нет вариантов для аккорда {chord_name}")
+                logger.warning("❌ Нет вариантов для аккорда %s", chord_name)
 
             if not json_params:
                 self.image_label.setText(f"Нет данных для отрисовки аккорда {chord_name}")
@@ -482,28 +535,45 @@ class StandaloneChordConfigTab(QWidget):
 
         except Exception as e:
             self.image_label.setText(f"Ошибка отображения: {str(e)}")
-            print(f"❌ Ошибка при отображении аккорда: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Ошибка при отображении аккорда: %s", e)
+
+    def _pixmap_cache_key(self, chord_name):
+        """Ключ кэша изображения: аккорд и все настройки отображения"""
+        return (
+            chord_name,
+            self.current_display_type,
+            self.current_fret_type,
+            self.current_barre_outline,
+            self.current_note_outline,
+            self.current_scale_type
+        )
 
     def draw_chord_from_json_params(self, json_params, chord_name):
         """Отрисовка аккорда на основе JSON параметров"""
         try:
+            # Повторный показ аккорда с теми же настройками - без перерисовки
+            cache_key = self._pixmap_cache_key(chord_name)
+            cached_pixmap = self.pixmap_cache.get(cache_key)
+            if cached_pixmap is not None:
+                self.image_label.setPixmap(cached_pixmap)
+                logger.debug("⚡ Аккорд %s из кэша: %s", chord_name, self.pixmap_cache.get_stats())
+                return
+
             # Получаем область обрезки
             crop_rect = json_params.get('crop_rect', [])
-            print(f"✂️  Область обрезки: {crop_rect}")
+            logger.debug("✂️  Область обрезки: %s", crop_rect)
 
             # Получаем элементы для отображения в зависимости от типа
             if self.current_display_type == "fingers":
-                elements = json_params.get('elements_fingers', [])
-                print(f"👆 Элементы пальцев: {len(elements)}")
+                elements = ChordElements.from_dicts(json_params.get('elements_fingers', []))
+                logger.debug("👆 Элементы пальцев: %s", len(elements))
             else:
-                elements = json_params.get('elements_notes', [])
-                print(f"🎵 Элементы нот: {len(elements)}")
+                elements = ChordElements.from_dicts(json_params.get('elements_notes', []))
+                logger.debug("🎵 Элементы нот: %s", len(elements))
 
             # Получаем настройки отображения
             display_settings = json_params.get('display_settings', {})
-            print(f"⚙️  Настройки отображения: {display_settings}")
+            logger.debug("⚙️  Настройки отображения: %s", display_settings)
 
             # Если есть область обрезки - обрезаем изображение
             if crop_rect and len(crop_rect) == 4:
@@ -516,32 +586,32 @@ class StandaloneChordConfigTab(QWidget):
 
                     # Создаем обрезанное изображение
                     cropped_pixmap = self.original_pixmap.copy(crop_x, crop_y, crop_width, crop_height)
-                    print(f"✂️  Изображение обрезано: {crop_width}x{crop_height}")
+                    logger.debug("✂️  Изображение обрезано: %sx%s", crop_width, crop_height)
 
-                    # Рисуем элементы на обрезанном изображении
-                    result_pixmap = self.draw_elements_on_pixmap(cropped_pixmap, elements, display_settings)
+                    # Рисуем элементы на обрезанном изображении (координаты шаблона сдвигаем на обрезку)
+                    result_pixmap = self.draw_elements_on_pixmap(cropped_pixmap, elements.translated(-crop_x, -crop_y),
+                                                                 display_settings)
 
                 else:
-                    print(f"❌ Некорректная область обрезки: {crop_rect}")
+                    logger.warning("❌ Некорректная область обрезки: %s", crop_rect)
                     result_pixmap = self.original_pixmap.copy()
             else:
-                print("⚠️ Область обрезки не указана, используем полное изображение")
+                logger.warning("⚠️ Область обрезки не указана, используем полное изображение")
                 result_pixmap = self.original_pixmap.copy()
 
             # Применяем масштабирование
             final_pixmap = self.apply_scale(result_pixmap)
+            self.pixmap_cache.put(cache_key, final_pixmap)
             self.image_label.setPixmap(final_pixmap)
-            print(f"✅ Аккорд {chord_name} отображен: {final_pixmap.width()}x{final_pixmap.height()}")
+            logger.debug("✅ Аккорд %s отображен: %sx%s", chord_name, final_pixmap.width(), final_pixmap.height())
 
         except Exception as e:
-            print(f"❌ Ошибка отрисовки аккорда: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Ошибка отрисовки аккорда: %s", e)
             # Показываем оригинальное изображение в случае ошибки
             self.display_original_image()
 
     def draw_elements_on_pixmap(self, pixmap, elements, display_settings):
-        """Рисует элементы аккорда на pixmap"""
+        """Рисует элементы аккорда (ChordElements) на pixmap"""
         try:
             # Создаем копию pixmap для рисования
             result_pixmap = QPixmap(pixmap)
@@ -552,31 +622,32 @@ class StandaloneChordConfigTab(QWidget):
             painter.setRenderHint(QPainter.SmoothPixmapTransform)
             painter.setRenderHint(QPainter.TextAntialiasing)
 
-            print(f"🎨 Отрисовка {len(elements)} элементов...")
+            logger.debug("🎨 Отрисовка %s элементов...", len(elements))
 
             # Рисуем элементы
-            for element in elements:
-                element_type = element.get('type')
-                element_data = element.get('data', {})
-
-                if element_type == 'fret':
-                    DrawingElements.draw_fret(painter, element_data)
-                    print(f"   🎯 Лад: {element_data.get('symbol', '?')}")
-                elif element_type == 'note':
-                    DrawingElements.draw_note(painter, element_data)
-                    print(f"   🎵 Нота: {element_data.get('finger', element_data.get('note_name', '?'))}")
-                elif element_type == 'barre':
-                    DrawingElements.draw_barre(painter, element_data)
-                    print(f"   🎸 Баре: {element_data.get('width', 0)}x{element_data.get('height', 0)}")
-                else:
-                    print(f"   ⚠️ Неизвестный тип элемента: {element_type}")
+            for element, x, y, _ in elements.positions():
+                element_data = element.data
+                if element.type == 'barre':
+                    # В шаблоне x, y баре - центр, draw_barre ждет левый верхний угол
+                    x, y = x - element.width / 2, y - element.height / 2
+                x, y = int(round(x)), int(round(y))
+
+                if element.type == 'fret':
+                    DrawingElements.draw_fret(painter, element_data, x, y)
+                    logger.debug("   🎯 Лад: %s", element_data.get('symbol', '?'))
+                elif element.type == 'note':
+                    DrawingElements.draw_note(painter, element_data, x, y)
+                    logger.debug("   🎵 Нота: %s", element_data.get('finger', element_data.get('note_name', '?')))
+                elif element.type == 'barre':
+                    DrawingElements.draw_barre(painter, element_data, x, y)
+                    logger.debug("   🎸 Баре: %sx%s", element.width, element.height)
 
             painter.end()
-            print("✅ Элементы отрисованы")
+            logger.debug("✅ Элементы отрисованы")
             return result_pixmap
 
         except Exception as e:
-            print(f"❌ Ошибка отрисовки элементов: {e}")
+            logger.error("❌ Ошибка отрисовки элементов: %s", e)
             return pixmap
 
     def apply_scale(self, pixmap):
@@ -594,7 +665,8 @@ class StandaloneChordConfigTab(QWidget):
                     Qt.KeepAspectRatio,
                     Qt.SmoothTransformation
                 )
-                print(f"📏 Маленький 1: {pixmap.width()}x{pixmap.height()} -> {display_width}x{display_height}")
+                logger.debug("📏 Маленький 1: %sx%s -> %sx%s",
+                             pixmap.width(), pixmap.height(), display_width, display_height)
 
             elif self.current_scale_type == "small2":
                 # МАЛЕНЬКИЙ 2 - 30% от оригинального
@@ -607,7 +679,8 @@ class StandaloneChordConfigTab(QWidget):
                     Qt.KeepAspectRatio,
                     Qt.SmoothTransformation
                 )
-                print(f"📏 Маленький 2 (30%): {pixmap.width()}x{pixmap.height()} -> {display_width}x{display_height}")
+                logger.debug("📏 Маленький 2 (30%%): %sx%s -> %sx%s",
+                             pixmap.width(), pixmap.height(), display_width, display_height)
 
             elif self.current_scale_type == "medium1":
                 # СРЕДНИЙ 1 - 50% от оригинального
@@ -620,7 +693,8 @@ class StandaloneChordConfigTab(QWidget):
                     Qt.KeepAspectRatio,
                     Qt.SmoothTransformation
                 )
-                print(f"📏 Средний 1 (50%): {pixmap.width()}x{pixmap.height()} -> {display_width}x{display_height}")
+                logger.debug("📏 Средний 1 (50%%): %sx%s -> %sx%s",
+                             pixmap.width(), pixmap.height(), display_width, display_height)
 
             elif self.current_scale_type == "medium2":
                 # СРЕДНИЙ 2 - 70% от оригинального
@@ -633,17 +707,18 @@ class StandaloneChordConfigTab(QWidget):
                     Qt.KeepAspectRatio,
                     Qt.SmoothTransformation
                 )
-                print(f"📏 Средний 2 (70%): {pixmap.width()}x{pixmap.height()} -> {display_width}x{display_height}")
+                logger.debug("📏 Средний 2 (70%%): %sx%s -> %sx%s",
+                             pixmap.width(), pixmap.height(), display_width, display_height)
 
             else:
                 # ОРИГИНАЛЬНЫЙ РАЗМЕР
                 scaled_pixmap = pixmap
-                print(f"📏 Оригинальный размер: {pixmap.width()}x{pixmap.height()}")
+                logger.debug("📏 Оригинальный размер: %sx%s", pixmap.width(), pixmap.height())
 
             return scaled_pixmap
 
         except Exception as e:
-            print(f"❌ Ошибка масштабирования: {e}")
+            logger.error("❌ Ошибка масштабирования: %s", e)
             return pixmap
 
     # Обработчики изменений настроек
@@ -655,19 +730,19 @@ class StandaloneChordConfigTab(QWidget):
             "Средний 2": "medium2"
         }
         self.current_scale_type = scale_map.get(scale_type, "original")
-        print(f"⚙️  Масштаб изменен: {self.current_scale_type}")
+        logger.debug("⚙️  Масштаб изменен: %s", self.current_scale_type)
         if self.current_chord:
             self.display_chord(self.current_chord)
 
     def on_display_type_changed(self, display_type):
         self.current_display_type = "fingers" if display_type == "Пальцы" else "notes"
-        print(f"⚙️  Тип отображения изменен: {self.current_display_type}")
+        logger.debug("⚙️  Тип отображения изменен: %s", self.current_display_type)
         if self.current_chord:
             self.display_chord(self.current_chord)
 
     def on_fret_type_changed(self, fret_type):
         self.current_fret_type = "roman" if fret_type == "Римские" else "numeric"
-        print(f"⚙️  Тип ладов изменен: {self.current_fret_type}")
+        logger.debug("⚙️  Тип ладов изменен: %s", self.current_fret_type)
         if self.current_chord:
             self.display_chord(self.current_chord)
 
@@ -679,7 +754,7 @@ class StandaloneChordConfigTab(QWidget):
             "Толстая": "thick"
         }
         self.current_barre_outline = outline_map.get(outline_type, "none")
-        print(f"⚙️  Обводка барре изменена: {self.current_barre_outline}")
+        logger.debug("⚙️  Обводка барре изменена: %s", self.current_barre_outline)
         if self.current_chord:
             self.display_chord(self.current_chord)
 
@@ -691,13 +766,13 @@ class StandaloneChordConfigTab(QWidget):
             "Толстая": "thick"
         }
         self.current_note_outline = outline_map.get(outline_type, "none")
-        print(f"⚙️  Обводка нот изменена: {self.current_note_outline}")
+        logger.debug("⚙️  Обводка нот изменена: %s", self.current_note_outline)
         if self.current_chord:
             self.display_chord(self.current_chord)
 
     def on_group_changed(self, group):
         self.current_group = group
-        print(f"⚙️  Группа изменена: {group}")
+        logger.debug("⚙️  Группа изменена: %s", group)
         self.load_chord_buttons()
 
 class StandaloneMainWindow(QMainWindow):
@@ -733,17 +808,18 @@ class StandaloneMainWindow(QMainWindow):
         """Показывает информацию о программе"""
         QMessageBox.information(self, "О программе",
                                "Автономное приложение аккордов\n"
-                               "Все данные хранятся в chords_data.py\n"
+                               "Все данные хранятся в chords_data.pack\n"
                                "Версия: 2.0 (Standalone)")
 
 def main():
     """Основная функция запуска автономного приложения"""
+    setup_logging()
     app = QApplication(sys.argv)
 
     # Проверяем доступность автономных данных
     if not HAS_STANDALONE_DATA:
         QMessageBox.critical(None, "Ошибка",
-                           "Файл chords_data.py не найден!\n\n"
+                           "Файл chords_data.pack не найден!\n\n"
                            "Запустите сначала конвертер:\n"
                            "python run_standalone_converter.py")
         return